@@ -10,18 +10,28 @@ Agente IPDO (LLM + Tools + SQLite)
   4) modelo gera resposta FINAL em linguagem natural
 
 - Adiciona tools com filtros (submercado/tipo/status/limite/termo)
+- buscar_historico: busca textual BM25 em todas as datas (database/indice_historico.py)
+- Saídas de tool em tabela compacta por padrão (agent_ipdo/formato.py);
+  textos longos cortados, lidos por inteiro com expandir_texto(ref)
 - Logs detalhados e legíveis
+- Perguntas diretas (datas, térmicas/geração do dia) resolvidas pelo
+  roteador local (agent_ipdo/roteador.py), sem LLM; latência de cada
+  caminho nos spans agente.local / agente.llm (utils.timing)
 """
 
 from __future__ import annotations
 
 import json
-import os
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
-from dotenv import load_dotenv
-from openai import OpenAI
+from config.settings import AGENT_MODEL, AGENT_ROTEADOR_LOCAL, AGENT_FORMATO_TOOLS
+from core.llm_backend import ErroChaveAusente, obter_cliente_openai
+from agent_ipdo.formato import codificar_compacto, expandir
+from agent_ipdo.roteador import resolver_local
+from utils.timing import registrar_span, resumo
 
 # --- Queries diretas no SQLite (sem depender de FastAPI) ---
 from queries.common import listar_datas as q_listar_datas
@@ -29,6 +39,7 @@ from queries.operacao import buscar_destaques_operacao as q_buscar_operacao
 from queries.operacao import buscar_operacao_resumo as q_buscar_operacao_resumo
 from queries.termica import buscar_termica_por_desvio as q_buscar_termica
 from queries.geracao import buscar_geracao as q_buscar_geracao
+from database.indice_historico import buscar as q_buscar_historico
 
 
 
@@ -36,11 +47,14 @@ from queries.geracao import buscar_geracao as q_buscar_geracao
 # Setup
 # ------------------------------------------------------------------------------
 
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
+# Cliente OpenAI e system prompt só na primeira pergunta: importar o agente
+# (ou as tools) não carrega o SDK nem lê arquivos.
 prompt_path = Path(__file__).parent / "system_prompt.txt"
-SYSTEM_PROMPT = prompt_path.read_text(encoding="utf-8")
+
+
+@lru_cache(maxsize=1)
+def _system_prompt() -> str:
+    return prompt_path.read_text(encoding="utf-8")
 
 
 def _log(msg: str):
@@ -52,6 +66,13 @@ def _safe_json_dumps(obj: Any) -> str:
     return json.dumps(obj, ensure_ascii=False, default=str)
 
 
+def _codificar_resultado(nome: str, result: Any) -> str:
+    """Saída da tool no formato configurado em AGENT_FORMATO_TOOLS (compacto | json)."""
+    if AGENT_FORMATO_TOOLS.get(nome) == "compacto":
+        return codificar_compacto(result)
+    return _safe_json_dumps(result)
+
+
 def _normalize_str(v: Any) -> Optional[str]:
     if v is None:
         return None
@@ -210,6 +231,37 @@ def tool_buscar_operacao_resumo(
     return q_buscar_operacao_resumo(data=data, submercado=submercado, limite_itens=limite_itens)
 
 
+def tool_buscar_historico(
+    consulta: str,
+    desde: str | None = None,
+    ate: str | None = None,
+    submercado: str | None = None,
+    fonte: str | None = None,
+    limite: int | None = None,
+) -> list[dict]:
+    """
+    Busca textual (BM25) em todo o histórico: descrições de geração, restrições,
+    intercâmbio, carga e térmica. Retorna trechos ranqueados com a data.
+    """
+    limite = _normalize_int(limite)
+    return q_buscar_historico(
+        consulta,
+        limite=10 if limite is None else limite,
+        desde=_normalize_str(desde),
+        ate=_normalize_str(ate),
+        submercado=_normalize_str(submercado),
+        fonte=_normalize_str(fonte),
+    )
+
+
+def tool_expandir_texto(ref: str) -> dict:
+    """Texto completo de um trecho cortado na saída compacta ('…[+N ref=...]')."""
+    texto = expandir(ref)
+    if texto is None:
+        return {"erro": f"Referência '{ref}' desconhecida ou expirada; repita a consulta original."}
+    return {"ref": ref, "texto": texto}
+
+
 # ------------------------------------------------------------------------------
 # Tool schemas (para o modelo)
 # ------------------------------------------------------------------------------
@@ -322,6 +374,44 @@ TOOLS = [
             "additionalProperties": False,
         },
     },
+    {
+        "type": "function",
+        "name": "buscar_historico",
+        "description": (
+            "Busca por palavras em TODO o histórico (sem precisar de data): descrições de geração, "
+            "restrições, intercâmbio, carga e térmica. Retorna trechos ranqueados por relevância "
+            "com data e submercado. Use para 'quando houve...', 'em que dias...', 'já ocorreu...'."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "consulta": {"type": "string", "description": "Palavras-chave (ex: 'restrição interligação Norte-Sudeste')"},
+                "desde": {"type": "string", "description": "Data inicial YYYY-MM-DD (opcional)"},
+                "ate": {"type": "string", "description": "Data final YYYY-MM-DD (opcional)"},
+                "submercado": {"type": "string", "description": "Filtro opcional por submercado (contém)"},
+                "fonte": {"type": "string", "description": "Filtro opcional: geracao | restricao | intercambio | carga | termica"},
+                "limite": {"type": "integer", "description": "Máximo de trechos (padrão 10)"},
+            },
+            "required": ["consulta"],
+            "additionalProperties": False,
+        },
+    },
+    {
+        "type": "function",
+        "name": "expandir_texto",
+        "description": (
+            "Retorna o texto completo de um trecho cortado nas saídas das outras ferramentas "
+            "(marcado como '…[+N ref=XXXX]'). Use só quando o trecho cortado for necessário para a resposta."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "ref": {"type": "string", "description": "Referência do trecho (ex: 't1a2b3c4')"},
+            },
+            "required": ["ref"],
+            "additionalProperties": False,
+        },
+    },
 
 ]
 
@@ -387,6 +477,25 @@ def _executar_tool(nome: str, args: dict) -> Any:
             limite_itens=args.get("limite_itens"),
         )
 
+    if nome == "buscar_historico":
+        consulta = _normalize_str(args.get("consulta"))
+        if not consulta:
+            return {"erro": "Parâmetro 'consulta' é obrigatório."}
+        return tool_buscar_historico(
+            consulta=consulta,
+            desde=args.get("desde"),
+            ate=args.get("ate"),
+            submercado=args.get("submercado"),
+            fonte=args.get("fonte"),
+            limite=args.get("limite"),
+        )
+
+    if nome == "expandir_texto":
+        ref = _normalize_str(args.get("ref"))
+        if not ref:
+            return {"erro": "Parâmetro 'ref' é obrigatório."}
+        return tool_expandir_texto(ref)
+
     return {"erro": f"Tool desconhecida: {nome}"}
 
 
@@ -395,17 +504,48 @@ def _executar_tool(nome: str, args: dict) -> Any:
 # ------------------------------------------------------------------------------
 
 def responder_pergunta(pergunta: str) -> str:
+    """
+    Responde pelo roteador local quando a pergunta é direta; senão pelo
+    loop de tool-calling com o LLM.
+    """
+    t0 = time.perf_counter()
+
+    resposta = resolver_local(pergunta, _executar_tool) if AGENT_ROTEADOR_LOCAL else None
+    if resposta is not None:
+        registrar_span("agente.local", time.perf_counter() - t0)
+        _log("Pergunta resolvida pelo roteador local (sem LLM).")
+        return resposta
+
+    ok = False
+    try:
+        resposta = _responder_com_llm(pergunta)
+        ok = True
+        return resposta
+    finally:
+        # Inclui a tentativa de roteamento local: é a latência vista pelo usuário
+        registrar_span("agente.llm", time.perf_counter() - t0, ok)
+
+
+def estatisticas_latencia() -> dict:
+    """{'local' | 'llm': {n, total_s, p50_ms, p95_ms, max_ms}} das perguntas deste processo."""
+    etapas = resumo()["etapas"]
+    return {c: etapas[f"agente.{c}"] for c in ("local", "llm") if f"agente.{c}" in etapas}
+
+
+def _responder_com_llm(pergunta: str) -> str:
     """
     Executa o loop de tool-calling até obter resposta final em linguagem natural.
     """
-    if not client.api_key:
-        return "[ERRO] OPENAI_API_KEY não encontrada no ambiente/.env"
+    try:
+        client = obter_cliente_openai()
+    except ErroChaveAusente as e:
+        return f"[ERRO] {e}"
 
     _log(f"Pergunta recebida: {pergunta}")
 
     # input é uma lista de itens (mensagens + outputs da API)
     input_items: list[Any] = [
-        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "system", "content": _system_prompt()},
         {"role": "user", "content": pergunta},
     ]
 
@@ -415,7 +555,7 @@ def responder_pergunta(pergunta: str) -> str:
         _log(f"--- Turno {turno}/{max_turnos}: chamando Responses API ---")
 
         response = client.responses.create(
-            model="gpt-5.2",
+            model=AGENT_MODEL,
             input=input_items,
             tools=TOOLS,
             tool_choice="auto",
@@ -478,7 +618,7 @@ def responder_pergunta(pergunta: str) -> str:
                 _log(f"[ERRO] Falha executando tool '{nome}': {e}")
                 result = {"erro": f"Falha executando tool '{nome}': {str(e)}"}
 
-            result_json = _safe_json_dumps(result)
+            result_json = _codificar_resultado(nome, result)
             _log(f"Tool result(len)={len(result_json)}")
 
             # Devolve o output pro modelo (continua o loop)
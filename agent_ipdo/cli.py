@@ -1,20 +1,25 @@
 # agent/cli.py
-from agent_ipdo.agent import responder_pergunta
+from agent_ipdo.agent import responder_pergunta, estatisticas_latencia
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo  # stdlib: dispensa pytz na inicialização
 
 
 
 if __name__ == "__main__":
-    print("\n🧠 Agente IPDO (digite 'sair' para encerrar)\n")
+    print("\n🧠 Agente IPDO (digite 'sair' para encerrar, 'stats' para latências)\n")
+
+    tz = ZoneInfo("America/Sao_Paulo")
 
     while True:
-        tz = pytz.timezone("America/Sao_Paulo")
         agora = datetime.now(tz).strftime("%Y-%m-%d %H:%M:%S")
         
         pergunta = input("Pergunta: ").strip()
         if pergunta.lower() in ("sair", "exit", "quit"):
             break
+        if pergunta.lower() == "stats":
+            for caminho, e in estatisticas_latencia().items():
+                print(f"  {caminho:<6} n={e['n']:<4} p50={e['p50_ms']:.1f}ms p95={e['p95_ms']:.1f}ms")
+            continue
         
         entrada = f"[AGORA={agora}] {pergunta}"
 
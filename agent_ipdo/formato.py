@@ -0,0 +1,118 @@
+# agent_ipdo/formato.py
+"""
+Codificação compacta das saídas de tool enviadas ao modelo.
+
+Listas de dicts viram uma tabela: cabeçalho com as colunas uma vez e uma
+linha por item, em vez de repetir as chaves a cada item como no JSON:
+
+    3 linha(s)
+    unidade_geradora | desvio_mw | desvio_status | descricao
+    UTE Angra 2 | 120 | Acima | Geração acima do programado…[+85 ref=t1a2b3c]
+    ...
+
+- dicts aninhados viram colunas pontuadas (carga.status, carga.descricao)
+- listas são unidas por " ; " (itens dict como "chave=valor, chave=valor")
+- null vira célula vazia; colunas sempre vazias são omitidas
+- textos acima de AGENT_COMPACTO_MAX_TEXTO são cortados e ganham uma
+  referência; o modelo lê o texto inteiro com a tool expandir_texto(ref)
+
+Outros resultados (erros, dicts soltos) ficam em JSON. A escolha do formato
+por tool está em config.settings.AGENT_FORMATO_TOOLS.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from config.settings import AGENT_COMPACTO_MAX_TEXTO, AGENT_COMPACTO_MAX_REFS
+
+
+_textos: OrderedDict[str, str] = OrderedDict()  # ref → texto completo (LRU)
+_lock = threading.Lock()
+
+
+def json_compacto(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _sem_nulos(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {k: _sem_nulos(v) for k, v in obj.items() if v is not None}
+    if isinstance(obj, list):
+        return [_sem_nulos(v) for v in obj]
+    return obj
+
+
+def _guardar(texto: str) -> str:
+    """Referência estável para o texto completo (mesmo texto → mesma ref)."""
+    ref = "t" + hashlib.sha1(texto.encode("utf-8")).hexdigest()[:7]
+    with _lock:
+        _textos[ref] = texto
+        _textos.move_to_end(ref)
+        while len(_textos) > AGENT_COMPACTO_MAX_REFS:
+            _textos.popitem(last=False)
+    return ref
+
+
+def expandir(ref: str) -> str | None:
+    """Texto completo de uma referência gerada por codificar_compacto (None se expirou)."""
+    with _lock:
+        return _textos.get(ref)
+
+
+def _achatar(item: dict, prefixo: str = "") -> dict:
+    linha = {}
+    for k, v in item.items():
+        if isinstance(v, dict):
+            linha.update(_achatar(v, f"{prefixo}{k}."))
+        else:
+            linha[f"{prefixo}{k}"] = v
+    return linha
+
+
+def _texto(v: Any, max_texto: int) -> str:
+    texto = " ".join(str(v).split()).replace("|", "/")
+    if max_texto and len(texto) > max_texto:
+        corte = texto[:max_texto].rsplit(" ", 1)[0] or texto[:max_texto]
+        texto = f"{corte}…[+{len(texto) - len(corte)} ref={_guardar(texto)}]"
+    return texto
+
+
+def _celula(v: Any, max_texto: int) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        v = int(v)
+    if isinstance(v, list):
+        # Cada elemento cortado separadamente: a ref devolve só o item longo
+        return " ; ".join(
+            _texto(", ".join(f"{k}={x}" for k, x in i.items() if x is not None) if isinstance(i, dict) else i, max_texto)
+            for i in v
+            if i is not None
+        )
+    return _texto(v, max_texto)
+
+
+def codificar_compacto(obj: Any, max_texto: int | None = None) -> str:
+    """Tabela compacta para listas (de dicts ou de valores); JSON compacto sem nulls no resto."""
+    max_texto = AGENT_COMPACTO_MAX_TEXTO if max_texto is None else max_texto
+
+    if not isinstance(obj, list):
+        return json_compacto(_sem_nulos(obj))
+    if not obj:
+        return "0 linha(s)"
+    if not all(isinstance(i, dict) for i in obj):
+        return f"{len(obj)} item(ns): " + ", ".join(_celula(i, max_texto) for i in obj)
+
+    linhas = [_achatar(i) for i in obj]
+    colunas = []
+    for linha in linhas:
+        for k, v in linha.items():
+            if k not in colunas and v not in (None, "", []):
+                colunas.append(k)
+
+    saida = [f"{len(linhas)} linha(s)", " | ".join(colunas)]
+    saida += [" | ".join(_celula(l.get(c), max_texto) for c in colunas) for l in linhas]
+    return "\n".join(saida)
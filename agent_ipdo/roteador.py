@@ -0,0 +1,223 @@
+# agent_ipdo/roteador.py
+"""
+Roteador local de intenções do agente (sem LLM).
+
+Perguntas diretas viram uma única chamada de tool e a resposta sai de um
+template:
+- "quais datas existem?"                  → listar_datas
+- "qual a última data disponível?"        → listar_datas (primeira)
+- "térmicas do dia 07/01/2025", "top 3 desvios térmicos de ontem"
+                                          → buscar_termica
+- "geração eólica em 2025-01-07"          → buscar_geracao (tipo)
+
+Qualquer coisa fora desses padrões (perguntas abertas, comparações,
+submercados, vários assuntos) devolve None e segue para o loop com o LLM —
+assim como perguntas sobre ocorrências no histórico (quando/vez/já/em que/
+quantos), sobre uma usina nomeada ("a UTE Angra 1"), com negação ou com
+mais de uma data.
+
+Datas: YYYY-MM-DD, DD/MM[/YYYY], "7 de janeiro [de 2025]", hoje/ontem/
+anteontem (relativas ao marcador [AGORA=...] da CLI) e "última"/"mais recente".
+"""
+
+import re
+import unicodedata
+from datetime import date, timedelta
+from typing import Any, Callable
+
+SEM_REGISTROS = "Não há registros no banco para essa consulta."
+
+ULTIMA = "ultima"
+
+MESES = {
+    "janeiro": 1, "fevereiro": 2, "marco": 3, "abril": 4, "maio": 5, "junho": 6,
+    "julho": 7, "agosto": 8, "setembro": 9, "outubro": 10, "novembro": 11, "dezembro": 12,
+}
+
+TIPOS_GERACAO = {
+    "eolica": "Eólica",
+    "solar": "Solar",
+    "fotovoltaica": "Solar",
+    "hidraulica": "Hidráulica",
+    "nuclear": "Nuclear",
+}
+
+_RE_AGORA = re.compile(r"^\s*\[AGORA=(\d{4}-\d{2}-\d{2})[^\]]*\]\s*")
+_RE_ISO = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_RE_BR = re.compile(r"\b(\d{1,2})[/-](\d{1,2})(?:[/-](\d{2}|\d{4}))?\b")
+_RE_EXTENSO = re.compile(rf"\b(\d{{1,2}}) de ({'|'.join(MESES)})(?: de (\d{{4}}))?\b")
+# "última" só é data quando qualifica data/dia/relatório ("a última térmica com desvio" não é)
+_RE_ULTIMA = re.compile(
+    r"\b(?:ultim[ao]s?|mais recentes?)\s+(?:datas?|dias?|relatorios?|ipdos?)\b"
+    r"|\b(?:datas?|dias?|relatorios?|ipdos?)\s+mais recentes?\b"
+)
+_RE_RELATIVA = re.compile(r"\b(?:anteontem|ontem|hoje)\b")
+
+# Pedem interpretação/síntese: ficam com o LLM
+_RE_ABERTA = re.compile(
+    r"\b(por ?que|porque|explic\w*|compar\w*|analis\w*|tendencia\w*|medi[ao]s?|motivos?|causas?|"
+    r"resum\w*|diferen\w*|evolu\w*|entre|semana|mes|ano|periodo|operacao|restric\w*|carga|"
+    r"intercambio|sudeste|sul|nordeste|norte|submercado)\b"
+)
+# Busca no histórico, usina específica ou negação: a tool por data não responde
+_RE_HISTORICO = re.compile(r"\b(quando|vez|vezes|ja|em que|quant[oa]s?)\b")
+_RE_UNIDADE_NOMEADA = re.compile(
+    r"\b(?:ute|utn|usina)\s+(?!(?:acima|abaixo|com|do|da|de|dos|das|em|no|na|que|ficou|teve|tiveram|foi)\b)[a-z]"
+)
+_RE_NEGACAO = re.compile(r"\b(nao|nunca|nenhum\w*|sem)\b")
+_RE_DATAS = re.compile(r"\b(datas?|dias?|relatorios?)\b.*\b(existe\w*|disponive\w*|tem|ha|banco)\b|\bquais datas\b")
+_RE_TERMICA = re.compile(r"\b(termic\w*|utes?|utns?|usinas? termeletric\w*)\b")
+_RE_LIMITE = re.compile(r"\b(?:top|maiores|principais|primeir[ao]s)\s+(\d{1,3})\b|\b(\d{1,3})\s+maiores\b")
+
+
+def _normalizar(texto: str) -> str:
+    sem_acento = unicodedata.normalize("NFKD", texto)
+    sem_acento = "".join(c for c in sem_acento if not unicodedata.combining(c))
+    return " ".join(sem_acento.lower().split())
+
+
+def separar_agora(pergunta: str) -> tuple[date, str]:
+    """'[AGORA=2025-01-08 10:00:00] pergunta' → (date(2025, 1, 8), 'pergunta')."""
+    m = _RE_AGORA.match(pergunta)
+    if not m:
+        return date.today(), pergunta.strip()
+    return date.fromisoformat(m.group(1)), pergunta[m.end():].strip()
+
+
+def extrair_data(texto: str, hoje: date) -> str | None:
+    """Data mencionada em `texto` (já normalizado) como YYYY-MM-DD, ULTIMA ou None."""
+    try:
+        if m := _RE_ISO.search(texto):
+            return date(int(m[1]), int(m[2]), int(m[3])).isoformat()
+        if m := _RE_EXTENSO.search(texto):
+            return date(int(m[3] or hoje.year), MESES[m[2]], int(m[1])).isoformat()
+        if m := _RE_BR.search(texto):
+            ano = int(m[3]) if m[3] else hoje.year
+            ano = ano + 2000 if ano < 100 else ano
+            return date(ano, int(m[2]), int(m[1])).isoformat()
+    except ValueError:
+        return None
+
+    for palavra, dias in (("anteontem", 2), ("ontem", 1), ("hoje", 0)):
+        if re.search(rf"\b{palavra}\b", texto):
+            return (hoje - timedelta(days=dias)).isoformat()
+
+    if _RE_ULTIMA.search(texto):
+        return ULTIMA
+    return None
+
+
+def contar_datas(texto: str) -> int:
+    """Quantas datas (absolutas ou relativas) `texto` (já normalizado) menciona."""
+    total = 0
+    for regex in (_RE_ISO, _RE_EXTENSO, _RE_BR, _RE_RELATIVA):
+        # Remove o que já contou: '2025-01-07' também casaria com DD-MM
+        texto, n = regex.subn(" ", texto)
+        total += n
+    return total
+
+
+def interpretar(pergunta: str) -> tuple[str, dict] | None:
+    """(tool, args) para perguntas diretas; None → LLM. args['data'] pode ser ULTIMA."""
+    hoje, texto = separar_agora(pergunta)
+    texto = _normalizar(texto)
+
+    if _RE_ABERTA.search(texto) or _RE_HISTORICO.search(texto):
+        return None
+    if _RE_UNIDADE_NOMEADA.search(texto) or _RE_NEGACAO.search(texto) or contar_datas(texto) > 1:
+        return None
+
+    data = extrair_data(texto, hoje)
+    termica = bool(_RE_TERMICA.search(texto))
+    tipos = {v for k, v in TIPOS_GERACAO.items() if re.search(rf"\b{k}\b", texto)}
+
+    if termica and not tipos and data:
+        args = {"data": data}
+        if m := _RE_LIMITE.search(texto):
+            args["limite"] = int(m[1] or m[2])
+        if re.search(r"\bacima\b", texto):
+            args["desvio_status"] = "Acima"
+        elif re.search(r"\babaixo\b", texto):
+            args["desvio_status"] = "Abaixo"
+        return "buscar_termica", args
+
+    if len(tipos) == 1 and not termica and data:
+        return "buscar_geracao", {"data": data, "tipo": tipos.pop()}
+
+    if termica or tipos:
+        return None
+
+    if data == ULTIMA and re.search(r"\b(datas?|dias?|relatorios?)\b", texto):
+        return "ultima_data", {}
+
+    if data is None and _RE_DATAS.search(texto):
+        return "listar_datas", {}
+
+    return None
+
+
+# ------------------------------------------------------------------------------
+# Templates
+# ------------------------------------------------------------------------------
+
+def _fmt_datas(datas: list[str]) -> str:
+    if not datas:
+        return SEM_REGISTROS
+    recentes = ", ".join(datas[:5])
+    return (
+        f"Há {len(datas)} data(s) no banco, de {datas[-1]} a {datas[0]}.\n"
+        f"Mais recentes: {recentes}."
+    )
+
+
+def _fmt_mw(v) -> str:
+    return "desvio não informado" if v is None else f"{v:g} MW"
+
+
+def _fmt_termica(data: str, itens: list[dict]) -> str:
+    if not itens:
+        return SEM_REGISTROS
+    linhas = [f"Destaques térmicos de {data} ({len(itens)}):"]
+    for i in itens:
+        linhas.append(
+            f"- {i['unidade_geradora']}: {_fmt_mw(i.get('desvio_mw'))} ({i.get('desvio_status')}) — {i.get('descricao')}"
+        )
+    return "\n".join(linhas)
+
+
+def _fmt_geracao(data: str, tipo: str, itens: list[dict]) -> str:
+    if not itens:
+        return SEM_REGISTROS
+    linhas = [f"Geração {tipo} em {data}:"]
+    for i in itens:
+        linhas.append(f"- {i['submercado']}: {i.get('status')} — {i.get('descricao')}")
+    return "\n".join(linhas)
+
+
+def resolver_local(pergunta: str, executar: Callable[[str, dict], Any]) -> str | None:
+    """
+    Resposta pronta para perguntas diretas, ou None (segue para o LLM).
+    executar: dispatcher de tools do agente (nome, args) → resultado.
+    """
+    intencao = interpretar(pergunta)
+    if intencao is None:
+        return None
+    tool, args = intencao
+
+    if tool in ("listar_datas", "ultima_data") or args.get("data") == ULTIMA:
+        datas = executar("listar_datas", {})
+        if tool == "listar_datas":
+            return _fmt_datas(datas)
+        if not datas:
+            return SEM_REGISTROS
+        if tool == "ultima_data":
+            return f"A data mais recente no banco é {datas[0]}."
+        args["data"] = datas[0]
+
+    itens = executar(tool, args)
+    if isinstance(itens, dict) and "erro" in itens:
+        return None
+
+    if tool == "buscar_termica":
+        return _fmt_termica(args["data"], itens)
+    return _fmt_geracao(args["data"], args["tipo"], itens)
@@ -1,13 +1,16 @@
 # api/deps.py
 import sqlite3
 from config.settings import DB_PATH
+from api.metricas import ConexaoMedida
+from database.snapshots import conectar_leitura
 
 def get_db():
     """
     Dependency FastAPI para obter conexão SQLite.
-    Read-only neste MVP.
+    Somente leitura: snapshot imutável publicado pela ingestão (sem locks,
+    dias sempre completos) ou, sem snapshot, o banco de trabalho.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_leitura(DB_PATH, factory=ConexaoMedida)
     conn.row_factory = sqlite3.Row
     try:
         yield conn
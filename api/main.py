@@ -2,7 +2,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.routers import datas, operacao, geracao, termica
+from api.metricas import medir_requisicoes
+from api.routers import datas, operacao, geracao, termica, metricas, analitico, exportacao
 
 app = FastAPI(
     title="IPDO API",
@@ -31,6 +32,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ---------------------------------------------------------
+# Métricas (latência por rota → /metrics)
+# ---------------------------------------------------------
+
+app.middleware("http")(medir_requisicoes)
+
 # ---------------------------------------------------------
 # Routers
 # ---------------------------------------------------------
@@ -39,6 +46,9 @@ app.include_router(datas.router)
 app.include_router(operacao.router)
 app.include_router(geracao.router)
 app.include_router(termica.router)
+app.include_router(metricas.router)
+app.include_router(analitico.router)
+app.include_router(exportacao.router)
 
 # ---------------------------------------------------------
 # Health-check
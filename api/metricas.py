@@ -0,0 +1,61 @@
+# api/metricas.py
+"""
+Métricas do processo da API (em memória):
+- latência e contagem de requisições por rota
+- tempo das consultas SQLite feitas pelos routers
+"""
+
+import sqlite3
+import time
+
+from fastapi import Request
+
+from utils.metrics import RegistroMetricas
+
+
+registro_api = RegistroMetricas()
+
+
+class CursorMedido(sqlite3.Cursor):
+    """Cursor que mede execute/fetch* e registra em ipdo_api_sqlite_segundos."""
+
+    def _medir(self, fase: str, func, *args):
+        t0 = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            registro_api.observar("ipdo_api_sqlite_segundos", time.perf_counter() - t0, fase=fase)
+
+    def execute(self, sql, params=()):
+        return self._medir("execute", super().execute, sql, params)
+
+    def fetchone(self):
+        return self._medir("fetch", super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._medir("fetch", super().fetchmany, size if size is not None else self.arraysize)
+
+    def fetchall(self):
+        return self._medir("fetch", super().fetchall)
+
+
+class ConexaoMedida(sqlite3.Connection):
+    """Conexão cujos cursores são CursorMedido."""
+
+    def cursor(self, factory=CursorMedido):
+        return super().cursor(factory)
+
+
+async def medir_requisicoes(request: Request, call_next):
+    """Middleware HTTP: latência por rota (template, ex: /termica/{data})."""
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        rota = getattr(request.scope.get("route"), "path", "nao_roteada")
+        duracao = time.perf_counter() - t0
+        registro_api.observar("ipdo_api_requisicao_segundos", duracao, rota=rota, metodo=request.method)
+        registro_api.incrementar("ipdo_api_requisicoes_total", rota=rota, metodo=request.method, status=str(status))
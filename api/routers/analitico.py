@@ -0,0 +1,68 @@
+# api/routers/analitico.py
+from fastapi import APIRouter, Query
+
+from queries import analitico
+
+router = APIRouter(
+    prefix="/analitico",
+    tags=["Analítico"]
+)
+
+_PERIODO = "^(ano|mes|dia)$"
+
+
+def _resposta(linhas: list[dict]) -> dict:
+    return {"motor": analitico.motor_ativo(), "linhas": linhas}
+
+
+@router.get("/geracao/status")
+def status_geracao(
+    desde: str | None = Query(None, description="Data inicial (YYYY-MM-DD), inclusiva"),
+    ate: str | None = Query(None, description="Data final (YYYY-MM-DD), inclusiva"),
+    periodo: str = Query("ano", pattern=_PERIODO),
+    submercado: str | None = Query(None, description="SE, S, NE, N"),
+    tipo: str | None = Query(None, description="Hidráulica, Térmica, Eólica, Solar, Nuclear"),
+):
+    """
+    Distribuição dos status de geração por período e tipo.
+    """
+    return _resposta(analitico.distribuicao_status_geracao(desde, ate, periodo, submercado, tipo))
+
+
+@router.get("/carga/status")
+def status_carga(
+    desde: str | None = Query(None, description="Data inicial (YYYY-MM-DD), inclusiva"),
+    ate: str | None = Query(None, description="Data final (YYYY-MM-DD), inclusiva"),
+    periodo: str = Query("ano", pattern=_PERIODO),
+    submercado: str | None = Query(None, description="SE, S, NE, N"),
+):
+    """
+    Distribuição dos status de carga por período e submercado.
+    """
+    return _resposta(analitico.distribuicao_status_carga(desde, ate, periodo, submercado))
+
+
+@router.get("/termica/tendencia")
+def tendencia_termica(
+    desde: str | None = Query(None, description="Data inicial (YYYY-MM-DD), inclusiva"),
+    ate: str | None = Query(None, description="Data final (YYYY-MM-DD), inclusiva"),
+    periodo: str = Query("mes", pattern=_PERIODO),
+    unidade: str | None = Query(None, description="Unidade geradora (nome exato)"),
+):
+    """
+    Desvios térmicos (quantidade, total, média e máximo em MW) por período e direção.
+    """
+    return _resposta(analitico.tendencia_desvio_termica(desde, ate, periodo, unidade))
+
+
+@router.get("/termica/ranking")
+def ranking_termica(
+    desde: str | None = Query(None, description="Data inicial (YYYY-MM-DD), inclusiva"),
+    ate: str | None = Query(None, description="Data final (YYYY-MM-DD), inclusiva"),
+    limite: int = Query(10, ge=1, le=100),
+    desvio_status: str | None = Query(None, description="Acima, Abaixo, Sem desvio"),
+):
+    """
+    Unidades térmicas com maior desvio acumulado na faixa de datas.
+    """
+    return _resposta(analitico.ranking_unidades_termica(desde, ate, limite, desvio_status))
@@ -0,0 +1,112 @@
+# api/routers/exportacao.py
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from config.settings import DB_PATH, EXPORT_CHUNK_SIZE
+from api.metricas import ConexaoMedida
+from database.exportador import ler_tabela_em_chunks, lote_arrow, schema_arrow
+from database.snapshots import conectar_leitura
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Exportação"]
+)
+
+# nome na rota → tabela de database.exportador.TABELAS_EXPORT
+TABELAS = {
+    "operacao": "destaques_operacao",
+    "geracao": "destaques_geracao",
+    "termica": "destaques_geracao_termica",
+}
+
+FORMATOS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+class _Buffer:
+    """Destino de escrita do pyarrow; esvaziado a cada bloco enviado."""
+
+    def __init__(self):
+        self._partes = []
+        self.closed = False
+
+    def write(self, dados) -> int:
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def esvaziar(self) -> bytes:
+        dados = b"".join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+def _abrir_escritor(formato: str, buffer: _Buffer, schema):
+    if formato == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(buffer, schema, compression="zstd")
+
+    import pyarrow as pa
+
+    return pa.ipc.new_stream(buffer, schema)
+
+
+def _stream(tabela: str, formato: str, schema, desde: str | None, ate: str | None):
+    """Lê a tabela em blocos e devolve cada bloco já serializado (Arrow IPC ou row group Parquet)."""
+    # O gerador é consumido em threads do pool → conexão sem check_same_thread
+    conn = conectar_leitura(DB_PATH, factory=ConexaoMedida, check_same_thread=False)
+    buffer = _Buffer()
+    escritor = _abrir_escritor(formato, buffer, schema)
+    try:
+        for rows in ler_tabela_em_chunks(
+            conn, tabela, desde=desde, ate=ate, chunk_size=EXPORT_CHUNK_SIZE, incluir_desde=True
+        ):
+            escritor.write_batch(lote_arrow(schema, rows))
+            yield buffer.esvaziar()
+        escritor.close()
+        yield buffer.esvaziar()
+    finally:
+        conn.close()
+
+
+@router.get("/{tabela}")
+def exportar(
+    tabela: str,
+    formato: str = Query("arrow", pattern="^(arrow|parquet)$"),
+    desde: str | None = Query(None, description="Data inicial (YYYY-MM-DD), inclusiva"),
+    ate: str | None = Query(None, description="Data final (YYYY-MM-DD), inclusiva"),
+):
+    """
+    Download em lote de uma tabela (operacao, geracao, termica) numa faixa de datas.
+
+    - arrow: Arrow IPC stream (pyarrow.ipc.open_stream / polars.read_ipc_stream)
+    - parquet: arquivo Parquet, um row group por bloco lido do banco
+
+    Lido do banco em blocos e enviado em streaming, sem montar JSON linha a linha.
+    """
+    if tabela not in TABELAS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Tabela desconhecida: {tabela} (use {', '.join(TABELAS)})"
+        )
+
+    try:
+        schema = schema_arrow(TABELAS[tabela])
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    media_type, extensao = FORMATOS[formato]
+    nome = "_".join(p for p in (tabela, desde, ate) if p)
+    return StreamingResponse(
+        _stream(TABELAS[tabela], formato, schema, desde, ate),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{nome}.{extensao}"'},
+    )
@@ -0,0 +1,24 @@
+# api/routers/metricas.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from api.metricas import registro_api
+from utils.metrics import armazem, formatar_prometheus
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Observabilidade"]
+)
+
+@router.get("", response_class=PlainTextResponse)
+def metricas():
+    """
+    Métricas no formato texto do Prometheus.
+
+    Inclui latência por rota e tempo de SQLite (processo da API) e os
+    contadores de ingestão gravados pelo main.py (PDFs, GPT, tokens, cache, falhas).
+    """
+    return PlainTextResponse(
+        formatar_prometheus(registro_api, armazem),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,14 +1,102 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).parent.parent
 
 PDFS_DIR = BASE_DIR / "pdfs"
-OUTPUT_DIR = BASE_DIR / "outputs"
+OUTPUT_DIR = BASE_DIR / "outputs"  # JSONs legados por PDF (importar: python -m database.respostas_llm)
 PROMPTS_DIR = BASE_DIR / "prompts"
 DB_PATH = BASE_DIR / "banco_destaques.db"
+EXPORT_DIR = BASE_DIR / "exports"
 
 OPENAI_MODEL = "gpt-5-mini"
+AGENT_MODEL = "gpt-5.2"  # agente de perguntas (agent_ipdo/agent.py)
+AGENT_ROTEADOR_LOCAL = True  # perguntas diretas respondidas sem LLM (agent_ipdo/roteador.py)
+
+# Formato das saídas de tool enviadas ao modelo (agent_ipdo/formato.py): "compacto" | "json"
+# Tool fora do dict → "json"
+AGENT_FORMATO_TOOLS = {
+    "listar_datas": "compacto",
+    "buscar_operacao": "compacto",
+    "buscar_geracao": "compacto",
+    "buscar_termica": "compacto",
+    "buscar_restricoes": "compacto",
+    "buscar_historico": "compacto",
+    "buscar_operacao_resumo": "compacto",
+}
+AGENT_COMPACTO_MAX_TEXTO = 160   # caracteres por texto antes do corte com referência
+AGENT_COMPACTO_MAX_REFS = 2000   # textos completos guardados para expandir_texto
 
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-OPENAI_TIMEOUT = 90  # segundos
\ No newline at end of file
+OPENAI_TIMEOUT = 90  # segundos
+GPT_ESPERA_RETENTATIVA = 2  # segundos entre tentativas (JSON inválido / erro de API)
+OPENAI_STRUCTURED_OUTPUT = True  # envia o JSON Schema do tipo (core/schemas.py) como formato strict
+
+# Roteamento de modelos por tarefa (core/roteador_modelos.py)
+# Cadeia do mais barato ao mais capaz; falha de validação escala para o próximo.
+ROTEAMENTO_MODELOS = {
+    "termica": ["gpt-5-nano", OPENAI_MODEL],
+    "operacao": [OPENAI_MODEL],
+}
+ROTEAMENTO_MAX_TOKENS_PEQUENO = 2000  # seção maior que isso vai direto ao último modelo da cadeia
+ROTEAMENTO_TAXA_SUCESSO_MIN = 0.9     # modelo com taxa recente abaixo disso é pulado
+ROTEAMENTO_MIN_AMOSTRAS = 20          # chamadas mínimas antes de confiar no histórico
+ROTEAMENTO_JANELA = 100               # taxa de sucesso calculada só sobre as últimas N respostas
+ROTEAMENTO_EXPLORACAO = 0.05          # fração das chamadas que ainda tenta um modelo pulado
+# USD por 1M tokens (entrada, saída) — ajuste conforme a tabela vigente
+PRECO_MODELOS = {
+    "gpt-5-nano": (0.05, 0.40),
+    "gpt-5-mini": (0.25, 2.00),
+}
+
+# Parser determinístico da térmica (core/parser_termica.py)
+# rapido: parser primeiro, LLM só para linhas fora do padrão
+# conferir: LLM na seção inteira + parser como conferência (divergências no log)
+# desligado: só LLM
+TERMICA_PARSER_MODO = "rapido"
+
+# Chunking (core/chunking.py + core/gpt_runner.py)
+OPENAI_CONTEXTO_TOKENS = 16000  # orçamento de tokens de entrada por chamada; seção maior → chunks
+CHUNK_OVERLAP_TOKENS = 200      # tokens repetidos entre chunks vizinhos
+GPT_CHUNKS_PARALELOS = 4        # chamadas simultâneas por seção
+
+# Backend de LLM: "openai" (produção) ou "fake" (replay offline do arquivo respostas_llm)
+LLM_BACKEND = os.getenv("IPDO_LLM_BACKEND", "openai")
+# Modo PDF completo: envia o PDF (upload único por digest) em vez do texto da seção
+MODO_PDF_COMPLETO = os.getenv("IPDO_MODO_PDF_COMPLETO", "0") == "1"
+FAKE_LLM_LATENCIA = float(os.getenv("IPDO_FAKE_LATENCIA", "0.5"))    # segundos (média)
+FAKE_LLM_TAXA_ERRO = float(os.getenv("IPDO_FAKE_TAXA_ERRO", "0"))    # fração de chamadas com erro 500
+FAKE_LLM_TAXA_429 = float(os.getenv("IPDO_FAKE_TAXA_429", "0"))      # fração de chamadas com 429
+
+# Extração de PDF (core/pdf_extractor_v2.py)
+PDF_WORKERS = min(4, os.cpu_count() or 1)  # processos na extração paralela; 1 → sempre serial
+PDF_PARALELO_MIN_PAGINAS = 40  # abaixo disso o custo do pool não compensa (ver benchmark --crossover)
+
+# Snapshots de leitura da API (database/snapshots.py), em <banco>.snapshots/
+SNAPSHOT_MANTER = 3                         # snapshots mantidos (o atual incluso)
+# Só as tabelas que a API e as consultas analíticas leem (fila, cache de respostas etc. ficam de fora)
+SNAPSHOT_TABELAS = ("destaques_operacao", "destaques_geracao", "destaques_geracao_termica")
+SNAPSHOT_MMAP_BYTES = 256 * 1024 * 1024     # PRAGMA mmap_size nas conexões de leitura
+
+EXPORT_CHUNK_SIZE = 5000  # linhas lidas do SQLite por vez na exportação
+
+# Consultas analíticas (queries/analitico.py, DuckDB opcional)
+# auto: DuckDB sobre o SQLite (extensão sqlite) → Parquet exportado → SQLite puro
+# sqlite | parquet: força a fonte do DuckDB (sem ela, cai no SQLite puro)
+ANALITICO_FONTE = os.getenv("IPDO_ANALITICO_FONTE", "auto")
+
+# Busca textual no histórico (database/indice_historico.py, tool buscar_historico do agente)
+BUSCA_BM25_K1 = 1.2   # saturação da frequência do termo
+BUSCA_BM25_B = 0.75   # normalização pelo tamanho do trecho
+
+WATCH_INTERVALO = 5   # segundos entre verificações no modo watch
+WATCH_DEBOUNCE = 10   # segundos com tamanho/mtime estáveis antes de processar um PDF
+
+JOB_MAX_TENTATIVAS = 5   # tentativas por job (pdf, tipo) antes de marcar como 'falhou'
+JOB_BACKOFF_BASE = 30    # segundos; espera = base * 2^(tentativa-1)
+JOB_TIMEOUT = 15 * 60    # job 'executando' há mais que isso é considerado órfão (worker caiu)
+
+LOGS_DIR = BASE_DIR / "logs"
+TIMINGS_PATH = LOGS_DIR / "timings.jsonl"  # spans de tempo do pipeline (JSON lines)
+METRICS_DB_PATH = LOGS_DIR / "metricas.db"  # contadores compartilhados ingestão → API (/metrics)
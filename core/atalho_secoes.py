@@ -0,0 +1,80 @@
+# core/atalho_secoes.py
+"""
+Atalho determinístico antes do LLM.
+
+1. Seção vazia/protocolar ("Não houve destaques.", "Sem destaques no período")
+   → lista vazia, sem chamada
+2. Texto normalizado idêntico a uma seção já processada (mesmo tipo)
+   → reaproveita os itens gravados em secoes_processadas
+3. Caso contrário → LLM; o resultado é gravado para as próximas vezes
+
+Contadores: atalho_vazio, atalho_repetido, atalho_miss (taxa no relatório
+de fim de execução e no /metrics).
+"""
+
+import hashlib
+import re
+import unicodedata
+
+from database.secoes_processadas import buscar_resultado, registrar_resultado
+from utils.logger import log
+from utils.timing import incrementar
+
+
+# Frases protocolares sem conteúdo, ex. "não houve destaques de geração térmica no período".
+# Lista FECHADA: a frase inteira tem de ser prefixo + substantivo + qualificadores
+# conhecidos, sem nada depois. Qualquer outro texto → LLM.
+_QUALIFICADORES = (
+    r"(?:relevantes?|significativos?|a (?:destacar|relatar|registrar)"
+    r"|(?:de|na) (?:geração|geracao) (?:térmica|termica)|(?:de|na) (?:operação|operacao)"
+    r"|(?:no|neste|para o) (?:período|periodo|dia))"
+)
+_RE_PROTOCOLAR = re.compile(
+    r"^(?:não houve|não há|nao houve|nao ha|sem)\s+"
+    r"(?:destaques?|ocorrências?|ocorrencias?|registros?|desvios?|informações|informacoes)"
+    rf"(?:\s+{_QUALIFICADORES}){{0,3}}$"
+    rf"|^nada a (?:destacar|relatar|registrar)(?:\s+{_QUALIFICADORES}){{0,2}}$"
+)
+
+# Menção a usina, potência ou ressalva nunca é protocolar, mesmo que o resto case.
+_RE_CONTEUDO = re.compile(r"\b(?:ute|utn|ut|mw|exceto|além|alem|salvo|porém|porem|mas)\b|\d")
+
+
+def normalizar(trecho: str) -> str:
+    """Forma canônica do texto: NFKC, minúsculas, espaços colapsados, sem pontuação final."""
+    texto = unicodedata.normalize("NFKC", trecho or "").casefold()
+    texto = " ".join(texto.split())
+    return texto.rstrip(" .;")
+
+
+def hash_secao(trecho: str) -> str:
+    return hashlib.sha256(normalizar(trecho).encode("utf-8")).hexdigest()
+
+
+def e_protocolar(trecho: str) -> bool:
+    texto = normalizar(trecho)
+    if not texto:
+        return True
+    return not _RE_CONTEUDO.search(texto) and bool(_RE_PROTOCOLAR.match(texto))
+
+
+def resolver_sem_llm(tipo: str, trecho: str) -> list | None:
+    """Itens da seção sem chamar o LLM, ou None se for preciso chamá-lo."""
+    if e_protocolar(trecho):
+        log(f"   Atalho → seção de {tipo} sem destaques, pulando GPT")
+        incrementar("atalho_vazio")
+        return []
+
+    itens = buscar_resultado(tipo, hash_secao(trecho))
+    if itens is not None:
+        log(f"   Atalho → seção de {tipo} idêntica a uma já processada, reaproveitando resultado")
+        incrementar("atalho_repetido")
+        return itens
+
+    incrementar("atalho_miss")
+    return None
+
+
+def lembrar_secao(tipo: str, trecho: str, itens: list, data: str):
+    """Grava o resultado do LLM para reaproveitar em seções idênticas."""
+    registrar_resultado(tipo, hash_secao(trecho), itens, data)
@@ -2,33 +2,111 @@
 """
 Funções utilitárias para divisão de texto (chunking) com limite de tokens.
 
-O objetivo é impedir que textos extraídos do PDF ultrapassem o limite de 
+O objetivo é impedir que textos extraídos do PDF ultrapassem o limite de
 contexto do modelo GPT, evitando erros 400 e análises incompletas.
+
+Tokens contados com o tokenizer real do modelo (tiktoken); sem tiktoken
+instalado, cai na estimativa de 1 token ≈ 4 caracteres.
 """
 
 import re
+from functools import lru_cache
+
+from config.settings import OPENAI_MODEL
 from utils.logger import log
 
-# Estimativa média: 1 token ≈ 4 caracteres (para modelos GPT modernos)
+# Estimativa média: 1 token ≈ 4 caracteres (fallback sem tiktoken)
 TOKEN_RATIO = 4
 
+# Custo aproximado do separador "\n\n" entre unidades
+_TOKENS_SEPARADOR = 1
+
+
+@lru_cache(maxsize=1)
+def _encoder():
+    try:
+        import tiktoken
+    except ImportError:
+        log("   [WARN] tiktoken não instalado → contagem de tokens estimada (len/4)")
+        return None
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(OPENAI_MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Vocabulário é baixado no primeiro uso; offline sem cache → estimativa
+        log(f"   [WARN] Tokenizer indisponível ({e.__class__.__name__}) → contagem de tokens estimada (len/4)")
+        return None
+
+
+def contar_tokens(text: str) -> int:
+    """Número de tokens do texto (tiktoken; estimativa len/4 se indisponível)."""
+    enc = _encoder()
+    if enc is None:
+        return max(1, len(text) // TOKEN_RATIO)
+    return max(1, len(enc.encode(text, disallowed_special=())))
+
 
 def estimate_tokens(text: str) -> int:
-    """Estima número de tokens baseado no tamanho do texto."""
-    return max(1, len(text) // TOKEN_RATIO)
+    """Compatibilidade: mesmo que contar_tokens."""
+    return contar_tokens(text)
+
+
+def _fatiar(text: str, max_tokens: int) -> list[str]:
+    """Corta um texto sem pontuação útil em fatias de no máximo max_tokens."""
+    enc = _encoder()
+    if enc is None:
+        passo = max_tokens * TOKEN_RATIO
+        return [text[i:i + passo] for i in range(0, len(text), passo)]
 
+    ids = enc.encode(text, disallowed_special=())
+    return [enc.decode(ids[i:i + max_tokens]) for i in range(0, len(ids), max_tokens)]
 
-def split_text_by_tokens(text: str, max_tokens: int = 6000) -> list:
+
+def _unidades(text: str, max_tokens: int) -> list[tuple[str, int]]:
+    """
+    Quebra o texto em unidades (parágrafo → sentença → fatia) que cabem em
+    max_tokens, cada uma com sua contagem de tokens (contada uma única vez).
+    """
+    unidades = []
+    for para in re.split(r"\n\s*\n", text):
+        para = para.strip()
+        if not para:
+            continue
+        n = contar_tokens(para)
+        if n <= max_tokens:
+            unidades.append((para, n))
+            continue
+
+        log("   Parágrafo muito grande → realizando divisão por sentenças...")
+        for s in re.split(r"(?<=[.!?])\s+|\n", para):
+            s = s.strip()
+            if not s:
+                continue
+            n = contar_tokens(s)
+            if n <= max_tokens:
+                unidades.append((s, n))
+            else:
+                unidades.extend((f, contar_tokens(f)) for f in _fatiar(s, max_tokens))
+    return unidades
+
+
+def split_text_by_tokens(text: str, max_tokens: int = 6000, overlap_tokens: int = 0) -> list:
     """
-    Divide o texto em chunks respeitando limite de tokens aproximado.
+    Divide o texto em chunks respeitando limite de tokens.
 
-    - Nunca quebra no meio de parágrafos
-    - Se chunk único exceder max_tokens → quebra em sentenças
+    - Nunca quebra no meio de parágrafos (salvo parágrafo maior que o limite:
+      divide por sentenças e, em último caso, por tokens)
+    - Empacotamento linear: cada unidade é tokenizada uma vez e somada
+    - overlap_tokens: cada chunk repete o final do anterior (até esse total),
+      para não perder itens na fronteira
     - Retorna lista de chunks prontos para envio ao GPT
     """
 
-    total_tokens = estimate_tokens(text)
-    log(f"   Texto possui aproximadamente {total_tokens} tokens")
+    total_tokens = contar_tokens(text)
+    log(f"   Texto possui {total_tokens} tokens")
 
     if total_tokens <= max_tokens:
         log("   Chunking NÃO necessário → texto cabe em um único prompt")
@@ -36,44 +114,38 @@ def split_text_by_tokens(text: str, max_tokens: int = 6000) -> list:
 
     log("   Chunking necessário → dividindo o texto...")
 
-    # Primeira divisão por parágrafos
-    paragraphs = re.split(r"\n\s*\n", text)
+    overlap_tokens = min(overlap_tokens, max_tokens // 2)
     chunks = []
-    current_chunk = ""
-
-    for para in paragraphs:
-        candidate = current_chunk + "\n\n" + para if current_chunk else para
-
-        if estimate_tokens(candidate) < max_tokens:
-            current_chunk = candidate
-        else:
-            # Chunk cheio → salva e começa outro
-            chunks.append(current_chunk.strip())
-            current_chunk = para
-
-    # Último pedaço
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-
-    # Garantia de que nenhum chunk ultrapassa o máximo
-    final_chunks = []
-    for c in chunks:
-        if estimate_tokens(c) <= max_tokens:
-            final_chunks.append(c)
-        else:
-            # Se um parágrafo gigante excede, quebrar em sentenças
-            log("   Parágrafo muito grande → realizando divisão por sentenças...")
-            sentences = re.split(r"(?<=[.!?])\s+", c)
-            sub_chunk = ""
-            for s in sentences:
-                candidate = sub_chunk + " " + s if sub_chunk else s
-                if estimate_tokens(candidate) < max_tokens:
-                    sub_chunk = candidate
-                else:
-                    final_chunks.append(sub_chunk.strip())
-                    sub_chunk = s
-            if sub_chunk:
-                final_chunks.append(sub_chunk.strip())
-
-    log(f"   Chunking finalizado → {len(final_chunks)} chunk(s) gerados")
-    return final_chunks
+    atual: list[tuple[str, int]] = []
+    tokens_atual = 0
+    novas = 0  # unidades do chunk atual que não vieram do overlap
+
+    for unidade, n in _unidades(text, max_tokens):
+        custo = n + (_TOKENS_SEPARADOR if atual else 0)
+
+        if atual and tokens_atual + custo > max_tokens:
+            chunks.append("\n\n".join(u for u, _ in atual))
+
+            # Overlap: reaproveita as últimas unidades que cabem no orçamento
+            cauda, tokens_cauda = [], 0
+            for u, m in reversed(atual):
+                if tokens_cauda + m + _TOKENS_SEPARADOR > overlap_tokens:
+                    break
+                cauda.append((u, m))
+                tokens_cauda += m + _TOKENS_SEPARADOR
+            atual = cauda[::-1]
+            tokens_atual = tokens_cauda
+            while atual and tokens_atual + n > max_tokens:
+                tokens_atual -= atual.pop(0)[1] + _TOKENS_SEPARADOR
+            novas = 0
+            custo = n + (_TOKENS_SEPARADOR if atual else 0)
+
+        atual.append((unidade, n))
+        tokens_atual += custo
+        novas += 1
+
+    if atual and novas:
+        chunks.append("\n\n".join(u for u, _ in atual))
+
+    log(f"   Chunking finalizado → {len(chunks)} chunk(s) gerados")
+    return chunks
@@ -1,5 +1,6 @@
 import re
 from utils.logger import log
+from utils.timing import medir
 
 
 def extrair_trecho(texto: str, inicio: str, fim: str) -> str:
@@ -15,6 +16,7 @@ def extrair_trecho(texto: str, inicio: str, fim: str) -> str:
     return match.group(1).strip() if match else ""
 
 
+@medir("secao.operacao")
 def extrair_operacao(texto: str) -> str:
     """
     Extrai seção 4 - Destaques da Operação até antes de 5 - Gerações
@@ -23,6 +25,7 @@ def extrair_operacao(texto: str) -> str:
     return extrair_trecho(texto, "4 - Destaques da Operação", "5 - Gerações")
 
 
+@medir("secao.termica")
 def extrair_termica(texto: str) -> str:
     """
     Extrai seção 6 - Destaques da Geração Térmica até antes do 7 - Demandas Máximas
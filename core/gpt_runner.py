@@ -1,24 +1,182 @@
 # core/gpt_runner.py
 """
 Camada de orquestração entre prompts, PDFs e OpenAI Responses API.
+
+Seções que não cabem em OPENAI_CONTEXTO_TOKENS são divididas em chunks
+(core/chunking.py), enviadas em paralelo pelo cliente v2 e recombinadas
+com core/json_merge (merge + deduplicação).
+
+Prompts montados com prefixo estático (instruções [+ schema]) e dados
+variáveis (data, texto) no fim, para aproveitar o cache de prefixo do provedor.
+
+O modelo de cada chamada vem de core/roteador_modelos: modelo pequeno primeiro
+para seções curtas, escalando na cadeia quando a resposta não valida.
 """
 
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from config.settings import (
+    OPENAI_STRUCTURED_OUTPUT,
+    OPENAI_CONTEXTO_TOKENS,
+    CHUNK_OVERLAP_TOKENS,
+    GPT_CHUNKS_PARALELOS,
+)
+from core.chunking import contar_tokens, split_text_by_tokens
+from core.json_merge import merge_respostas, deduplicar
+from core.llm_backend import obter_backend, ErroArquivoInvalido
 from core.openai_client_v2 import chamar_gpt_v2
+from core.roteador_modelos import escolher_modelos
+from core.schemas import formato_para_prompt
+from database.arquivos_llm import obter_file_id, registrar_file_id, remover_file_id
 from utils.logger import log
+from utils.timing import incrementar
+
+PLACEHOLDER_TEXTO = "{{TEXTO_EXTRAIDO}}"
+PLACEHOLDER_DATA = "{{DATA_RELATORIO}}"
 
 
-def processar_trecho_com_gpt(trecho: str, prompt_base: str) -> dict:
+def _inicio_dados(prompt_base: str) -> int:
+    """Início da linha do primeiro placeholder: daí em diante o prompt varia."""
+    posicoes = [p for p in (prompt_base.find(PLACEHOLDER_DATA), prompt_base.find(PLACEHOLDER_TEXTO)) if p >= 0]
+    if not posicoes:
+        return len(prompt_base)
+    return prompt_base.rfind("\n", 0, min(posicoes)) + 1
+
+
+def montar_prompt(prompt_base: str, trecho: str, tipo: str | None = None, data: str | None = None) -> str:
+    """
+    Prefixo estático (instruções do template + schema, se structured output
+    estiver desligado) seguido do bloco variável com data e texto.
+    """
+    corte = _inicio_dados(prompt_base)
+    prefixo, dados = prompt_base[:corte], prompt_base[corte:]
+
+    if tipo and not OPENAI_STRUCTURED_OUTPUT:
+        prefixo = prefixo.rstrip() + "\n\n" + formato_para_prompt(tipo) + "\n\n"
+    if data:
+        dados = dados.replace(PLACEHOLDER_DATA, data)
+
+    return prefixo + dados.replace(PLACEHOLDER_TEXTO, trecho)
+
+
+def _chamar_roteado(prompt: str, tipo: str | None, tokens_secao: int) -> dict:
+    """Tenta a cadeia de modelos do roteador; só o último tem retentativas completas."""
+    modelos = escolher_modelos(tipo, tokens_secao)
+
+    for i, modelo in enumerate(modelos):
+        ultimo = i == len(modelos) - 1
+        try:
+            return chamar_gpt_v2(prompt, tipo=tipo, modelo=modelo, max_retries=3 if ultimo else 1)
+        except RuntimeError:
+            if ultimo:
+                raise
+            log(f"   [GPT] {modelo} falhou para {tipo} → escalando para {modelos[i + 1]}")
+            incrementar("gpt_escalonamentos")
+
+
+def processar_trecho_com_gpt(
+    trecho: str,
+    prompt_base: str,
+    tipo: str | None = None,
+    data: str | None = None,
+) -> dict:
     """
     Fluxo para trechos textuais (operação e térmica).
+
+    Com tipo informado, o contrato vai como structured output; se structured
+    output estiver desligado, o JSON Schema é anexado ao prompt. Trecho maior
+    que o orçamento de contexto → chunks em paralelo (ver módulo).
     """
-    prompt = prompt_base.replace("{{TEXTO_EXTRAIDO}}", trecho)
+    if tipo:
+        limite = OPENAI_CONTEXTO_TOKENS - contar_tokens(montar_prompt(prompt_base, "", tipo, data))
+        chunks = split_text_by_tokens(trecho, max_tokens=max(limite, 500), overlap_tokens=CHUNK_OVERLAP_TOKENS)
+        if len(chunks) > 1:
+            return processar_chunks_com_gpt(chunks, prompt_base, tipo, data)
+
+    prompt = montar_prompt(prompt_base, trecho, tipo, data)
     print("prompt:\n\n", prompt)
-    return chamar_gpt_v2(prompt)
+    return _chamar_roteado(prompt, tipo, contar_tokens(trecho))
+
 
+def processar_chunks_com_gpt(chunks: list[str], prompt_base: str, tipo: str, data: str | None = None) -> dict:
+    """Envia os chunks em paralelo e combina as respostas (ordem dos chunks preservada)."""
+    log(f"   Enviando {len(chunks)} chunk(s) de {tipo} em paralelo (até {GPT_CHUNKS_PARALELOS} simultâneos)...")
+    incrementar("gpt_chunks", len(chunks))
 
-def processar_pdf_com_prompt(pdf_bytes: bytes, prompt: str) -> dict:
+    def enviar(chunk: str) -> dict:
+        return _chamar_roteado(montar_prompt(prompt_base, chunk, tipo, data), tipo, contar_tokens(chunk))
+
+    with ThreadPoolExecutor(max_workers=min(GPT_CHUNKS_PARALELOS, len(chunks))) as pool:
+        parciais = list(pool.map(enviar, chunks))
+
+    return deduplicar(merge_respostas(parciais, tipo), tipo)
+
+
+# ---------------------------------------------------------
+# Modo PDF completo (multimodal)
+# ---------------------------------------------------------
+
+_upload_lock = threading.Lock()
+
+
+def digest_arquivo(path: Path) -> str:
+    """sha256 do arquivo, lido em blocos (sem carregar o PDF inteiro)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def enviar_pdf(pdf_path: Path, invalido: str | None = None) -> str:
     """
-    Fluxo para PDFs completos (caso futuro de migração total).
+    Garante que o PDF está no provedor e devolve o file_id.
+    Deduplicado por digest (tabela arquivos_llm): operação e térmica — e
+    execuções seguintes — reaproveitam o mesmo envio.
+
+    invalido: file_id recusado pelo provedor; se ainda for o registrado, é
+    esquecido e o PDF reenviado (se outro worker já reenviou, usa o novo).
     """
-    log("   Enviando PDF completo como input multimodal...")
-    return chamar_gpt_v2(prompt, pdf_bytes=pdf_bytes)
+    pdf_path = Path(pdf_path)
+    backend = obter_backend()
+    digest = digest_arquivo(pdf_path)
+
+    # Lock: os workers de operação e térmica do mesmo PDF não enviam em dobro
+    with _upload_lock:
+        file_id = obter_file_id(digest, backend.nome)
+        if file_id and file_id == invalido:
+            remover_file_id(digest, backend.nome)
+            file_id = None
+        if file_id:
+            incrementar("pdf_upload_reuso")
+            return file_id
+
+        log(f"   Enviando {pdf_path.name} ao provedor (upload único)...")
+        file_id = backend.enviar_arquivo(pdf_path)
+        registrar_file_id(digest, backend.nome, file_id, pdf_path.name, pdf_path.stat().st_size)
+        incrementar("pdf_uploads")
+        return file_id
+
+
+def processar_pdf_com_prompt(pdf: Path | bytes, prompt: str, tipo: str | None = None) -> dict:
+    """
+    Fluxo para PDFs completos.
+
+    pdf como Path → upload único por digest e referência por file_id
+    (file_id recusado pelo provedor → reenvia uma vez e repete a chamada);
+    pdf como bytes → envio inline (legado, reenviado a cada prompt).
+    """
+    if isinstance(pdf, (bytes, bytearray)):
+        log("   Enviando PDF completo como input multimodal...")
+        return chamar_gpt_v2(prompt, pdf_bytes=pdf, tipo=tipo)
+
+    file_id = enviar_pdf(pdf)
+    try:
+        return chamar_gpt_v2(prompt, tipo=tipo, file_id=file_id)
+    except ErroArquivoInvalido as e:
+        log(f"   [GPT] Provedor recusou o arquivo {file_id} ({e}) → reenviando {Path(pdf).name}")
+        incrementar("pdf_upload_invalido")
+        return chamar_gpt_v2(prompt, tipo=tipo, file_id=enviar_pdf(pdf, invalido=file_id))
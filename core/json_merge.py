@@ -24,3 +24,67 @@ def merge_respostas(parciais: list, tipo: str) -> dict:
             final["destaques_geracao_termica"] += p.get("destaques_geracao_termica", [])
 
     return final
+
+
+# ---------------------------------------------------------
+# Deduplicação (chunks com overlap repetem itens da fronteira)
+# ---------------------------------------------------------
+
+def _norm(s) -> str:
+    return " ".join(str(s or "").split()).casefold()
+
+
+def _preferir_desvio(a: dict, b: dict) -> dict:
+    """Entre duas versões do mesmo campo, fica a que relata desvio."""
+    if not a:
+        return b
+    if (a or {}).get("status") == "Sem desvio" and (b or {}).get("status") not in (None, "Sem desvio"):
+        return b
+    return a
+
+
+def _dedup_termica(itens: list) -> list:
+    vistos, out = set(), []
+    for item in itens:
+        chave = (_norm(item.get("unidade_geradora")), item.get("desvio_mw"), item.get("desvio_status"))
+        if chave not in vistos:
+            vistos.add(chave)
+            out.append(item)
+    return out
+
+
+def _dedup_operacao(itens: list) -> list:
+    """Une itens do mesmo submercado vindos de chunks diferentes."""
+    por_submercado: dict[str, dict] = {}
+
+    for item in itens:
+        chave = _norm(item.get("submercado"))
+        atual = por_submercado.get(chave)
+        if atual is None:
+            por_submercado[chave] = {**item, "geracao": list(item.get("geracao", [])),
+                                     "restricoes": list(item.get("restricoes", []))}
+            continue
+
+        geracao = {_norm(g.get("tipo")): g for g in atual["geracao"]}
+        for g in item.get("geracao", []):
+            t = _norm(g.get("tipo"))
+            geracao[t] = _preferir_desvio(geracao[t], g) if t in geracao else g
+        atual["geracao"] = list(geracao.values())
+
+        for r in item.get("restricoes", []):
+            if r not in atual["restricoes"]:
+                atual["restricoes"].append(r)
+
+        for campo in ("carga", "transferencia_energia"):
+            atual[campo] = _preferir_desvio(atual.get(campo), item.get(campo))
+
+    return list(por_submercado.values())
+
+
+def deduplicar(final: dict, tipo: str) -> dict:
+    """Remove itens repetidos de uma resposta combinada por merge_respostas."""
+    if tipo == "operacao":
+        final["destaques_operacao"] = _dedup_operacao(final.get("destaques_operacao", []))
+    elif tipo == "termica":
+        final["destaques_geracao_termica"] = _dedup_termica(final.get("destaques_geracao_termica", []))
+    return final
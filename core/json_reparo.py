@@ -0,0 +1,126 @@
+# core/json_reparo.py
+"""
+Recuperação tolerante de JSON devolvido pelo modelo.
+
+Antes de reenviar o prompt inteiro por causa de um JSON inválido, tenta:
+1. remover cercas de markdown (```json ... ```) e texto fora do objeto
+2. remover vírgulas sobrando antes de } / ]
+3. resposta truncada: cortar no último elemento COMPLETO de
+   destaques_operacao / destaques_geracao_termica (ou, sem essas listas,
+   no último objeto/lista fechado) e fechar os colchetes/chaves abertos
+
+Só 1 e 2 são reparos cosméticos. O passo 3 devolve um resultado PARCIAL e
+vem sinalizado (truncado=True): o chamador deve tratá-lo como falha
+retentável e nunca cacheá-lo/persisti-lo como resposta completa.
+
+Se nada disso produzir JSON válido, levanta json.JSONDecodeError e o
+chamador volta ao fluxo de retentativa.
+"""
+
+import json
+import re
+
+
+CHAVES_LISTA = ("destaques_operacao", "destaques_geracao_termica")
+
+_RE_CERCA = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|$)", re.DOTALL | re.IGNORECASE)
+_RE_VIRGULA_SOBRANDO = re.compile(r",\s*([}\]])")
+
+_FECHA = {"{": "}", "[": "]"}
+
+
+def _sem_cercas(texto: str) -> str:
+    texto = texto.strip()
+    m = _RE_CERCA.search(texto)
+    if m:
+        texto = m.group(1)
+    inicio = texto.find("{")
+    return texto[inicio:] if inicio >= 0 else texto
+
+
+def _pontos_de_corte(texto: str) -> tuple[list, list]:
+    """
+    Varre o texto (respeitando strings) e devolve dois históricos de cortes
+    seguros, cada um como [(posição, fechamentos pendentes)]:
+    - elementos completos (ou abertura) das listas de CHAVES_LISTA
+    - qualquer objeto/lista fechado
+    """
+    pilha: list[tuple[str, str | None]] = []
+    em_string = escape = False
+    ultima_string = chave_pendente = None
+    inicio_string = 0
+
+    cortes_lista, cortes_gerais = [], []
+
+    def fechamentos() -> str:
+        return "".join(_FECHA[c] for c, _ in reversed(pilha))
+
+    for i, ch in enumerate(texto):
+        if em_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                em_string = False
+                ultima_string = texto[inicio_string:i]
+            continue
+
+        if ch == '"':
+            em_string = True
+            inicio_string = i + 1
+        elif ch == ":":
+            chave_pendente = ultima_string
+        elif ch == ",":
+            chave_pendente = None
+        elif ch in "{[":
+            pilha.append((ch, chave_pendente))
+            chave_pendente = None
+            if ch == "[" and pilha[-1][1] in CHAVES_LISTA:
+                cortes_lista.append((i + 1, fechamentos()))
+        elif ch in "}]":
+            if not pilha or _FECHA[pilha[-1][0]] != ch:
+                break
+            pilha.pop()
+            chave_pendente = None
+            if not pilha:
+                # objeto raiz completo: nada depois dele importa
+                return [(i + 1, "")], []
+            cortes_gerais.append((i + 1, fechamentos()))
+            if ch == "}" and pilha[-1][0] == "[" and pilha[-1][1] in CHAVES_LISTA:
+                cortes_lista.append((i + 1, fechamentos()))
+
+    return cortes_lista, cortes_gerais
+
+
+def _tentar(texto: str):
+    try:
+        return json.loads(texto)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(_RE_VIRGULA_SOBRANDO.sub(r"\1", texto))
+    except json.JSONDecodeError:
+        return None
+
+
+def reparar_json(texto: str) -> tuple[dict, bool]:
+    """
+    Recupera um objeto JSON de uma resposta malformada ou truncada.
+    Retorna (dados, truncado): truncado=True quando foi preciso cortar a
+    resposta — dados é então só a parte completa.
+    Levanta json.JSONDecodeError se não houver o que salvar.
+    """
+    limpo = _sem_cercas(texto or "")
+
+    dados = _tentar(limpo)
+    if isinstance(dados, dict):
+        return dados, False
+
+    cortes_lista, cortes_gerais = _pontos_de_corte(limpo)
+    for pos, fechamento in reversed(cortes_lista or cortes_gerais):
+        dados = _tentar(limpo[:pos] + fechamento)
+        if isinstance(dados, dict):
+            return dados, True
+
+    raise json.JSONDecodeError("JSON irrecuperável", texto or "", 0)
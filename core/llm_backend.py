@@ -0,0 +1,316 @@
+# core/llm_backend.py
+"""
+Backends de LLM plugáveis para o cliente v2.
+
+Todo backend expõe `criar_resposta(**kwargs)` com os mesmos argumentos de
+`client.responses.create` e devolve um objeto com `output_text` e `usage`
+(input_tokens / output_tokens), como a Responses API, e
+`enviar_arquivo(path)` → file_id para o modo PDF completo.
+
+- BackendOpenAI: produção (Responses API)
+- BackendFake: offline e determinístico; reproduz as respostas do arquivo
+  respostas_llm (ou JSONs de um diretório), com latência, taxa de erros e de 429 configuráveis — para
+  testes de carga/regressão do pipeline sem rede e sem custo
+
+Seleção por IPDO_LLM_BACKEND=openai|fake (config.settings.LLM_BACKEND).
+
+O SDK da OpenAI só é importado na primeira chamada real: `obter_cliente_openai()`
+devolve um cliente único por processo, compartilhado pelo backend, pelo
+cliente legado (core/openai_client.py) e pelo agente.
+"""
+
+import json
+import mmap
+import random
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from config.settings import (
+    LLM_BACKEND,
+    FAKE_LLM_LATENCIA,
+    FAKE_LLM_TAXA_ERRO,
+    FAKE_LLM_TAXA_429,
+)
+from utils.logger import log
+
+
+class ErroLimiteTaxa(Exception):
+    """HTTP 429 do provedor. `retry_after` em segundos, se informado."""
+
+    def __init__(self, mensagem: str, retry_after: float | None = None):
+        super().__init__(mensagem)
+        self.retry_after = retry_after
+
+
+class ErroChaveAusente(ValueError):
+    """OPENAI_API_KEY não definida no ambiente nem no .env."""
+
+
+class ErroArquivoInvalido(Exception):
+    """O provedor não reconhece o file_id enviado (expirado, removido ou de outra conta)."""
+
+
+class BackendLLM:
+    nome = "base"
+
+    def criar_resposta(self, **kwargs):
+        raise NotImplementedError
+
+    def enviar_arquivo(self, path: Path) -> str:
+        """Envia um arquivo ao provedor e devolve o file_id."""
+        raise NotImplementedError
+
+
+# ---------------------------------------------------------
+# OpenAI
+# ---------------------------------------------------------
+
+_cliente_openai = None
+_cliente_lock = threading.Lock()
+
+
+def obter_cliente_openai():
+    """
+    Cliente OpenAI compartilhado do processo (SDK importado na primeira chamada).
+    Sem OPENAI_API_KEY levanta ErroChaveAusente antes de construir o cliente.
+    """
+    global _cliente_openai
+    with _cliente_lock:
+        if _cliente_openai is None:
+            import os
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            chave = os.getenv("OPENAI_API_KEY")
+            if not chave:
+                raise ErroChaveAusente("OPENAI_API_KEY não encontrada no ambiente/.env")
+
+            from openai import OpenAI
+
+            _cliente_openai = OpenAI(api_key=chave)
+        return _cliente_openai
+
+
+class BackendOpenAI(BackendLLM):
+    nome = "openai"
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        return self._client or obter_cliente_openai()
+
+    def criar_resposta(self, **kwargs):
+        from openai import BadRequestError, NotFoundError, RateLimitError
+
+        try:
+            return self.client.responses.create(**kwargs)
+        except (NotFoundError, BadRequestError) as e:
+            if _file_ids_do_input(kwargs.get("input")) and "file" in str(e).lower():
+                raise ErroArquivoInvalido(str(e)) from e
+            raise
+        except RateLimitError as e:
+            retry_after = None
+            try:
+                retry_after = float(e.response.headers.get("retry-after"))
+            except Exception:
+                pass
+            raise ErroLimiteTaxa(str(e), retry_after) from e
+
+    def enviar_arquivo(self, path: Path) -> str:
+        # mmap: o upload lê direto das páginas do arquivo, sem cópia em memória
+        path = Path(path)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            arquivo = self.client.files.create(
+                file=(path.name, m, "application/pdf"),
+                purpose="user_data",
+            )
+        return arquivo.id
+
+
+# ---------------------------------------------------------
+# Fake (replay offline)
+# ---------------------------------------------------------
+
+_RE_DATA = re.compile(r"Data do relat[óo]rio:\s*(\d{4}-\d{2}-\d{2})")
+
+_CHAVES = {
+    "operacao": "destaques_operacao",
+    "termica": "destaques_geracao_termica",
+}
+
+
+def _texto_do_input(payload) -> str:
+    """Concatena o texto de um input da Responses API (string ou lista de mensagens)."""
+    if isinstance(payload, str):
+        return payload
+
+    partes = []
+    for msg in payload or []:
+        conteudo = msg.get("content") if isinstance(msg, dict) else None
+        if isinstance(conteudo, str):
+            partes.append(conteudo)
+        elif isinstance(conteudo, list):
+            partes.extend(c.get("text", "") for c in conteudo if isinstance(c, dict))
+    return "\n".join(partes)
+
+
+def _file_ids_do_input(payload) -> list[str]:
+    """file_ids referenciados num input da Responses API."""
+    if isinstance(payload, str):
+        return []
+    ids = []
+    for msg in payload or []:
+        conteudo = msg.get("content") if isinstance(msg, dict) else None
+        if isinstance(conteudo, list):
+            ids.extend(c["file_id"] for c in conteudo if isinstance(c, dict) and c.get("file_id"))
+    return ids
+
+
+class BackendFake(BackendLLM):
+    """
+    Reproduz respostas gravadas indexadas por (data, tipo).
+    Sem gravação para o par → devolve o contrato vazio do tipo.
+
+    diretorio: lê `<pdf>_<tipo>.json` desse diretório em vez do arquivo
+    respostas_llm (database/respostas_llm.py).
+    """
+
+    nome = "fake"
+
+    def __init__(
+        self,
+        diretorio: Path | None = None,
+        latencia: float = FAKE_LLM_LATENCIA,
+        taxa_erro: float = FAKE_LLM_TAXA_ERRO,
+        taxa_429: float = FAKE_LLM_TAXA_429,
+        seed: int = 0,
+    ):
+        self.latencia = latencia
+        self.taxa_erro = taxa_erro
+        self.taxa_429 = taxa_429
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.gravacoes = self._indexar(Path(diretorio)) if diretorio else self._indexar_arquivo()
+        self.chamadas = 0
+        self.arquivos: dict[str, Path] = {}
+        self._enviados = 0
+
+    @staticmethod
+    def _indexar(diretorio: Path) -> dict[tuple[str, str], dict]:
+        gravacoes = {}
+        for path in diretorio.glob("*.json"):
+            for tipo, chave in _CHAVES.items():
+                if not path.stem.endswith(f"_{tipo}"):
+                    continue
+                try:
+                    dados = json.loads(path.read_text(encoding="utf-8"))
+                except Exception:
+                    continue
+                if dados.get("data") and chave in dados:
+                    dados.pop("_metadata", None)
+                    gravacoes[(dados["data"], tipo)] = dados
+        return gravacoes
+
+    @staticmethod
+    def _indexar_arquivo() -> dict[tuple[str, str], dict]:
+        from database.respostas_llm import listar_respostas
+
+        try:
+            respostas = listar_respostas()
+        except sqlite3.Error:
+            # Banco ainda não inicializado → nada a reproduzir
+            return {}
+        return {
+            (data, tipo): dados
+            for data, tipo, dados in respostas
+            if tipo in _CHAVES and _CHAVES[tipo] in dados
+        }
+
+    @staticmethod
+    def _identificar(texto: str, kwargs: dict) -> tuple[str | None, str]:
+        formato = ((kwargs.get("text") or {}).get("format") or {}).get("name", "")
+        if "termica" in formato or "destaques_geracao_termica" in texto:
+            tipo = "termica"
+        else:
+            tipo = "operacao"
+        m = _RE_DATA.search(texto)
+        return (m.group(1) if m else None), tipo
+
+    def enviar_arquivo(self, path: Path) -> str:
+        with self._lock:
+            self._enviados += 1
+            file_id = f"file-fake-{self._enviados}"
+            self.arquivos[file_id] = Path(path)
+        return file_id
+
+    def criar_resposta(self, **kwargs):
+        with self._lock:
+            self.chamadas += 1
+            sorteio = self._rng.random()
+            atraso = self._rng.uniform(0.5, 1.5) * self.latencia
+
+        time.sleep(atraso)
+
+        if sorteio < self.taxa_429:
+            raise ErroLimiteTaxa("429 simulado pelo backend fake", retry_after=self.latencia)
+        if sorteio < self.taxa_429 + self.taxa_erro:
+            raise RuntimeError("500 simulado pelo backend fake")
+
+        desconhecidos = [f for f in _file_ids_do_input(kwargs.get("input")) if f not in self.arquivos]
+        if desconhecidos:
+            raise ErroArquivoInvalido(f"file_id desconhecido pelo backend fake: {desconhecidos[0]}")
+
+        texto_prompt = _texto_do_input(kwargs.get("input"))
+        data, tipo = self._identificar(texto_prompt, kwargs)
+
+        dados = self.gravacoes.get((data, tipo)) or {"data": data, _CHAVES[tipo]: []}
+        saida = json.dumps(dados, ensure_ascii=False)
+
+        return SimpleNamespace(
+            output_text=saida,
+            output=[],
+            usage=SimpleNamespace(
+                input_tokens=max(1, len(texto_prompt) // 4),
+                output_tokens=max(1, len(saida) // 4),
+            ),
+        )
+
+
+# ---------------------------------------------------------
+# Seleção
+# ---------------------------------------------------------
+
+_backend: BackendLLM | None = None
+_backend_lock = threading.Lock()
+
+
+def criar_backend(nome: str = LLM_BACKEND) -> BackendLLM:
+    if nome == "openai":
+        return BackendOpenAI()
+    if nome == "fake":
+        backend = BackendFake()
+        log(f"   [LLM] Backend fake ativo ({len(backend.gravacoes)} resposta(s) gravada(s))")
+        return backend
+    raise ValueError(f"Backend de LLM desconhecido: {nome} (use 'openai' ou 'fake')")
+
+
+def obter_backend() -> BackendLLM:
+    """Backend compartilhado do processo (criado na primeira chamada)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = criar_backend()
+        return _backend
+
+
+def definir_backend(backend: BackendLLM | None):
+    """Troca o backend do processo (testes/benchmarks). None → volta ao padrão."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
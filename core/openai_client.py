@@ -1,20 +1,15 @@
-from openai import OpenAI
 from config.settings import OPENAI_MODEL
 import json
 import time
 from utils.logger import log
-from dotenv import load_dotenv
-import os
+from utils.timing import incrementar
+from core.json_reparo import reparar_json
+from core.llm_backend import obter_cliente_openai
 
 
-load_dotenv()
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 def chamar_gpt(prompt: str, max_retries=3) -> dict:
 
-    if not client.api_key:
-         raise ValueError("OPENAI_API_KEY não encontrada! Verifique o arquivo .env")
+    client = obter_cliente_openai()  # sem chave → ErroChaveAusente (ValueError)
 
     for tentativa in range(max_retries):
         try:
@@ -27,11 +22,20 @@ def chamar_gpt(prompt: str, max_retries=3) -> dict:
                 ]
             )
             conteudo = response.choices[0].message.content.strip()
-            return json.loads(conteudo)
+            try:
+                return json.loads(conteudo)
+            except json.JSONDecodeError:
+                dados, truncado = reparar_json(conteudo)
+                if truncado:
+                    raise json.JSONDecodeError("Resposta truncada", conteudo, len(conteudo))
+                log("JSON malformado reparado localmente.")
+                incrementar("gpt_json_reparado")
+                return dados
         except json.JSONDecodeError:
             if tentativa == max_retries - 1:
                 raise
-            log("JSON inválido retornado. Tentando novamente...")
+            log("JSON inválido e irrecuperável. Tentando novamente...")
+            incrementar("gpt_json_rechamado")
             time.sleep(2)
         except Exception as e:
             if tentativa == max_retries - 1:
@@ -2,23 +2,34 @@
 """
 Cliente OpenAI usando a Responses API (API moderna).
 Compatível com:
+- Structured output (JSON Schema strict) + validação local do contrato
 - JSON-only via prompt
+- Reparo local de JSON malformado (cercas, vírgulas) antes de retentar;
+  resposta truncada é retentada, nunca devolvida parcial (core/json_reparo.py)
 - Retentativas
 - Timeout explícito
-- Envio opcional de PDF
+- Envio opcional de PDF (inline ou por file_id já enviado)
+- Modelo por chamada + registro de latência/tokens/custo por modelo (core/roteador_modelos.py)
+- Backend plugável (OpenAI ou fake offline, ver core/llm_backend.py)
 """
 
-from openai import OpenAI
-from dotenv import load_dotenv
-import os
 import json
 import time
 from utils.logger import log
-from config.settings import OPENAI_MODEL, OPENAI_TIMEOUT
+from utils.timing import span, incrementar
+from config.settings import OPENAI_MODEL, OPENAI_TIMEOUT, GPT_ESPERA_RETENTATIVA, OPENAI_STRUCTURED_OUTPUT
+from core.llm_backend import obter_backend, ErroArquivoInvalido, ErroChaveAusente, ErroLimiteTaxa
+from core.schemas import SCHEMAS, ErroSchema, formato_structured_output, validar
+from core.json_reparo import CHAVES_LISTA, reparar_json
+from core.roteador_modelos import registrar_resultado
 
-load_dotenv()
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+class RespostaTruncada(ValueError):
+    """Resposta cortada no meio: só a parte completa foi recuperada."""
+
+    def __init__(self, parcial: dict):
+        self.itens = sum(len(parcial.get(c) or []) for c in CHAVES_LISTA)
+        super().__init__(f"resposta truncada ({self.itens} item(ns) completo(s))")
 
 
 def _extrair_texto_json(response) -> str:
@@ -40,59 +51,165 @@ def _extrair_texto_json(response) -> str:
     return "\n".join(textos).strip()
 
 
-def chamar_gpt_v2(prompt: str, pdf_bytes: bytes = None, max_retries: int = 3) -> dict:
+def _registrar_uso(response, attrs: dict) -> tuple[int, int]:
+    """Acumula tokens de entrada/saída da resposta no span e nos contadores."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0
+
+    entrada = getattr(usage, "input_tokens", 0) or 0
+    saida = getattr(usage, "output_tokens", 0) or 0
+    # Tokens de entrada servidos do cache de prefixo do provedor
+    cache = getattr(getattr(usage, "input_tokens_details", None), "cached_tokens", 0) or 0
+
+    attrs["tokens_entrada"] = attrs.get("tokens_entrada", 0) + entrada
+    attrs["tokens_saida"] = attrs.get("tokens_saida", 0) + saida
+    attrs["tokens_cache"] = attrs.get("tokens_cache", 0) + cache
+    incrementar("tokens_entrada", entrada)
+    incrementar("tokens_saida", saida)
+    incrementar("tokens_cache", cache)
+    return entrada, saida
+
+
+def chamar_gpt_v2(
+    prompt: str,
+    pdf_bytes: bytes = None,
+    max_retries: int = 3,
+    tipo: str | None = None,
+    modelo: str | None = None,
+    file_id: str | None = None,
+) -> dict:
     """
     Chamada ao GPT usando Responses API.
     Retorna dict (JSON parseado).
+
+    tipo: 'operacao' | 'termica' → envia o JSON Schema do contrato como
+    structured output (se OPENAI_STRUCTURED_OUTPUT) e valida a resposta localmente.
+    modelo: sobrepõe OPENAI_MODEL (escolhido pelo roteador de modelos).
+    file_id: PDF já enviado ao provedor (ver gpt_runner.enviar_pdf); evita
+    reenviar os bytes a cada prompt.
     """
 
-    for tentativa in range(1, max_retries + 1):
-
-        log(f"   [GPT] Tentativa {tentativa}/{max_retries} usando Responses API...")
-
-        try:
-            # -----------------------------
-            # Montagem do input
-            # -----------------------------
-            if pdf_bytes:
-                input_payload = [
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "input_text", "text": prompt},
-                            {
-                                "type": "input_file",
-                                "mime_type": "application/pdf",
-                                "data": pdf_bytes
-                            }
-                        ]
-                    }
-                ]
-            else:
-                input_payload = prompt
-
-            # -----------------------------
-            # Chamada OpenAI
-            # -----------------------------
-            response = client.responses.create(
-                model=OPENAI_MODEL,
-                input=input_payload,
-                timeout=OPENAI_TIMEOUT
-            )
-
-            texto = _extrair_texto_json(response)
-
-            if not texto:
-                raise ValueError("Resposta vazia da OpenAI Responses API.")
-
-            return json.loads(texto)
-
-        except json.JSONDecodeError:
-            log("   [ERRO] JSON inválido retornado. Retentando...")
-            time.sleep(2)
-
-        except Exception as e:
-            log(f"   [ERRO] OpenAI Responses API: {e}")
-            time.sleep(2)
-
-    raise RuntimeError("Falha após múltiplas tentativas com Responses API.")
+    backend = obter_backend()
+    modelo = modelo or OPENAI_MODEL
+
+    with span("gpt.chamada", modelo=modelo, backend=backend.nome) as attrs:
+
+        for tentativa in range(1, max_retries + 1):
+
+            log(f"   [GPT] Tentativa {tentativa}/{max_retries} usando Responses API...")
+            attrs["tentativas"] = tentativa
+            incrementar("gpt_chamadas")
+
+            try:
+                # -----------------------------
+                # Montagem do input
+                # -----------------------------
+                if file_id:
+                    input_payload = [
+                        {
+                            "role": "user",
+                            "content": [
+                                {"type": "input_text", "text": prompt},
+                                {"type": "input_file", "file_id": file_id},
+                            ]
+                        }
+                    ]
+                elif pdf_bytes:
+                    input_payload = [
+                        {
+                            "role": "user",
+                            "content": [
+                                {"type": "input_text", "text": prompt},
+                                {
+                                    "type": "input_file",
+                                    "mime_type": "application/pdf",
+                                    "data": pdf_bytes
+                                }
+                            ]
+                        }
+                    ]
+                else:
+                    input_payload = prompt
+
+                # -----------------------------
+                # Chamada ao backend (OpenAI ou fake)
+                # -----------------------------
+                kwargs = {}
+                if tipo and OPENAI_STRUCTURED_OUTPUT:
+                    kwargs["text"] = formato_structured_output(tipo)
+
+                t0 = time.perf_counter()
+                response = backend.criar_resposta(
+                    model=modelo,
+                    input=input_payload,
+                    timeout=OPENAI_TIMEOUT,
+                    **kwargs
+                )
+                duracao = time.perf_counter() - t0
+
+                tokens = _registrar_uso(response, attrs)
+
+                texto = _extrair_texto_json(response)
+
+                if not texto:
+                    raise ValueError("Resposta vazia da OpenAI Responses API.")
+
+                try:
+                    dados = json.loads(texto)
+                except json.JSONDecodeError:
+                    dados, truncado = reparar_json(texto)
+                    if truncado:
+                        raise RespostaTruncada(dados)
+                    log("   [GPT] JSON malformado reparado localmente (sem nova chamada).")
+                    incrementar("gpt_json_reparado")
+
+                if tipo:
+                    erros = validar(dados, SCHEMAS[tipo])
+                    if erros:
+                        raise ErroSchema("; ".join(erros[:5]))
+
+                registrar_resultado(modelo, tipo, True, duracao, *tokens)
+                return dados
+
+            except ErroSchema as e:
+                registrar_resultado(modelo, tipo, False, duracao, *tokens)
+                log(f"   [ERRO] Resposta fora do contrato de {tipo}: {e}. Retentando...")
+                incrementar("gpt_fora_do_schema")
+                incrementar("gpt_retentativas")
+                time.sleep(GPT_ESPERA_RETENTATIVA)
+
+            except RespostaTruncada as e:
+                registrar_resultado(modelo, tipo, False, duracao, *tokens)
+                log(f"   [ERRO] Resposta truncada ({e.itens} item(ns) completo(s)). Retentando...")
+                incrementar("gpt_json_truncado")
+                incrementar("gpt_retentativas")
+                time.sleep(GPT_ESPERA_RETENTATIVA)
+
+            except json.JSONDecodeError:
+                registrar_resultado(modelo, tipo, False, duracao, *tokens)
+                log("   [ERRO] JSON inválido e irrecuperável. Retentando...")
+                incrementar("gpt_json_rechamado")
+                incrementar("gpt_retentativas")
+                time.sleep(GPT_ESPERA_RETENTATIVA)
+
+            except ErroArquivoInvalido:
+                # Retentar com o mesmo file_id não adianta: quem chamou reenvia o PDF
+                raise
+
+            except ErroChaveAusente:
+                raise
+
+            except ErroLimiteTaxa as e:
+                espera = e.retry_after or GPT_ESPERA_RETENTATIVA * (2 ** tentativa)
+                log(f"   [ERRO] Limite de taxa (429). Aguardando {espera:.1f}s...")
+                incrementar("gpt_limite_taxa")
+                incrementar("gpt_retentativas")
+                time.sleep(espera)
+
+            except Exception as e:
+                log(f"   [ERRO] OpenAI Responses API: {e}")
+                incrementar("gpt_retentativas")
+                time.sleep(GPT_ESPERA_RETENTATIVA)
+
+        raise RuntimeError("Falha após múltiplas tentativas com Responses API.")
@@ -0,0 +1,142 @@
+# core/parser_termica.py
+"""
+Parser determinístico da seção "Destaques da Geração Térmica".
+
+O IPDO descreve cada desvio num padrão regular:
+    "UTE Santa Cruz: geração 350 MW acima do programado, devido a ..."
+    "UTN Angra 2 – 1.234,5 MW abaixo do programado por ..."
+
+- analisar_termica: extrai unidade, MW e direção de cada item; qualquer
+  outra linha com conteúdo (não é cabeçalho nem frase protocolar) volta
+  como não reconhecida (só elas vão ao LLM)
+- vários itens na mesma frase ("...; UTE B: ...", ", UTE B", " e UTE B")
+  são separados; item ambíguo (duas unidades, faixa "300 e 350 MW", outro
+  MW ou outra unidade depois do casamento) também vai ao LLM, inteiro
+- conferir: compara itens do LLM com os do parser (unidade → MW/status)
+  e devolve as divergências
+
+Modo em config.settings.TERMICA_PARSER_MODO ('rapido' | 'conferir' | 'desligado').
+"""
+
+import re
+
+from core.atalho_secoes import e_protocolar
+
+
+_PREFIXO_UNIDADE = r"(?:UTE|UTN|UT|Usina(?:\s+Termel[ée]trica)?)"
+
+# Início de um novo item: linha (ou frase) começando por UTE/UTN/Usina
+_RE_INICIO_ITEM = re.compile(rf"(?:^|\n|(?<=\.)\s+)(?={_PREFIXO_UNIDADE}\s)")
+
+_RE_ITEM = re.compile(
+    rf"^(?P<unidade>{_PREFIXO_UNIDADE}\s+[^:;,–—(]+?)(?:\s*[:;,–—(]|\s+-\s)\s*"
+    r".*?(?P<mw>\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+(?:[.,]\d+)?)\s*MW\s+"
+    r"(?P<direcao>acima|abaixo)\s+d[oa]s?\s+programad[oa]s?",
+    flags=re.IGNORECASE | re.DOTALL,
+)
+
+# Outro item na mesma frase: ";" / "," / " e " seguido de UTE/UTN/Usina (maiúscula)
+_RE_SEPARADOR_ITENS = re.compile(rf"\s*[;,]\s+(?={_PREFIXO_UNIDADE}\s)|\s+e\s+(?={_PREFIXO_UNIDADE}\s)")
+_RE_OUTRA_UNIDADE = re.compile(rf"\b{_PREFIXO_UNIDADE}\s")
+_RE_MW = re.compile(r"\d[\d.,]*\s*MW\b", flags=re.IGNORECASE)
+
+# Título da seção ("6 - Destaques da Geração Térmica"): única linha descartada sem análise
+_RE_CABECALHO = re.compile(
+    r"^(?:\d+\s*[-–—.)]\s*)?destaques?\s+da\s+gera[çc][ãa]o\s+t[ée]rmica\s*:?$",
+    flags=re.IGNORECASE,
+)
+
+# Quebra de linha depois de fim de frase separa itens; sem ponto, a linha continua o item
+_RE_FIM_DE_LINHA = re.compile(r"(?<=[.;])[ \t]*\n")
+
+
+def numero_br(texto: str) -> float:
+    """'1.234,5' → 1234.5 ; '12,5' → 12.5 ; '350' → 350.0 ; '12.5' → 12.5"""
+    if "," in texto:
+        return float(texto.replace(".", "").replace(",", "."))
+    if re.fullmatch(r"\d{1,3}(?:\.\d{3})+", texto):
+        return float(texto.replace(".", ""))
+    return float(texto)
+
+
+def _itens_brutos(trecho: str) -> list[str]:
+    linhas = [l for l in (trecho or "").splitlines() if not _RE_CABECALHO.match(l.strip())]
+    partes = []
+    for bloco in _RE_FIM_DE_LINHA.split("\n".join(linhas)):
+        for parte in _RE_INICIO_ITEM.split(bloco):
+            partes.extend(_dividir_itens(parte))
+    return [" ".join(p.split()) for p in partes if p and p.strip()]
+
+
+def _dividir_itens(bruto: str) -> list[str]:
+    """
+    Separa itens encadeados na mesma frase. Só corta depois de um trecho que
+    já tem MW: em "UTE A e UTE B: 350 MW ..." as duas unidades ficam juntas.
+    """
+    partes, inicio = [], 0
+    for m in _RE_SEPARADOR_ITENS.finditer(bruto):
+        if _RE_MW.search(bruto, inicio, m.start()):
+            partes.append(bruto[inicio:m.start()])
+            inicio = m.end()
+    partes.append(bruto[inicio:])
+    return partes
+
+
+def _casar_item(bruto: str) -> re.Match | None:
+    """Casamento de _RE_ITEM, ou None se o item for ambíguo para o parser."""
+    m = _RE_ITEM.match(bruto)
+    if not m:
+        return None
+    if _RE_OUTRA_UNIDADE.search(m.group("unidade"), 1):
+        return None  # "UTE A e UTE B: ..."
+    if re.search(r"\d", bruto[m.end("unidade"):m.start("mw")]):
+        return None  # "entre 300 e 350 MW", outro número antes do MW
+    resto = bruto[m.end():]
+    if _RE_MW.search(resto) or _RE_OUTRA_UNIDADE.search(resto):
+        return None
+    return m
+
+
+def analisar_termica(trecho: str) -> tuple[list[dict], list[str]]:
+    """
+    Retorna (itens no contrato de destaques_geracao_termica, linhas não reconhecidas).
+    """
+    itens, nao_reconhecidas = [], []
+
+    for bruto in _itens_brutos(trecho):
+        m = _casar_item(bruto)
+        if m:
+            itens.append({
+                "unidade_geradora": " ".join(m.group("unidade").split()),
+                "desvio_mw": numero_br(m.group("mw")),
+                "desvio_status": "Acima" if m.group("direcao").lower() == "acima" else "Abaixo",
+                "descricao": bruto,
+            })
+        elif not e_protocolar(bruto):
+            nao_reconhecidas.append(bruto)
+
+    return itens, nao_reconhecidas
+
+
+def _chave_unidade(nome: str) -> str:
+    return " ".join(str(nome or "").split()).casefold()
+
+
+def conferir(itens_llm: list[dict], itens_parser: list[dict], tolerancia_mw: float = 0.5) -> list[str]:
+    """Divergências entre o LLM e o parser para as unidades que ambos reconheceram."""
+    parser = {_chave_unidade(i["unidade_geradora"]): i for i in itens_parser}
+    divergencias = []
+
+    for item in itens_llm:
+        ref = parser.get(_chave_unidade(item.get("unidade_geradora")))
+        if ref is None:
+            continue
+        mw = item.get("desvio_mw")
+        if mw is None or abs(float(mw) - ref["desvio_mw"]) > tolerancia_mw:
+            divergencias.append(f"{ref['unidade_geradora']}: desvio_mw LLM={mw} parser={ref['desvio_mw']}")
+        if item.get("desvio_status") != ref["desvio_status"]:
+            divergencias.append(
+                f"{ref['unidade_geradora']}: status LLM={item.get('desvio_status')} parser={ref['desvio_status']}"
+            )
+
+    return divergencias
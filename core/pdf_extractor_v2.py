@@ -1,12 +1,24 @@
-# core/pdf_extractor_v2.py
 """
 Módulo de extração de texto usando pypdfium2 (compatível com todas as versões atuais).
+
+PDFs grandes (>= PDF_PARALELO_MIN_PAGINAS) são extraídos em paralelo por
+faixas de páginas num pool de processos; cada worker abre seu próprio
+documento (handles do pdfium não são compartilháveis entre processos) e o
+texto é remontado na ordem das páginas. PDFs pequenos, ou máquinas com um
+único núcleo, seguem no caminho serial. O ponto de virada é medido com
+`python -m tests.benchmark_suite --crossover`.
 """
 
-from pathlib import Path
-import pypdfium2 as pdfium
+import atexit
+import multiprocessing
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from config.settings import PDF_PARALELO_MIN_PAGINAS, PDF_WORKERS
 from utils.logger import log
+from utils.timing import medir
 
 
 def _clean_text(text: str) -> str:
@@ -18,34 +30,117 @@ def _clean_text(text: str) -> str:
     return text.strip()
 
 
-def extrair_texto(pdf_path: Path) -> str:
+def _abrir(pdf_path) -> "pdfium.PdfDocument":
+    # Import tardio: quem só importa main/queries não paga o carregamento do pdfium
+    import pypdfium2 as pdfium
+
+    try:
+        return pdfium.PdfDocument(str(pdf_path))
+    except Exception as e:
+        raise RuntimeError(f"Falha ao abrir PDF '{pdf_path}': {e}")
+
+
+def _extrair_paginas(pdf_path: str, inicio: int, fim: int) -> list[str]:
+    """
+    Extrai as páginas [inicio, fim) com um handle próprio do documento.
+    Função de módulo para poder rodar nos workers do pool.
+    """
+    pdf = _abrir(pdf_path)
+    try:
+        total = len(pdf)
+        textos = []
+        for page_number in range(inicio, min(fim, total)):
+            page = textpage = None
+            try:
+                page = pdf[page_number]
+                textpage = page.get_textpage()
+                textos.append(textpage.get_text_range())
+            except Exception as e:
+                log(f"   [WARN] Falha ao extrair página {page_number+1}/{total}: {e}")
+                textos.append(f"\n[Página {page_number+1} não pôde ser extraída]\n")
+            finally:
+                # Fecha na ordem filho → pai, antes do documento
+                if textpage is not None:
+                    textpage.close()
+                if page is not None:
+                    page.close()
+        return textos
+    finally:
+        pdf.close()
+
+
+def contar_paginas(pdf_path: Path) -> int:
+    pdf = _abrir(pdf_path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+# ---------------------------------------------------------
+# Pool de processos (criado no primeiro PDF grande, reaproveitado)
+# ---------------------------------------------------------
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _obter_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: o main.py usa threads; fork com threads ativas não é seguro
+            _pool = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def _faixas(paginas: int, partes: int) -> list[tuple[int, int]]:
+    """Divide [0, paginas) em `partes` faixas contíguas de tamanho parecido."""
+    partes = max(1, min(partes, paginas))
+    base, resto = divmod(paginas, partes)
+    faixas, inicio = [], 0
+    for i in range(partes):
+        fim = inicio + base + (1 if i < resto else 0)
+        faixas.append((inicio, fim))
+        inicio = fim
+    return faixas
+
+
+def usar_paralelo(paginas: int) -> bool:
+    return PDF_WORKERS > 1 and paginas >= PDF_PARALELO_MIN_PAGINAS
+
+
+@medir("pdf.extrair_texto")
+def extrair_texto(pdf_path: Path, paralelo: bool | None = None) -> str:
     """
     Extrai texto de todas as páginas do PDF usando pypdfium2.
     Compatível com versões antigas e recentes da biblioteca.
+
+    paralelo: None decide pelo tamanho (usar_paralelo); True/False força.
     """
 
     log(f"   Iniciando extração pypdfium2 → {pdf_path.name}")
 
-    try:
-        pdf = pdfium.PdfDocument(str(pdf_path))
-    except Exception as e:
-        raise RuntimeError(f"Falha ao abrir PDF '{pdf_path}': {e}")
-
-    paginas = len(pdf)  # ← número de páginas correto nessa versão
-    texto_final = []
+    paginas = contar_paginas(pdf_path)
+    if paralelo is None:
+        paralelo = usar_paralelo(paginas)
 
-    for page_number in range(paginas):
-        try:
-            page = pdf[page_number]  # ← forma correta de acessar página
-            textpage = page.get_textpage()
-            texto = textpage.get_text_range()
-            texto_final.append(texto)
-        except Exception as e:
-            log(f"   [WARN] Falha ao extrair página {page_number+1}/{paginas}: {e}")
-            texto_final.append(f"\n[Página {page_number+1} não pôde ser extraída]\n")
+    if paralelo and paginas > 1:
+        faixas = _faixas(paginas, PDF_WORKERS)
+        pool = _obter_pool()
+        futuros = [pool.submit(_extrair_paginas, str(pdf_path), i, f) for i, f in faixas]
+        texto_final = [t for futuro in futuros for t in futuro.result()]
+        modo = f"paralelo, {len(faixas)} faixas"
+    else:
+        texto_final = _extrair_paginas(str(pdf_path), 0, paginas)
+        modo = "serial"
 
     texto = "\n".join(texto_final)
     texto = _clean_text(texto)
 
-    log(f"   Extração concluída ({paginas} páginas)")
+    log(f"   Extração concluída ({paginas} páginas, {modo})")
     return texto
@@ -0,0 +1,157 @@
+# core/roteador_modelos.py
+"""
+Roteamento de modelos por tarefa (política em config/settings.py).
+
+- Cada tipo tem uma cadeia de modelos, do mais barato ao mais capaz
+  (ROTEAMENTO_MODELOS); seções curtas começam no primeiro, seções maiores
+  que ROTEAMENTO_MAX_TOKENS_PEQUENO vão direto ao último
+- Resposta fora do contrato (JSON/schema) escala para o próximo da cadeia
+- Modelos com taxa de sucesso abaixo de ROTEAMENTO_TAXA_SUCESSO_MIN nas
+  últimas ROTEAMENTO_JANELA respostas são pulados — exceto numa fração
+  ROTEAMENTO_EXPLORACAO das chamadas, para a janela poder se recuperar se o
+  modelo (ou o prompt) melhorar
+- Latência, tokens e custo (PRECO_MODELOS) por modelo vão para o armazém de
+  métricas (logs/metricas.db → /metrics); a janela de resultados fica no
+  mesmo arquivo, tabela roteamento_resultados
+"""
+
+import random
+import sqlite3
+from pathlib import Path
+
+from config.settings import (
+    OPENAI_MODEL,
+    METRICS_DB_PATH,
+    ROTEAMENTO_MODELOS,
+    ROTEAMENTO_MAX_TOKENS_PEQUENO,
+    ROTEAMENTO_TAXA_SUCESSO_MIN,
+    ROTEAMENTO_MIN_AMOSTRAS,
+    ROTEAMENTO_JANELA,
+    ROTEAMENTO_EXPLORACAO,
+    PRECO_MODELOS,
+)
+from utils import metrics
+from utils.timing import incrementar
+
+
+METRICA_CHAMADAS = "ipdo_gpt_modelo_chamadas_total"
+
+_schemas_criados: set[Path] = set()
+
+
+def _get_conn() -> sqlite3.Connection:
+    path = Path(metrics.armazem.path or METRICS_DB_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+    if path not in _schemas_criados:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS roteamento_resultados (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                modelo TEXT NOT NULL,
+                tipo TEXT NOT NULL,
+                ok INTEGER NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_roteamento_modelo_tipo
+            ON roteamento_resultados (modelo, tipo, id)
+        """)
+        _schemas_criados.add(path)
+    return conn
+
+
+def _registrar_na_janela(modelo: str, tipo: str, ok: bool):
+    """Acrescenta o resultado e descarta o que saiu da janela."""
+    try:
+        conn = _get_conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO roteamento_resultados (modelo, tipo, ok) VALUES (?, ?, ?)",
+                (modelo, tipo, int(ok)),
+            )
+            conn.execute("""
+                DELETE FROM roteamento_resultados
+                WHERE modelo = ? AND tipo = ? AND id <= (
+                    SELECT id FROM roteamento_resultados
+                    WHERE modelo = ? AND tipo = ?
+                    ORDER BY id DESC LIMIT 1 OFFSET ?
+                )
+            """, (modelo, tipo, modelo, tipo, ROTEAMENTO_JANELA))
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        # Assim como as métricas, o histórico de roteamento nunca derruba a ingestão
+        pass
+
+
+def taxa_sucesso(modelo: str, tipo: str) -> float | None:
+    """
+    Fração de respostas válidas do modelo para o tipo nas últimas
+    ROTEAMENTO_JANELA chamadas (None se poucas amostras).
+    """
+    try:
+        conn = _get_conn()
+        try:
+            ok, total = conn.execute("""
+                SELECT COALESCE(SUM(ok), 0), COUNT(*) FROM (
+                    SELECT ok FROM roteamento_resultados
+                    WHERE modelo = ? AND tipo = ?
+                    ORDER BY id DESC LIMIT ?
+                )
+            """, (modelo, tipo, ROTEAMENTO_JANELA)).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    if total < ROTEAMENTO_MIN_AMOSTRAS:
+        return None
+    return ok / total
+
+
+def escolher_modelos(tipo: str | None, tokens_secao: int) -> list[str]:
+    """Cadeia de modelos a tentar, em ordem, para esta seção."""
+    cadeia = list(ROTEAMENTO_MODELOS.get(tipo) or [OPENAI_MODEL])
+
+    if tokens_secao > ROTEAMENTO_MAX_TOKENS_PEQUENO:
+        return cadeia[-1:]
+
+    candidatos = []
+    for modelo in cadeia[:-1]:
+        taxa = taxa_sucesso(modelo, tipo)
+        if taxa is None or taxa >= ROTEAMENTO_TAXA_SUCESSO_MIN:
+            candidatos.append(modelo)
+        elif random.random() < ROTEAMENTO_EXPLORACAO:
+            candidatos.append(modelo)
+            incrementar("gpt_roteamento_exploracao")
+    return candidatos + cadeia[-1:]
+
+
+def custo_usd(modelo: str, tokens_entrada: int, tokens_saida: int) -> float | None:
+    preco = PRECO_MODELOS.get(modelo)
+    if preco is None:
+        return None
+    return (tokens_entrada * preco[0] + tokens_saida * preco[1]) / 1_000_000
+
+
+def registrar_resultado(
+    modelo: str,
+    tipo: str | None,
+    ok: bool,
+    duracao_s: float,
+    tokens_entrada: int = 0,
+    tokens_saida: int = 0,
+):
+    """Registra uma resposta recebida do modelo (válida ou não)."""
+    tipo = tipo or "livre"
+    _registrar_na_janela(modelo, tipo, ok)
+    metrics.incrementar_metrica(METRICA_CHAMADAS, modelo=modelo, tipo=tipo, resultado="ok" if ok else "falha")
+    metrics.observar_metrica("ipdo_gpt_modelo_latencia_segundos", duracao_s, modelo=modelo, tipo=tipo)
+    metrics.incrementar_metrica("ipdo_gpt_modelo_tokens_total", tokens_entrada, modelo=modelo, direcao="entrada")
+    metrics.incrementar_metrica("ipdo_gpt_modelo_tokens_total", tokens_saida, modelo=modelo, direcao="saida")
+
+    custo = custo_usd(modelo, tokens_entrada, tokens_saida)
+    if custo is not None:
+        metrics.incrementar_metrica("ipdo_gpt_modelo_custo_usd_total", custo, modelo=modelo)
+        incrementar("gpt_custo_usd", custo)
@@ -0,0 +1,165 @@
+# core/schemas.py
+"""
+Contratos JSON (JSON Schema) das extrações de operação e térmica.
+
+- Enviados à Responses API como structured output (strict), o modelo só
+  consegue gerar respostas no formato do contrato
+- Validados localmente (subconjunto de JSON Schema usado aqui), para pegar
+  respostas fora do contrato sem depender do provedor
+
+Fonte única do formato de resposta: os prompts em prompts/ trazem só as
+regras de extração; sem structured output o schema é anexado ao prompt.
+"""
+
+import json
+
+
+STATUS_OPERACAO = ["Acima", "Inferior", "Sem desvio"]
+STATUS_TERMICA = ["Acima", "Abaixo", "Sem desvio"]
+TIPOS_GERACAO = ["Hidráulica", "Térmica", "Eólica", "Solar Fotovoltaica", "Nuclear"]
+
+
+def _objeto(propriedades: dict) -> dict:
+    """Objeto strict: todas as propriedades obrigatórias, nenhuma extra."""
+    return {
+        "type": "object",
+        "properties": propriedades,
+        "required": list(propriedades),
+        "additionalProperties": False,
+    }
+
+
+_STATUS_DESCRICAO_OPERACAO = _objeto({
+    "status": {"type": "string", "enum": STATUS_OPERACAO},
+    "descricao": {"type": "string"},
+})
+
+SCHEMA_OPERACAO = _objeto({
+    "data": {"type": "string", "description": "Data do relatório (YYYY-MM-DD)"},
+    "destaques_operacao": {
+        "type": "array",
+        "items": _objeto({
+            "submercado": {"type": "string", "description": "Nome EXATO como aparece no texto"},
+            "geracao": {
+                "type": "array",
+                "items": _objeto({
+                    "tipo": {"type": "string", "enum": TIPOS_GERACAO},
+                    "status": {"type": "string", "enum": STATUS_OPERACAO},
+                    "descricao": {"type": "string"},
+                }),
+            },
+            "carga": _STATUS_DESCRICAO_OPERACAO,
+            "restricoes": {"type": "array", "items": {"type": "string"}},
+            "transferencia_energia": _objeto({
+                "submercado_origem": {"type": ["string", "null"]},
+                "submercado_destino": {"type": ["string", "null"]},
+                "status": {"type": "string", "enum": STATUS_OPERACAO},
+                "descricao": {"type": "string"},
+            }),
+        }),
+    },
+})
+
+SCHEMA_TERMICA = _objeto({
+    "data": {"type": "string", "description": "Data do relatório (YYYY-MM-DD)"},
+    "destaques_geracao_termica": {
+        "type": "array",
+        "items": _objeto({
+            "unidade_geradora": {"type": "string", "description": "Nome EXATO da usina como no texto"},
+            "desvio_mw": {
+                "type": ["number", "null"],
+                "description": "Desvio em MW; null se o texto não trouxer o valor explicitamente",
+            },
+            "desvio_status": {"type": "string", "enum": STATUS_TERMICA},
+            "descricao": {"type": "string", "description": "Descrição fiel e concisa do desvio"},
+        }),
+    },
+})
+
+SCHEMAS = {
+    "operacao": SCHEMA_OPERACAO,
+    "termica": SCHEMA_TERMICA,
+}
+
+
+def formato_structured_output(tipo: str) -> dict:
+    """Parâmetro `text` da Responses API para structured output strict."""
+    return {
+        "format": {
+            "type": "json_schema",
+            "name": f"ipdo_{tipo}",
+            "schema": SCHEMAS[tipo],
+            "strict": True,
+        }
+    }
+
+
+def formato_para_prompt(tipo: str) -> str:
+    """Contrato em texto, para quando structured output estiver desligado."""
+    return (
+        "Formato de resposta OBRIGATÓRIO (JSON Schema):\n"
+        + json.dumps(SCHEMAS[tipo], ensure_ascii=False, indent=1)
+    )
+
+
+# ---------------------------------------------------------
+# Validação local
+# ---------------------------------------------------------
+
+def _tipo_ok(valor, tipo: str) -> bool:
+    if tipo == "object":
+        return isinstance(valor, dict)
+    if tipo == "array":
+        return isinstance(valor, list)
+    if tipo == "string":
+        return isinstance(valor, str)
+    if tipo == "number":
+        return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+    if tipo == "integer":
+        return isinstance(valor, int) and not isinstance(valor, bool)
+    if tipo == "boolean":
+        return isinstance(valor, bool)
+    if tipo == "null":
+        return valor is None
+    return True
+
+
+def validar(dados, schema: dict, caminho: str = "$") -> list[str]:
+    """
+    Valida `dados` contra o subconjunto de JSON Schema usado neste módulo
+    (type, enum, properties, required, additionalProperties, items).
+    Retorna a lista de erros (vazia se válido).
+    """
+    erros = []
+
+    tipos = schema.get("type")
+    if tipos is not None:
+        tipos = tipos if isinstance(tipos, list) else [tipos]
+        if not any(_tipo_ok(dados, t) for t in tipos):
+            return [f"{caminho}: esperado {'|'.join(tipos)}, recebido {type(dados).__name__}"]
+
+    if "enum" in schema and dados not in schema["enum"]:
+        erros.append(f"{caminho}: valor {dados!r} fora de {schema['enum']}")
+
+    if isinstance(dados, dict):
+        props = schema.get("properties", {})
+        for campo in schema.get("required", []):
+            if campo not in dados:
+                erros.append(f"{caminho}.{campo}: obrigatório")
+        if schema.get("additionalProperties") is False:
+            for campo in dados:
+                if campo not in props:
+                    erros.append(f"{caminho}.{campo}: campo não previsto")
+        for campo, sub in props.items():
+            if campo in dados:
+                erros.extend(validar(dados[campo], sub, f"{caminho}.{campo}"))
+
+    if isinstance(dados, list) and "items" in schema:
+        for i, item in enumerate(dados):
+            erros.extend(validar(item, schema["items"], f"{caminho}[{i}]"))
+
+    return erros
+
+
+class ErroSchema(ValueError):
+    """Resposta do modelo fora do contrato JSON."""
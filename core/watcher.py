@@ -0,0 +1,178 @@
+# core/watcher.py
+"""
+Observação contínua do diretório de PDFs (modo watch).
+
+- Usa watchdog (inotify/FSEvents) quando instalado
+- Fallback por polling (comparação de snapshots de tamanho/mtime)
+- Debounce: só entrega o arquivo depois que tamanho e mtime ficam estáveis,
+  evitando processar PDFs ainda em download/cópia
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from config.settings import PDFS_DIR, WATCH_INTERVALO, WATCH_DEBOUNCE
+from utils.logger import log
+
+
+def _assinatura(path: Path) -> tuple[int, float] | None:
+    """(tamanho, mtime) do arquivo, ou None se não existir mais."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime
+
+
+def snapshot_pdfs(diretorio: Path) -> dict[Path, tuple[int, float]]:
+    """Mapa {pdf: (tamanho, mtime)} dos PDFs do diretório."""
+    out = {}
+    for p in diretorio.glob("*.pdf"):
+        assinatura = _assinatura(p)
+        if assinatura is not None:
+            out[p] = assinatura
+    return out
+
+
+class Debouncer:
+    """
+    Acumula PDFs alterados e libera apenas os que ficaram estáveis
+    (mesmo tamanho/mtime) por pelo menos `debounce` segundos.
+    Thread-safe: eventos do watchdog chegam em outra thread.
+    """
+
+    def __init__(self, debounce: float = WATCH_DEBOUNCE):
+        self.debounce = debounce
+        self._pendentes: dict[Path, tuple[tuple[int, float] | None, float]] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, path: Path, agora: float | None = None):
+        agora = time.monotonic() if agora is None else agora
+        with self._lock:
+            self._pendentes[Path(path)] = (_assinatura(Path(path)), agora)
+
+    def prontos(self, agora: float | None = None) -> list[Path]:
+        agora = time.monotonic() if agora is None else agora
+        liberados = []
+
+        with self._lock:
+            for path, (assinatura_antiga, desde) in list(self._pendentes.items()):
+                assinatura = _assinatura(path)
+
+                if assinatura is None:
+                    # Arquivo removido/renomeado antes de estabilizar
+                    del self._pendentes[path]
+                    continue
+
+                if assinatura != assinatura_antiga:
+                    # Ainda sendo escrito → reinicia a janela
+                    self._pendentes[path] = (assinatura, agora)
+                    continue
+
+                if assinatura[0] > 0 and agora - desde >= self.debounce:
+                    liberados.append(path)
+                    del self._pendentes[path]
+
+        return sorted(liberados)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pendentes)
+
+
+def _iniciar_watchdog(diretorio: Path, debouncer: Debouncer):
+    """Tenta iniciar um observer watchdog. Retorna None se indisponível."""
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class _Handler(FileSystemEventHandler):
+        def _registrar(self, caminho: str):
+            path = Path(caminho)
+            if path.suffix.lower() == ".pdf":
+                debouncer.registrar(path)
+
+        def on_created(self, event):
+            if not event.is_directory:
+                self._registrar(event.src_path)
+
+        def on_modified(self, event):
+            if not event.is_directory:
+                self._registrar(event.src_path)
+
+        def on_moved(self, event):
+            if not event.is_directory:
+                self._registrar(event.dest_path)
+
+    observer = Observer()
+    observer.schedule(_Handler(), str(diretorio), recursive=False)
+    observer.start()
+    return observer
+
+
+def observar_pdfs(
+    callback: Callable[[Path], None],
+    diretorio: Path = PDFS_DIR,
+    intervalo: float = WATCH_INTERVALO,
+    debounce: float = WATCH_DEBOUNCE,
+    usar_watchdog: bool = True,
+    parar: threading.Event | None = None,
+    periodico: Callable[[], None] | None = None,
+    incluir_existentes: bool = False,
+):
+    """
+    Loop bloqueante: chama `callback(pdf)` para cada PDF novo ou alterado.
+    `periodico()` (opcional) roda a cada `intervalo` (ex: retentativas da fila).
+
+    incluir_existentes: PDFs já presentes ao iniciar também são entregues,
+    pelo mesmo debounce (um PDF ainda em cópia só sai quando estabilizar).
+    O observer e o snapshot inicial vêm antes, então nada que chegue
+    enquanto esse lote é processado se perde. Erros do callback são logados
+    e o loop segue.
+    """
+    diretorio.mkdir(exist_ok=True)
+    parar = parar or threading.Event()
+    debouncer = Debouncer(debounce)
+
+    observer = _iniciar_watchdog(diretorio, debouncer) if usar_watchdog else None
+    if observer:
+        log(f"Modo watch (watchdog) → {diretorio}")
+    else:
+        log(f"Modo watch (polling a cada {intervalo}s) → {diretorio}")
+
+    anterior = snapshot_pdfs(diretorio)
+    if incluir_existentes and anterior:
+        log(f"{len(anterior)} PDF(s) já presente(s) em {diretorio.name}/ → verificando alterações")
+        for path in anterior:
+            debouncer.registrar(path)
+
+    try:
+        while not parar.is_set():
+            if observer is None:
+                atual = snapshot_pdfs(diretorio)
+                for path, assinatura in atual.items():
+                    if anterior.get(path) != assinatura:
+                        debouncer.registrar(path)
+                anterior = atual
+
+            for pdf in debouncer.prontos():
+                try:
+                    callback(pdf)
+                except Exception as e:
+                    log(f"   ERRO no processamento em modo watch ({pdf.name}): {e}")
+
+            if periodico is not None:
+                try:
+                    periodico()
+                except Exception as e:
+                    log(f"   ERRO na tarefa periódica do modo watch: {e}")
+
+            parar.wait(intervalo)
+    finally:
+        if observer:
+            observer.stop()
+            observer.join()
@@ -0,0 +1,57 @@
+# database/arquivos_llm.py
+"""
+Registro de PDFs já enviados ao provedor de LLM (tabela arquivos_llm).
+
+Chave (digest, backend): o mesmo PDF é enviado uma única vez e o file_id
+devolvido é reaproveitado pelos prompts de operação e térmica, inclusive
+entre execuções.
+"""
+
+import sqlite3
+import time
+
+from config.settings import DB_PATH
+
+
+def _get_conn():
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def obter_file_id(digest: str, backend: str) -> str | None:
+    conn = _get_conn()
+    try:
+        row = conn.execute(
+            "SELECT file_id FROM arquivos_llm WHERE digest = ? AND backend = ?",
+            (digest, backend),
+        ).fetchone()
+        return row["file_id"] if row else None
+    finally:
+        conn.close()
+
+
+def registrar_file_id(digest: str, backend: str, file_id: str, nome: str, tamanho: int) -> None:
+    conn = _get_conn()
+    try:
+        with conn:
+            conn.execute("""
+                INSERT INTO arquivos_llm (digest, backend, file_id, nome, tamanho, enviado_em)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(digest, backend) DO UPDATE SET
+                    file_id = excluded.file_id,
+                    nome = excluded.nome,
+                    enviado_em = excluded.enviado_em
+            """, (digest, backend, file_id, nome, tamanho, time.time()))
+    finally:
+        conn.close()
+
+
+def remover_file_id(digest: str, backend: str) -> None:
+    """Esquece um envio (ex: arquivo expirado/removido no provedor)."""
+    conn = _get_conn()
+    try:
+        with conn:
+            conn.execute("DELETE FROM arquivos_llm WHERE digest = ? AND backend = ?", (digest, backend))
+    finally:
+        conn.close()
@@ -0,0 +1,404 @@
+# database/exportador.py
+"""
+Exportação em streaming do banco IPDO para arquivos colunares.
+
+- Lê cada tabela em blocos (fetchmany), sem carregar tudo em memória
+- Grava particionado por ano/mês: <destino>/<formato>/<tabela>/ano=YYYY/mes=MM/
+- Formatos: Parquet (requer pyarrow) e CSV.gz (biblioteca padrão)
+- Modo incremental: regrava só as partições (ano/mês) com alguma data
+  inserida, alterada ou removida desde a última exportação (marcador `seq`
+  da tabela export_alteracoes, alimentada por triggers — ver init_db)
+
+Uso:
+    python -m database.exportador --formato parquet
+    python -m database.exportador --formato csv --completo
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import shutil
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from config.settings import DB_PATH, EXPORT_DIR, EXPORT_CHUNK_SIZE
+from database.init_db import init_db
+from utils.logger import log
+
+
+# Colunas exportadas por tabela (tipo usado no schema Parquet)
+TABELAS_EXPORT = {
+    "destaques_operacao": [
+        ("data", "string"),
+        ("submercado", "string"),
+        ("carga_status", "string"),
+        ("carga_descricao", "string"),
+        ("restricoes", "string"),
+        ("transferencia_origem", "string"),
+        ("transferencia_destino", "string"),
+        ("transferencia_status", "string"),
+        ("transferencia_descricao", "string"),
+    ],
+    "destaques_geracao": [
+        ("data", "string"),
+        ("submercado", "string"),
+        ("tipo_geracao", "string"),
+        ("status", "string"),
+        ("descricao", "string"),
+    ],
+    "destaques_geracao_termica": [
+        ("data", "string"),
+        ("unidade_geradora", "string"),
+        ("desvio_mw", "float64"),
+        ("desvio_status", "string"),
+        ("descricao", "string"),
+    ],
+}
+
+FORMATOS = ("parquet", "csv")
+
+ARQUIVO_ESTADO = "_estado_export.json"
+
+
+# ---------------------------------------------------------
+# Leitura em blocos
+# ---------------------------------------------------------
+
+def ler_tabela_em_chunks(
+    conn: sqlite3.Connection,
+    tabela: str,
+    desde: str | None = None,
+    ate: str | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    incluir_desde: bool = False,
+):
+    """
+    Gera blocos de linhas (lista de tuplas) de uma tabela, ordenados por data.
+
+    Args:
+        desde: exporta apenas datas estritamente posteriores (opcional)
+        ate: exporta apenas datas até esta, inclusive (opcional)
+        incluir_desde: trata `desde` como inclusivo (faixas da API)
+    """
+    colunas = [c for c, _ in TABELAS_EXPORT[tabela]]
+
+    sql = f"SELECT {', '.join(colunas)} FROM {tabela} WHERE 1 = 1"
+    params = []
+
+    if desde:
+        sql += " AND data >= ?" if incluir_desde else " AND data > ?"
+        params.append(desde)
+
+    if ate:
+        sql += " AND data <= ?"
+        params.append(ate)
+
+    sql += " ORDER BY data, id"
+
+    cur = conn.execute(sql, params)
+    while True:
+        rows = cur.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
+
+
+def _particao(data: str) -> tuple[str, str]:
+    """'2025-01-07' → ('2025', '01')"""
+    return data[:4], data[5:7]
+
+
+# ---------------------------------------------------------
+# Arrow (Parquet aqui e downloads em lote da API)
+# ---------------------------------------------------------
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise RuntimeError(
+            "Exportação Parquet/Arrow requer 'pyarrow' (pip install pyarrow)"
+        ) from e
+    return pa
+
+
+def schema_arrow(tabela: str):
+    """Schema Arrow das colunas exportadas da tabela."""
+    pa = _pyarrow()
+    return pa.schema([(c, getattr(pa, t)()) for c, t in TABELAS_EXPORT[tabela]])
+
+
+def lote_arrow(schema, rows: list[tuple]):
+    """Bloco de tuplas (ler_tabela_em_chunks) → RecordBatch colunar."""
+    pa = _pyarrow()
+    colunas = [
+        pa.array([r[i] for r in rows], type=campo.type)
+        for i, campo in enumerate(schema)
+    ]
+    return pa.RecordBatch.from_arrays(colunas, schema=schema)
+
+
+# ---------------------------------------------------------
+# Escritores por formato
+# ---------------------------------------------------------
+
+class _EscritorParquet:
+    extensao = "parquet"
+
+    def __init__(self, tabela: str):
+        self.schema = schema_arrow(tabela)
+        import pyarrow.parquet as pq
+
+        self._pq = pq
+        self._writer = None
+
+    def abrir(self, path: Path):
+        self._writer = self._pq.ParquetWriter(str(path), self.schema, compression="zstd")
+
+    def escrever(self, rows: list[tuple]):
+        self._writer.write_batch(lote_arrow(self.schema, rows))
+
+    def fechar(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class _EscritorCsvGz:
+    extensao = "csv.gz"
+
+    def __init__(self, tabela: str):
+        self.colunas = [c for c, _ in TABELAS_EXPORT[tabela]]
+        self._arquivo = None
+        self._csv = None
+
+    def abrir(self, path: Path):
+        self._arquivo = gzip.open(path, "wt", encoding="utf-8", newline="")
+        self._csv = csv.writer(self._arquivo)
+        self._csv.writerow(self.colunas)
+
+    def escrever(self, rows: list[tuple]):
+        self._csv.writerows(rows)
+
+    def fechar(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+            self._csv = None
+
+
+def _criar_escritor(formato: str, tabela: str):
+    if formato == "parquet":
+        return _EscritorParquet(tabela)
+    if formato == "csv":
+        return _EscritorCsvGz(tabela)
+    raise ValueError(f"Formato de exportação inválido: {formato} (use {', '.join(FORMATOS)})")
+
+
+# ---------------------------------------------------------
+# Estado do modo incremental
+# ---------------------------------------------------------
+
+def _ler_estado(destino: Path) -> dict:
+    path = destino / ARQUIVO_ESTADO
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        log(f"   [WARN] Estado de exportação ilegível ({path.name}); exportando tudo")
+        return {}
+
+
+def _salvar_estado(destino: Path, estado: dict):
+    path = destino / ARQUIVO_ESTADO
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(estado, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+
+# ---------------------------------------------------------
+# Exportação
+# ---------------------------------------------------------
+
+def exportar_tabela(
+    conn: sqlite3.Connection,
+    tabela: str,
+    formato: str,
+    destino: Path,
+    desde: str | None = None,
+    ate: str | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> tuple[int, str | None]:
+    """
+    Exporta uma tabela particionada por ano/mês.
+
+    Como as linhas chegam ordenadas por data, apenas uma partição fica aberta
+    por vez. Cada execução grava um novo arquivo 'part-<timestamp>' por partição.
+    desde/ate: faixa de datas inclusiva (opcional).
+
+    Returns:
+        (linhas exportadas, maior data exportada ou None)
+    """
+    escritor = _criar_escritor(formato, tabela)
+    base = destino / formato / tabela
+    run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    total = 0
+    ultima_data = None
+    particao_atual = None
+
+    try:
+        for rows in ler_tabela_em_chunks(
+            conn, tabela, desde=desde, ate=ate, chunk_size=chunk_size, incluir_desde=True
+        ):
+            # Quebra o bloco nos limites de partição (ano/mês)
+            inicio = 0
+            for i, row in enumerate(rows):
+                particao = _particao(row[0])
+                if particao == particao_atual:
+                    continue
+
+                if i > inicio:
+                    escritor.escrever(rows[inicio:i])
+
+                escritor.fechar()
+                ano, mes = particao
+                pasta = base / f"ano={ano}" / f"mes={mes}"
+                pasta.mkdir(parents=True, exist_ok=True)
+                escritor.abrir(pasta / f"part-{run_id}.{escritor.extensao}")
+
+                particao_atual = particao
+                inicio = i
+
+            escritor.escrever(rows[inicio:])
+            total += len(rows)
+            ultima_data = rows[-1][0]
+    finally:
+        escritor.fechar()
+
+    return total, ultima_data
+
+
+def _particoes_alteradas(conn: sqlite3.Connection, tabela: str, desde_seq: int) -> list[tuple[str, str]]:
+    """Partições (ano, mês) com datas alteradas em `tabela` depois do marcador `desde_seq`."""
+    rows = conn.execute(
+        "SELECT DISTINCT substr(data, 1, 7) FROM export_alteracoes WHERE tabela = ? AND seq > ?",
+        (tabela, desde_seq),
+    ).fetchall()
+    return sorted(_particao(f"{r[0]}-01") for r in rows)
+
+
+def _regravar_particao(conn: sqlite3.Connection, tabela: str, formato: str, destino: Path, particao, chunk_size: int) -> int:
+    """
+    Regrava a partição inteira a partir do banco (reflete inserções,
+    alterações e remoções). Escrita em diretório temporário e trocada no fim:
+    leitores nunca veem um arquivo escrito pela metade.
+    """
+    ano, mes = particao
+    pasta = destino / formato / tabela / f"ano={ano}" / f"mes={mes}"
+    tmp = destino / f".tmp_{formato}"
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    linhas, _ = exportar_tabela(
+        conn, tabela, formato, tmp,
+        desde=f"{ano}-{mes}-01", ate=f"{ano}-{mes}-31", chunk_size=chunk_size,
+    )
+
+    shutil.rmtree(pasta, ignore_errors=True)
+    nova = tmp / formato / tabela / f"ano={ano}" / f"mes={mes}"
+    if nova.exists():
+        pasta.parent.mkdir(parents=True, exist_ok=True)
+        nova.replace(pasta)
+    shutil.rmtree(tmp, ignore_errors=True)
+    return linhas
+
+
+def _compactar_alteracoes(conn: sqlite3.Connection):
+    """Mantém só a última alteração de cada (tabela, data): basta para qualquer marcador."""
+    with conn:
+        conn.execute("""
+            DELETE FROM export_alteracoes
+            WHERE seq NOT IN (SELECT max(seq) FROM export_alteracoes GROUP BY tabela, data)
+        """)
+
+
+def exportar_banco(
+    formato: str = "parquet",
+    incremental: bool = True,
+    destino: Path = EXPORT_DIR,
+    db_path: Path = DB_PATH,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> dict:
+    """
+    Exporta todas as tabelas de destaques.
+
+    Args:
+        formato: 'parquet' ou 'csv' (CSV.gz)
+        incremental: se True, regrava apenas as partições com datas alteradas
+            desde a última exportação registrada para o formato (sem registro
+            anterior → exporta tudo); se False, recria a exportação do zero.
+
+    Returns:
+        dict {tabela: linhas exportadas}
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação inválido: {formato} (use {', '.join(FORMATOS)})")
+
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    init_db(db_path)  # garante export_alteracoes e triggers em bancos antigos
+
+    estado = _ler_estado(destino)
+    estado_formato = estado.get(formato, {}) if incremental else {}
+
+    resumo = {}
+    conn = sqlite3.connect(db_path)
+
+    try:
+        # Uma transação de leitura: marcador e linhas vêm do mesmo estado do
+        # banco (alteração concorrente fica para a próxima exportação)
+        conn.execute("BEGIN")
+        seq_atual = conn.execute("SELECT coalesce(max(seq), 0) FROM export_alteracoes").fetchone()[0]
+
+        for tabela in TABELAS_EXPORT:
+            desde_seq = estado_formato.get(tabela)
+
+            # Sem marcador (primeira vez, --completo ou estado antigo por data) → tudo
+            if not isinstance(desde_seq, int):
+                shutil.rmtree(destino / formato / tabela, ignore_errors=True)
+                log(f"   Exportando {tabela} ({formato}) completa...")
+                linhas, _ = exportar_tabela(conn, tabela, formato, destino, chunk_size=chunk_size)
+            else:
+                particoes = _particoes_alteradas(conn, tabela, desde_seq)
+                log(f"   Exportando {tabela} ({formato}): {len(particoes)} partição(ões) alterada(s)...")
+                linhas = sum(
+                    _regravar_particao(conn, tabela, formato, destino, p, chunk_size) for p in particoes
+                )
+
+            estado_formato[tabela] = seq_atual
+            resumo[tabela] = linhas
+            log(f"   {tabela} → {linhas} linha(s) exportada(s)")
+
+        conn.execute("COMMIT")
+        _compactar_alteracoes(conn)
+    finally:
+        conn.close()
+
+    estado[formato] = estado_formato
+    _salvar_estado(destino, estado)
+
+    return resumo
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta o banco IPDO em Parquet/CSV.gz particionado")
+    parser.add_argument("--formato", choices=FORMATOS, default="parquet")
+    parser.add_argument("--completo", action="store_true", help="ignora o estado incremental e recria tudo")
+    parser.add_argument("--destino", type=Path, default=EXPORT_DIR)
+    args = parser.parse_args()
+
+    resumo = exportar_banco(formato=args.formato, incremental=not args.completo, destino=args.destino)
+    log(f"Exportação concluída: {resumo}")
@@ -4,12 +4,14 @@ from config.settings import DB_PATH
 from utils.logger import log
 
 
-def init_db():
+def init_db(db_path=None):
     """
     Inicializa o banco SQLite sem apagar dados existentes.
     Cria tabelas apenas se não existirem.
+
+    db_path: banco alternativo (ex: bancos sintéticos de benchmark). Padrão: DB_PATH.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(db_path or DB_PATH)
     cur = conn.cursor()
 
     # -------------------------
@@ -61,6 +63,134 @@ def init_db():
         )
     """)
 
+    # -------------------------
+    # ingestao_jobs (fila de ingestão)
+    # -------------------------
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ingestao_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pdf TEXT NOT NULL,
+            tipo TEXT NOT NULL,
+            pdf_hash TEXT,
+            status TEXT NOT NULL DEFAULT 'pendente',
+            tentativas INTEGER NOT NULL DEFAULT 0,
+            ultimo_erro TEXT,
+            worker TEXT,
+            proxima_tentativa_em REAL NOT NULL DEFAULT 0,
+            criado_em REAL NOT NULL,
+            iniciado_em REAL,
+            finalizado_em REAL,
+            duracao_s REAL,
+            UNIQUE(pdf, tipo)
+        )
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ingestao_jobs_status
+        ON ingestao_jobs (status, proxima_tentativa_em)
+    """)
+
+    # -------------------------
+    # arquivos_llm (PDFs já enviados ao provedor)
+    # -------------------------
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS arquivos_llm (
+            digest TEXT NOT NULL,
+            backend TEXT NOT NULL,
+            file_id TEXT NOT NULL,
+            nome TEXT,
+            tamanho INTEGER,
+            enviado_em REAL NOT NULL,
+            PRIMARY KEY (digest, backend)
+        )
+    """)
+
+    # -------------------------
+    # secoes_processadas (atalho pré-LLM por texto idêntico)
+    # -------------------------
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS secoes_processadas (
+            tipo TEXT NOT NULL,
+            hash_texto TEXT NOT NULL,
+            itens TEXT NOT NULL,
+            data_origem TEXT,
+            criado_em REAL NOT NULL,
+            PRIMARY KEY (tipo, hash_texto)
+        )
+    """)
+
+    # -------------------------
+    # respostas_llm (arquivo das respostas extraídas, JSON comprimido)
+    # -------------------------
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS respostas_llm (
+            pdf_hash TEXT NOT NULL,
+            tipo TEXT NOT NULL,
+            data TEXT,
+            fonte TEXT,
+            dados BLOB NOT NULL,
+            processado_em REAL NOT NULL,
+            PRIMARY KEY (pdf_hash, tipo)
+        )
+    """)
+
+    # -------------------------
+    # export_alteracoes (datas alteradas, para a exportação incremental)
+    # -------------------------
+    # Triggers registram toda inserção/alteração/remoção nas tabelas de
+    # destaques (inclusive datas antigas e reprocessamentos); seq é o marcador
+    # de mudança usado por database/exportador.py.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS export_alteracoes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tabela TEXT NOT NULL,
+            data TEXT NOT NULL
+        )
+    """)
+    for tabela in ("destaques_operacao", "destaques_geracao", "destaques_geracao_termica"):
+        registrar = "INSERT INTO export_alteracoes (tabela, data) VALUES ('{t}', {linha}.data);"
+        gatilhos = {
+            "insert": registrar.format(t=tabela, linha="NEW"),
+            "delete": registrar.format(t=tabela, linha="OLD"),
+            # UPDATE que muda a data afeta as duas partições
+            "update": registrar.format(t=tabela, linha="NEW") + registrar.format(t=tabela, linha="OLD"),
+        }
+        for evento, corpo in gatilhos.items():
+            cur.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_export_{tabela}_{evento}
+                AFTER {evento.upper()} ON {tabela}
+                BEGIN {corpo} END
+            """)
+
+    # -------------------------
+    # busca_documentos / busca_termos (índice BM25 do histórico)
+    # -------------------------
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS busca_documentos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data TEXT NOT NULL,
+            fonte TEXT NOT NULL,
+            submercado TEXT,
+            trecho TEXT NOT NULL,
+            tamanho INTEGER NOT NULL
+        )
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_busca_documentos_data
+        ON busca_documentos (data, fonte)
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS busca_termos (
+            termo TEXT NOT NULL,
+            doc_id INTEGER NOT NULL,
+            tf INTEGER NOT NULL,
+            PRIMARY KEY (termo, doc_id)
+        ) WITHOUT ROWID
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_busca_termos_doc
+        ON busca_termos (doc_id)
+    """)
+
     conn.commit()
     conn.close()
 
@@ -0,0 +1,234 @@
+# database/jobs.py
+"""
+Fila durável de ingestão (tabela ingestao_jobs).
+
+Cada job é um par (pdf, tipo). Estados:
+    pendente → executando → concluido
+                          ↘ pendente (nova tentativa com backoff)
+                          ↘ falhou   (tentativas esgotadas)
+
+- Reivindicação atômica (UPDATE ... RETURNING dentro de BEGIN IMMEDIATE),
+  então vários workers/processos podem consumir a fila sem reprocessar.
+- Jobs 'executando' voltam para 'pendente' quando o worker caiu no meio do
+  processamento: processo do worker (nome 'pid<N>...') não existe mais, é
+  este mesmo processo recém-iniciado (PID reaproveitado, ex: contêiner) ou o
+  job passou de JOB_TIMEOUT.
+- Se o PDF mudar (hash diferente), o job é reaberto automaticamente.
+"""
+
+import os
+import re
+import sqlite3
+import time
+
+from config.settings import DB_PATH, JOB_MAX_TENTATIVAS, JOB_BACKOFF_BASE, JOB_TIMEOUT
+from utils.logger import log
+
+
+def _get_conn():
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def enfileirar(pdf: str, tipo: str, pdf_hash: str | None = None) -> None:
+    """
+    Cria o job (pdf, tipo) se não existir.
+    Se existir com hash diferente (PDF alterado), volta para 'pendente' zerando tentativas.
+    """
+    agora = time.time()
+    conn = _get_conn()
+    try:
+        conn.execute("""
+            INSERT INTO ingestao_jobs (pdf, tipo, pdf_hash, status, criado_em)
+            VALUES (?, ?, ?, 'pendente', ?)
+            ON CONFLICT(pdf, tipo) DO UPDATE SET
+                pdf_hash = excluded.pdf_hash,
+                status = 'pendente',
+                tentativas = 0,
+                ultimo_erro = NULL,
+                proxima_tentativa_em = 0
+            WHERE ingestao_jobs.pdf_hash IS NOT excluded.pdf_hash
+        """, (pdf, tipo, pdf_hash, agora))
+    finally:
+        conn.close()
+
+
+_RE_PID_WORKER = re.compile(r"^pid(\d+)")
+
+
+def _worker_morto(worker: str | None) -> bool:
+    """
+    True se o processo do worker ('pid<N>' / 'pid<N>-t<k>') não está rodando
+    nesta máquina. O próprio PID conta como morto: recuperar_orfaos() roda na
+    partida, antes deste processo reivindicar qualquer job.
+    """
+    m = _RE_PID_WORKER.match(worker or "")
+    if not m:
+        return False
+    pid = int(m.group(1))
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False  # existe, mas sem permissão para sinalizar
+    return False
+
+
+def recuperar_orfaos(timeout_s: float = JOB_TIMEOUT) -> int:
+    """
+    Devolve para 'pendente' jobs presos em 'executando' cujo worker morreu
+    (ver _worker_morto) ou que passaram de timeout_s. Chamar na partida do
+    processo, antes de iniciar os workers.
+    """
+    limite = time.time() - timeout_s
+    conn = _get_conn()
+    try:
+        presos = conn.execute(
+            "SELECT id, worker, iniciado_em FROM ingestao_jobs WHERE status = 'executando'"
+        ).fetchall()
+        ids = [r["id"] for r in presos if (r["iniciado_em"] or 0) < limite or _worker_morto(r["worker"])]
+        if ids:
+            conn.execute(f"""
+                UPDATE ingestao_jobs
+                SET status = 'pendente', worker = NULL
+                WHERE status = 'executando' AND id IN ({', '.join('?' * len(ids))})
+            """, ids)
+    finally:
+        conn.close()
+
+    if ids:
+        log(f"   {len(ids)} job(s) órfão(s) devolvido(s) para a fila")
+    return len(ids)
+
+
+def reivindicar(worker: str) -> dict | None:
+    """
+    Reivindica atomicamente o próximo job pronto para execução.
+    Retorna dict com id, pdf, tipo, tentativas — ou None se não houver job pronto.
+    """
+    agora = time.time()
+    conn = _get_conn()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("""
+            UPDATE ingestao_jobs
+            SET status = 'executando',
+                worker = ?,
+                iniciado_em = ?,
+                tentativas = tentativas + 1
+            WHERE id = (
+                SELECT id FROM ingestao_jobs
+                WHERE status = 'pendente' AND proxima_tentativa_em <= ?
+                ORDER BY pdf, tipo
+                LIMIT 1
+            )
+            RETURNING id, pdf, tipo, tentativas
+        """, (worker, agora, agora)).fetchone()
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    return dict(row) if row else None
+
+
+def concluir(job_id: int) -> None:
+    agora = time.time()
+    conn = _get_conn()
+    try:
+        conn.execute("""
+            UPDATE ingestao_jobs
+            SET status = 'concluido',
+                ultimo_erro = NULL,
+                finalizado_em = ?,
+                duracao_s = ? - iniciado_em
+            WHERE id = ?
+        """, (agora, agora, job_id))
+    finally:
+        conn.close()
+
+
+def falhar(job_id: int, erro: str, tentativas: int, max_tentativas: int = JOB_MAX_TENTATIVAS) -> str:
+    """
+    Registra falha. Reagenda com backoff exponencial ou marca como 'falhou'.
+    Retorna o novo status.
+    """
+    agora = time.time()
+
+    if tentativas >= max_tentativas:
+        status = "falhou"
+        proxima = 0
+    else:
+        status = "pendente"
+        proxima = agora + JOB_BACKOFF_BASE * (2 ** (tentativas - 1))
+
+    conn = _get_conn()
+    try:
+        conn.execute("""
+            UPDATE ingestao_jobs
+            SET status = ?,
+                ultimo_erro = ?,
+                worker = NULL,
+                finalizado_em = ?,
+                duracao_s = ? - iniciado_em,
+                proxima_tentativa_em = ?
+            WHERE id = ?
+        """, (status, str(erro)[:2000], agora, agora, proxima, job_id))
+    finally:
+        conn.close()
+
+    return status
+
+
+def proxima_tentativa_pendente() -> float | None:
+    """Timestamp do próximo job pendente agendado (backoff), ou None se a fila esvaziou."""
+    conn = _get_conn()
+    try:
+        row = conn.execute("""
+            SELECT MIN(proxima_tentativa_em) AS proxima
+            FROM ingestao_jobs
+            WHERE status = 'pendente'
+        """).fetchone()
+    finally:
+        conn.close()
+    return row["proxima"] if row else None
+
+
+def proximo_job_pronto() -> bool:
+    """Há job pendente com a retentativa já vencida?"""
+    proxima = proxima_tentativa_pendente()
+    return proxima is not None and proxima <= time.time()
+
+
+def reabrir_falhos() -> int:
+    """Devolve jobs 'falhou' para a fila (uso manual, após corrigir a causa)."""
+    conn = _get_conn()
+    try:
+        cur = conn.execute("""
+            UPDATE ingestao_jobs
+            SET status = 'pendente', tentativas = 0, proxima_tentativa_em = 0
+            WHERE status = 'falhou'
+        """)
+        return cur.rowcount
+    finally:
+        conn.close()
+
+
+def resumo_jobs() -> dict[str, int]:
+    """Contagem de jobs por status."""
+    conn = _get_conn()
+    try:
+        rows = conn.execute("""
+            SELECT status, COUNT(*) AS qtd
+            FROM ingestao_jobs
+            GROUP BY status
+        """).fetchall()
+    finally:
+        conn.close()
+    return {r["status"]: r["qtd"] for r in rows}
@@ -1,6 +1,7 @@
 # database/models.py
 import sqlite3
-from config.settings import DB_PATH
+from config.settings import DB_PATH, EXPORT_DIR
+from database.exportador import ARQUIVO_ESTADO
 from utils.logger import log
 
 
@@ -8,6 +9,11 @@ def reset_db():
     """
     APAGA COMPLETAMENTE o banco de dados.
     Use APENAS de forma manual.
+
+    Apaga também o que é derivado dos destaques (índice de busca, atalho de
+    seções, alterações para exportação) e o estado da exportação incremental
+    (a próxima exportação recria tudo). respostas_llm e arquivos_llm são
+    mantidas: reprocessar os PDFs reaproveita as respostas já pagas.
     """
     conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
@@ -15,8 +21,21 @@ def reset_db():
     cur.execute("DROP TABLE IF EXISTS destaques_operacao")
     cur.execute("DROP TABLE IF EXISTS destaques_geracao")
     cur.execute("DROP TABLE IF EXISTS destaques_geracao_termica")
+    cur.execute("DROP TABLE IF EXISTS ingestao_jobs")
+    cur.execute("DROP TABLE IF EXISTS secoes_processadas")
+    cur.execute("DROP TABLE IF EXISTS busca_termos")
+    cur.execute("DROP TABLE IF EXISTS busca_documentos")
+
+    # Esvaziada (não removida): seq continua crescendo depois do reset
+    cur.execute("""
+        SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'export_alteracoes'
+    """)
+    if cur.fetchone():
+        cur.execute("DELETE FROM export_alteracoes")
 
     conn.commit()
     conn.close()
 
+    (EXPORT_DIR / ARQUIVO_ESTADO).unlink(missing_ok=True)
+
     log("⚠️ Banco RESETADO manualmente")
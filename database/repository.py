@@ -1,66 +1,159 @@
 # database/repository.py
+"""
+Gravação dos destaques extraídos.
+
+Cada salvar_* substitui o conteúdo de uma data por diff (ver _sincronizar_data):
+reprocessar um relatório só escreve as linhas que mudaram e nunca deixa
+linhas antigas para trás.
+"""
 import sqlite3
 import json
 from config.settings import DB_PATH
+from database.indice_historico import indexar_data
 from utils.logger import log
+from utils.timing import medir, incrementar
 
 def _get_conn():
     return sqlite3.connect(DB_PATH)
 
-def salvar_destaques_operacao(data: str, itens: list):
-    if not itens:
-        log("   Nenhum destaque de operação para salvar")
-        return
-    
+# Chaves naturais (além de data) e colunas comparadas de cada tabela
+_TABELAS = {
+    "destaques_operacao": (
+        ("submercado",),
+        ("carga_status", "carga_descricao", "restricoes",
+         "transferencia_origem", "transferencia_destino", "transferencia_status", "transferencia_descricao"),
+    ),
+    "destaques_geracao": (("submercado", "tipo_geracao"), ("status", "descricao")),
+    "destaques_geracao_termica": (("unidade_geradora", "descricao"), ("desvio_mw", "desvio_status")),
+}
+
+
+def _sincronizar_data(conn, tabela: str, data: str, linhas: list[tuple]) -> dict:
+    """
+    Substitui as linhas de `data` em `tabela` por `linhas` aplicando só a
+    diferença: INSERT das novas, UPDATE das alteradas, DELETE das que sumiram.
+    Linhas inalteradas não são tocadas (ids e páginas de índice preservados).
+
+    linhas: tuplas (chave..., colunas...) na ordem de _TABELAS[tabela];
+    chaves repetidas → vale a última (mesmo efeito do antigo INSERT OR REPLACE).
+    """
+    chave, colunas = _TABELAS[tabela]
+    n = len(chave)
+
+    novas = {tuple(l[:n]): tuple(l[n:]) for l in linhas}
+    atuais = {
+        tuple(r[:n]): tuple(r[n:])
+        for r in conn.execute(
+            f"SELECT {', '.join(chave + colunas)} FROM {tabela} WHERE data = ?", (data,)
+        )
+    }
+
+    inserir = [(data, *k, *v) for k, v in novas.items() if k not in atuais]
+    atualizar = [(*v, data, *k) for k, v in novas.items() if k in atuais and atuais[k] != v]
+    remover = [(data, *k) for k in atuais if k not in novas]
+
+    filtro_chave = " AND ".join(f"{c} = ?" for c in chave)
+    if inserir:
+        conn.executemany(
+            f"INSERT INTO {tabela} (data, {', '.join(chave + colunas)}) "
+            f"VALUES ({', '.join('?' * (1 + len(chave) + len(colunas)))})",
+            inserir,
+        )
+    if atualizar:
+        conn.executemany(
+            f"UPDATE {tabela} SET {', '.join(f'{c} = ?' for c in colunas)} "
+            f"WHERE data = ? AND {filtro_chave}",
+            atualizar,
+        )
+    if remover:
+        conn.executemany(f"DELETE FROM {tabela} WHERE data = ? AND {filtro_chave}", remover)
+
+    return {
+        "inseridas": len(inserir),
+        "atualizadas": len(atualizar),
+        "removidas": len(remover),
+        "inalteradas": len(novas) - len(inserir) - len(atualizar),
+    }
+
+
+def _substituir_data(data: str, linhas_por_tabela: dict[str, list[tuple]]) -> dict:
+    """
+    Aplica _sincronizar_data nas tabelas numa única transação e reindexa a
+    busca textual das que mudaram; retorna o resumo somado.
+    """
+    resumo = {"inseridas": 0, "atualizadas": 0, "removidas": 0, "inalteradas": 0}
+
     conn = _get_conn()
-    cur = conn.cursor()
-    total_geracoes = 0
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        alteradas = []
+        for tabela, linhas in linhas_por_tabela.items():
+            r = _sincronizar_data(conn, tabela, data, linhas)
+            for k, v in r.items():
+                resumo[k] += v
+            if r["inseridas"] or r["atualizadas"] or r["removidas"]:
+                alteradas.append(tabela)
+        # Índice de busca na mesma transação: nunca descreve um estado não gravado
+        if alteradas:
+            indexar_data(conn, data, alteradas)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    for k in ("inseridas", "atualizadas", "removidas"):
+        incrementar(f"db_linhas_{k}", resumo[k])
+    return resumo
+
+
+def _fmt_resumo(r: dict) -> str:
+    return f"+{r['inseridas']} ~{r['atualizadas']} -{r['removidas']} ({r['inalteradas']} inalterada(s))"
+
+
+@medir("db.salvar_operacao")
+def salvar_destaques_operacao(data: str, itens: list) -> dict:
+    """
+    Substitui os destaques de operação/geração de `data` pelos de `itens`.
+    Retorna o resumo de alterações (inseridas, atualizadas, removidas, inalteradas).
+    """
+    if not itens:
+        log("   Nenhum destaque de operação no relatório")
 
     log(f"   Processando {len(itens)} submercado(s)...")
 
-    for idx, item in enumerate(itens, 1):
+    operacao, geracao = [], []
+    for item in itens:
         submercado = item.get("submercado", "Desconhecido")
-        log(f"     [{idx}/{len(itens)}] Submercado: {submercado}")
-
-        try:
-            # 1. Salva carga + restrições + intercâmbio
-            cur.execute('''
-                INSERT OR REPLACE INTO destaques_operacao
-                (data, submercado, carga_status, carga_descricao, restricoes,
-                 transferencia_origem, transferencia_destino, transferencia_status, transferencia_descricao)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                data,
-                submercado,
-                item.get("carga", {}).get("status"),
-                item.get("carga", {}).get("descricao"),
-                json.dumps(item.get("restricoes", []), ensure_ascii=False),
-                item.get("transferencia_energia", {}).get("submercado_origem"),
-                item.get("transferencia_energia", {}).get("submercado_destino"),
-                item.get("transferencia_energia", {}).get("status"),
-                item.get("transferencia_energia", {}).get("descricao"),
-            ))
-
-            # 2. Salva cada tipo de geração
-            for ger in item.get("geracao", []):
-                tipo = ger["tipo"]
-                if tipo == "Solar Fotovoltaica":
-                    tipo = "Solar"
-                
-                cur.execute('''
-                    INSERT OR REPLACE INTO destaques_geracao
-                    (data, submercado, tipo_geracao, status, descricao)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (data, submercado, tipo, ger["status"], ger["descricao"]))
-                total_geracoes += 1
-
-        except Exception as e:
-            log(f"   ERRO ao salvar submercado {submercado}: {e}")
-            raise
-
-    conn.commit()
-    conn.close()
-    log(f"   SUCESSO → {len(itens)} submercado(s) + {total_geracoes} linha(s) de geração salvos para {data}")
+        carga = item.get("carga", {})
+        transferencia = item.get("transferencia_energia", {})
+
+        # 1. Carga + restrições + intercâmbio
+        operacao.append((
+            submercado,
+            carga.get("status"),
+            carga.get("descricao"),
+            json.dumps(item.get("restricoes", []), ensure_ascii=False),
+            transferencia.get("submercado_origem"),
+            transferencia.get("submercado_destino"),
+            transferencia.get("status"),
+            transferencia.get("descricao"),
+        ))
+
+        # 2. Cada tipo de geração
+        for ger in item.get("geracao", []):
+            tipo = ger["tipo"]
+            if tipo == "Solar Fotovoltaica":
+                tipo = "Solar"
+            geracao.append((submercado, tipo, ger["status"], ger["descricao"]))
+
+    resumo = _substituir_data(data, {"destaques_operacao": operacao, "destaques_geracao": geracao})
+    log(
+        f"   SUCESSO → {len(operacao)} submercado(s) + {len(geracao)} linha(s) de geração "
+        f"para {data}: {_fmt_resumo(resumo)}"
+    )
+    return resumo
 
 def _norm_desvio_status(v) -> str:
     """
@@ -93,14 +186,13 @@ def _to_float_or_none(v):
         return None
 
 
-def salvar_destaques_termica(data: str, itens: list):
-    if not itens:
-        log("   Nenhum destaque térmico para salvar")
-        return
-
-    conn = _get_conn()
-    cur = conn.cursor()
-
+@medir("db.salvar_termica")
+def salvar_destaques_termica(data: str, itens: list) -> dict:
+    """
+    Substitui os destaques térmicos de `data` pelos de `itens` (linhas de uma
+    extração anterior que não vieram agora são removidas).
+    Retorna o resumo de alterações (inseridas, atualizadas, removidas, inalteradas).
+    """
     rows = []
     for i in itens:
         unidade = i.get("unidade_geradora")
@@ -113,18 +205,13 @@ def salvar_destaques_termica(data: str, itens: list):
         desvio_mw = _to_float_or_none(i.get("desvio_mw"))
         desvio_status = _norm_desvio_status(i.get("desvio_status"))
 
-        rows.append((data, unidade, desvio_mw, desvio_status, descricao))
-
-    if not rows:
-        log("   Nenhum destaque térmico válido para salvar (faltando unidade/descricao)")
-        return
+        rows.append((unidade, descricao, desvio_mw, desvio_status))
 
-    cur.executemany("""
-        INSERT OR IGNORE INTO destaques_geracao_termica
-            (data, unidade_geradora, desvio_mw, desvio_status, descricao)
-        VALUES (?, ?, ?, ?, ?)
-    """, rows)
+    if not itens:
+        log("   Nenhum destaque térmico no relatório")
+    elif not rows:
+        log("   Nenhum destaque térmico válido (faltando unidade/descricao)")
 
-    conn.commit()
-    conn.close()
-    log(f"   SUCESSO → {len(rows)} destaque(s) térmico(s) salvo(s) para {data}")
+    resumo = _substituir_data(data, {"destaques_geracao_termica": rows})
+    log(f"   SUCESSO → {len(rows)} destaque(s) térmico(s) para {data}: {_fmt_resumo(resumo)}")
+    return resumo
@@ -0,0 +1,179 @@
+# database/respostas_llm.py
+"""
+Arquivo consolidado das respostas extraídas (tabela respostas_llm).
+
+Substitui os dois JSON indentados por PDF em OUTPUT_DIR: cada resposta fica
+numa linha chaveada por (hash do PDF, tipo), com o JSON compacto comprimido
+por zlib. O cache da ingestão vira uma busca pela chave primária e o backend
+fake reproduz as respostas daqui.
+
+Os JSONs antigos de OUTPUT_DIR são importados automaticamente na primeira
+execução (tabela vazia; ver importar_legados). Manualmente:
+    python -m database.respostas_llm outputs/ [--remover]
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+
+from config.settings import DB_PATH, OUTPUT_DIR
+from utils.logger import log
+
+
+TIPOS = ("operacao", "termica")
+
+
+def _get_conn():
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _comprimir(dados: dict) -> bytes:
+    return zlib.compress(json.dumps(dados, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def _descomprimir(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def buscar_resposta(pdf_hash: str, tipo: str) -> dict | None:
+    conn = _get_conn()
+    try:
+        row = conn.execute(
+            "SELECT dados FROM respostas_llm WHERE pdf_hash = ? AND tipo = ?",
+            (pdf_hash, tipo),
+        ).fetchone()
+        return _descomprimir(row["dados"]) if row else None
+    finally:
+        conn.close()
+
+
+def registrar_resposta(
+    pdf_hash: str,
+    tipo: str,
+    dados: dict,
+    fonte: str | None = None,
+    processado_em: float | None = None,
+) -> int:
+    """
+    Grava (ou substitui) a resposta do PDF para o tipo; `_metadata` não é armazenado.
+    Retorna o tamanho comprimido em bytes.
+    """
+    dados = {k: v for k, v in dados.items() if k != "_metadata"}
+    blob = _comprimir(dados)
+    conn = _get_conn()
+    try:
+        with conn:
+            conn.execute("""
+                INSERT INTO respostas_llm (pdf_hash, tipo, data, fonte, dados, processado_em)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(pdf_hash, tipo) DO UPDATE SET
+                    data = excluded.data,
+                    fonte = excluded.fonte,
+                    dados = excluded.dados,
+                    processado_em = excluded.processado_em
+            """, (
+                pdf_hash,
+                tipo,
+                dados.get("data"),
+                fonte,
+                blob,
+                processado_em or time.time(),
+            ))
+    finally:
+        conn.close()
+    return len(blob)
+
+
+def listar_respostas() -> list[tuple[str, str, dict]]:
+    """[(data, tipo, dados)] de todas as respostas; a mais recente vence por (data, tipo)."""
+    conn = _get_conn()
+    try:
+        rows = conn.execute("""
+            SELECT data, tipo, dados FROM respostas_llm
+            WHERE data IS NOT NULL
+            ORDER BY processado_em
+        """).fetchall()
+    finally:
+        conn.close()
+    return [(r["data"], r["tipo"], _descomprimir(r["dados"])) for r in rows]
+
+
+def importar_jsons(diretorio: Path = OUTPUT_DIR, remover: bool = False) -> dict:
+    """
+    Importa os `<pdf>_<tipo>.json` com _metadata.pdf_hash de `diretorio`.
+    remover: apaga cada JSON importado.
+    Retorna {'importados', 'ignorados', 'bytes_json', 'bytes_arquivo'}.
+    """
+    resumo = {"importados": 0, "ignorados": 0, "bytes_json": 0, "bytes_arquivo": 0}
+
+    for path in sorted(Path(diretorio).glob("*.json")):
+        tipo = next((t for t in TIPOS if path.stem.endswith(f"_{t}")), None)
+        try:
+            dados = json.loads(path.read_text(encoding="utf-8"))
+            pdf_hash = dados.get("_metadata", {}).get("pdf_hash")
+        except Exception:
+            dados, pdf_hash = None, None
+
+        if tipo is None or not pdf_hash:
+            log(f"   [WARN] {path.name} ignorado (sem tipo ou sem _metadata.pdf_hash)")
+            resumo["ignorados"] += 1
+            continue
+
+        resumo["bytes_arquivo"] += registrar_resposta(
+            pdf_hash,
+            tipo,
+            dados,
+            fonte=dados["_metadata"].get("fonte"),
+            processado_em=path.stat().st_mtime,
+        )
+        resumo["importados"] += 1
+        resumo["bytes_json"] += path.stat().st_size
+
+        if remover:
+            path.unlink()
+
+    log(
+        f"   {resumo['importados']} JSON(s) importado(s), {resumo['ignorados']} ignorado(s) "
+        f"({resumo['bytes_json']} → {resumo['bytes_arquivo']} bytes)"
+    )
+    return resumo
+
+
+def importar_legados(diretorio: Path = OUTPUT_DIR) -> dict | None:
+    """
+    Importa os JSONs de `diretorio` se a tabela ainda estiver vazia (primeira
+    execução após a migração): sem isso o cache erra para todo o histórico e
+    cada PDF antigo volta ao LLM. Os JSONs são mantidos. None se nada a fazer.
+    """
+    conn = _get_conn()
+    try:
+        vazia = conn.execute("SELECT 1 FROM respostas_llm LIMIT 1").fetchone() is None
+    finally:
+        conn.close()
+
+    if not vazia or not any(Path(diretorio).glob("*.json")):
+        return None
+
+    log(f"Tabela respostas_llm vazia → importando JSONs legados de {diretorio}")
+    return importar_jsons(diretorio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa os JSONs de OUTPUT_DIR para a tabela respostas_llm")
+    parser.add_argument("diretorio", nargs="?", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--remover", action="store_true", help="Apaga cada JSON após importar")
+    args = parser.parse_args()
+
+    from database.init_db import init_db
+
+    init_db()
+    importar_jsons(args.diretorio, remover=args.remover)
+
+
+if __name__ == "__main__":
+    main()
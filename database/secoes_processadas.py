@@ -0,0 +1,48 @@
+# database/secoes_processadas.py
+"""
+Resultados já extraídos por texto de seção (tabela secoes_processadas).
+
+Chave (tipo, hash do texto normalizado da seção): se um relatório novo traz
+a mesma redação de uma seção já processada, o resultado é reaproveitado sem
+chamar o LLM (ver core/atalho_secoes.py).
+"""
+
+import json
+import sqlite3
+import time
+
+from config.settings import DB_PATH
+
+
+def _get_conn():
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def buscar_resultado(tipo: str, hash_texto: str) -> list | None:
+    conn = _get_conn()
+    try:
+        row = conn.execute(
+            "SELECT itens FROM secoes_processadas WHERE tipo = ? AND hash_texto = ?",
+            (tipo, hash_texto),
+        ).fetchone()
+        return json.loads(row["itens"]) if row else None
+    finally:
+        conn.close()
+
+
+def registrar_resultado(tipo: str, hash_texto: str, itens: list, data_origem: str) -> None:
+    conn = _get_conn()
+    try:
+        with conn:
+            conn.execute("""
+                INSERT INTO secoes_processadas (tipo, hash_texto, itens, data_origem, criado_em)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(tipo, hash_texto) DO UPDATE SET
+                    itens = excluded.itens,
+                    data_origem = excluded.data_origem,
+                    criado_em = excluded.criado_em
+            """, (tipo, hash_texto, json.dumps(itens, ensure_ascii=False), data_origem, time.time()))
+    finally:
+        conn.close()
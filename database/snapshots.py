@@ -0,0 +1,136 @@
+# database/snapshots.py
+"""
+Snapshots imutáveis do banco para leitura (API) durante a ingestão.
+
+A ingestão continua escrevendo em DB_PATH (banco de trabalho). Ao fim de
+cada lote, publicar_snapshot() copia as tabelas lidas pela API
+(SNAPSHOT_TABELAS, com seus índices) numa única transação de leitura para
+um banco novo em `<banco>.snapshots/` e troca atomicamente o ponteiro
+ATUAL (os.replace). Leitores abrem o snapshot apontado com immutable=1 e
+mmap: sem locks e sem enxergar um dia escrito pela metade. Quando o
+ponteiro muda, a próxima conexão já abre o snapshot novo (hot swap).
+
+Sem snapshot publicado, conectar_leitura() cai no banco de trabalho em
+modo somente leitura.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config.settings import DB_PATH, SNAPSHOT_MANTER, SNAPSHOT_MMAP_BYTES, SNAPSHOT_TABELAS
+from utils.logger import log
+from utils.timing import medir
+
+
+PONTEIRO = "ATUAL"
+
+_cache: dict[Path, tuple[tuple, Path]] = {}  # ponteiro → ((inode, mtime_ns), snapshot)
+_cache_lock = threading.Lock()
+
+
+def diretorio_snapshots(db_path: Path | None = None) -> Path:
+    db_path = Path(db_path or DB_PATH)
+    return db_path.with_name(f"{db_path.stem}.snapshots")
+
+
+def _uri(path: Path, **params) -> str:
+    query = "&".join(f"{k}={v}" for k, v in params.items())
+    return f"{Path(path).resolve().as_uri()}?{query}"
+
+
+@medir("db.publicar_snapshot")
+def publicar_snapshot(db_path: Path | None = None) -> Path:
+    """Gera um snapshot de db_path e o torna o atual. Retorna o caminho do snapshot."""
+    db_path = Path(db_path or DB_PATH)
+    destino = diretorio_snapshots(db_path)
+    destino.mkdir(parents=True, exist_ok=True)
+
+    nome = f"{db_path.stem}-{time.time_ns()}.db"
+    tmp = destino / f"{nome}.tmp"
+
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(_uri(tmp, mode="rwc"), uri=True, timeout=30, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("ATTACH DATABASE ? AS origem", (_uri(db_path, mode="ro"),))
+        # Uma transação: todas as tabelas vêm do mesmo estado do banco de trabalho
+        conn.execute("BEGIN")
+        for tabela in SNAPSHOT_TABELAS:
+            ddl = conn.execute("""
+                SELECT sql FROM origem.sqlite_master
+                WHERE tbl_name = ? AND type IN ('table', 'index') AND sql IS NOT NULL
+                ORDER BY type = 'index'
+            """, (tabela,)).fetchall()
+            for (sql,) in ddl:
+                conn.execute(sql)
+            conn.execute(f"INSERT INTO main.{tabela} SELECT * FROM origem.{tabela}")
+        conn.execute("COMMIT")
+        conn.execute("DETACH DATABASE origem")
+    finally:
+        conn.close()
+
+    snapshot = destino / nome
+    os.replace(tmp, snapshot)
+
+    ponteiro_tmp = destino / f"{PONTEIRO}.tmp"
+    ponteiro_tmp.write_text(nome, encoding="utf-8")
+    os.replace(ponteiro_tmp, destino / PONTEIRO)
+
+    _limpar_antigos(destino, snapshot)
+    log(f"   Snapshot de leitura publicado → {snapshot.name}")
+    return snapshot
+
+
+def _limpar_antigos(destino: Path, atual: Path):
+    """
+    Remove snapshots além dos SNAPSHOT_MANTER mais recentes. Leitores com o
+    arquivo aberto continuam lendo (no Linux o inode vive até o último close).
+    """
+    # Nome carrega time_ns da publicação → ordem alfabética = cronológica
+    antigos = sorted((p for p in destino.glob("*.db") if p != atual), reverse=True)
+    for path in antigos[max(0, SNAPSHOT_MANTER - 1):]:
+        try:
+            path.unlink()
+        except OSError:
+            pass  # ainda aberto (Windows) → fica para a próxima publicação
+
+
+def snapshot_atual(db_path: Path | None = None) -> Path | None:
+    """Snapshot apontado por ATUAL (releitura só quando o ponteiro muda)."""
+    ponteiro = diretorio_snapshots(db_path) / PONTEIRO
+    try:
+        st = ponteiro.stat()
+    except FileNotFoundError:
+        return None
+
+    # os.replace troca o inode a cada publicação (mtime sozinho pode repetir)
+    versao = (st.st_ino, st.st_mtime_ns)
+    with _cache_lock:
+        cacheado = _cache.get(ponteiro)
+        if cacheado and cacheado[0] == versao:
+            return cacheado[1]
+
+        snapshot = ponteiro.parent / ponteiro.read_text(encoding="utf-8").strip()
+        _cache[ponteiro] = (versao, snapshot)
+        return snapshot
+
+
+def conectar_leitura(db_path: Path | None = None, **kwargs) -> sqlite3.Connection:
+    """
+    Conexão somente leitura: snapshot atual (immutable=1, mmap) ou, sem
+    snapshot, o banco de trabalho (mode=ro). kwargs vão para sqlite3.connect.
+    """
+    snapshot = snapshot_atual(db_path)
+
+    if snapshot is not None:
+        try:
+            conn = sqlite3.connect(_uri(snapshot, mode="ro", immutable=1), uri=True, **kwargs)
+            conn.execute(f"PRAGMA mmap_size = {int(SNAPSHOT_MMAP_BYTES)}")
+            return conn
+        except sqlite3.OperationalError:
+            log(f"   [WARN] Snapshot {snapshot.name} indisponível; lendo o banco de trabalho")
+
+    return sqlite3.connect(_uri(db_path or DB_PATH, mode="ro"), uri=True, **kwargs)
@@ -1,19 +1,40 @@
 # main.py
+from functools import lru_cache
 from pathlib import Path
+import argparse
 import hashlib
-import json
+import os
+import threading
+import time
 
-from config.settings import PDFS_DIR, OUTPUT_DIR, PROMPTS_DIR
+from config.settings import PDFS_DIR, PROMPTS_DIR, MODO_PDF_COMPLETO, TERMICA_PARSER_MODO
 
 from core.pdf_extractor_v2 import extrair_texto
 from core.date_parser import extrair_data_do_nome
-from core.gpt_runner import processar_trecho_com_gpt
+from core.gpt_runner import processar_trecho_com_gpt, processar_pdf_com_prompt, montar_prompt
 from core.extract_sections import extrair_operacao, extrair_termica
+from core.atalho_secoes import resolver_sem_llm, lembrar_secao
+from core.parser_termica import analisar_termica, conferir
+from core.json_merge import deduplicar
+from core.watcher import observar_pdfs
 
 from database.init_db import init_db
 from database.repository import salvar_destaques_operacao, salvar_destaques_termica
+from database.respostas_llm import buscar_resposta, registrar_resposta, importar_legados
+from database.snapshots import publicar_snapshot
+from database.jobs import (
+    enfileirar,
+    reivindicar,
+    concluir,
+    falhar,
+    recuperar_orfaos,
+    proxima_tentativa_pendente,
+    proximo_job_pronto,
+    resumo_jobs,
+)
 
 from utils.logger import log
+from utils.timing import incrementar, imprimir_relatorio
 
 
 # ---------------------------------------------------------
@@ -26,30 +47,9 @@ def calcular_hash_pdf(pdf_path: Path) -> str:
         return hashlib.md5(f.read()).hexdigest()
 
 
-def json_existe_e_atual(pdf_path: Path, tipo: str) -> bool:
-    """Verifica se o JSON já existe e se o PDF não mudou desde então"""
-    json_path = OUTPUT_DIR / f"{pdf_path.stem}_{tipo}.json"
-    if not json_path.exists():
-        return False
-
-    try:
-        dados_json = json.loads(json_path.read_text(encoding="utf-8"))
-        hash_salvo = dados_json.get("_metadata", {}).get("pdf_hash")
-        hash_atual = calcular_hash_pdf(pdf_path)
-        return hash_salvo == hash_atual
-    except:
-        return False
-
-
-def salvar_json_com_metadata(pdf_path: Path, tipo: str, dados: dict):
-    """Salva JSON com hash do PDF pra controle futuro"""
-    dados["_metadata"] = {
-        "pdf_hash": calcular_hash_pdf(pdf_path),
-        "processado_em": Path().cwd().name,
-        "fonte": pdf_path.name
-    }
-    json_path = OUTPUT_DIR / f"{pdf_path.stem}_{tipo}.json"
-    json_path.write_text(json.dumps(dados, indent=4, ensure_ascii=False), encoding="utf-8")
+def salvar_resposta(pdf_path: Path, pdf_hash: str, tipo: str, dados: dict):
+    """Arquiva a resposta pelo hash do PDF (tabela respostas_llm) pra controle futuro"""
+    registrar_resposta(pdf_hash, tipo, dados, fonte=pdf_path.name)
 
 
 def carregar_prompt_base(nome_prompt: str, data: str) -> str:
@@ -59,124 +59,285 @@ def carregar_prompt_base(nome_prompt: str, data: str) -> str:
 
 
 # ---------------------------------------------------------
-# Processamento principal de cada PDF
+# Tarefas por tipo de destaque
 # ---------------------------------------------------------
 
-def processar_arquivo(pdf_path: Path):
-    log(f"Processando → {pdf_path.name}")
+# tipo → (prompt, extrator de seção, função de persistência, chave da lista no JSON)
+TAREFAS = {
+    "operacao": ("destaques_operacao.txt", extrair_operacao, salvar_destaques_operacao, "destaques_operacao"),
+    "termica": ("destaques_geracao_termica.txt", extrair_termica, salvar_destaques_termica, "destaques_geracao_termica"),
+}
+
+
+@lru_cache(maxsize=4)
+def _texto_pdf(pdf_path: Path, mtime_ns: int) -> str:
+    """Extrai o texto uma única vez por versão do PDF (jobs operacao/termica compartilham)."""
+    log("   Extraindo texto bruto do PDF...")
+    return extrair_texto(pdf_path)
+
+
+def processar_tarefa(pdf_path: Path, tipo: str):
+    """
+    Processa um tipo de destaque (operacao | termica) de um PDF.
+    Lança exceção em caso de falha: a fila de jobs decide se retenta.
+    """
+    nome_prompt, func_extrair_trecho, func_salvar, chave = TAREFAS[tipo]
+    data = extrair_data_do_nome(pdf_path.name)
 
     # -------------------------
-    # 1. Extrair data
+    # 1. Cache – evitar GPT (resposta arquivada para este mesmo PDF)
     # -------------------------
-    try:
-        data = extrair_data_do_nome(pdf_path.name)
-    except Exception as e:
-        log(f"   Erro ao extrair data do nome: {e}")
+    pdf_hash = calcular_hash_pdf(pdf_path)
+    dados = buscar_resposta(pdf_hash, tipo)
+    if dados is not None:
+        log(f"   Cache HIT → {tipo} já extraído deste PDF, pulando GPT")
+        incrementar("cache_hit")
+        func_salvar(data, dados.get(chave, []))
+        return
+
+    incrementar("cache_miss")
+
+    if MODO_PDF_COMPLETO:
+        # PDF anexado por file_id (upload único, compartilhado entre os tipos)
+        template = (PROMPTS_DIR / nome_prompt).read_text(encoding="utf-8")
+        prompt = montar_prompt(template, "[PDF anexo: use a seção correspondente do documento]", tipo, data)
+        resultado = processar_pdf_com_prompt(pdf_path, prompt, tipo=tipo)
+        resultado["data"] = data
+        salvar_resposta(pdf_path, pdf_hash, tipo, resultado)
+        func_salvar(data, resultado.get(chave, []))
+        log(f"   {tipo} → salvo com sucesso (modo PDF completo)")
         return
 
     # -------------------------
-    # 2. Cache – evitar GPT
+    # 2. Extrair texto e apenas o trecho relevante
     # -------------------------
-    if json_existe_e_atual(pdf_path, "operacao") and json_existe_e_atual(pdf_path, "termica"):
-        log(f"   Cache HIT → JSONs já atualizados, pulando GPT")
+    texto = _texto_pdf(pdf_path, pdf_path.stat().st_mtime_ns)
 
-        try:
-            for tipo, repo_func in [
-                ("operacao", salvar_destaques_operacao),
-                ("termica", salvar_destaques_termica)
-            ]:
-                json_path = OUTPUT_DIR / f"{pdf_path.stem}_{tipo}.json"
-                dados = json.loads(json_path.read_text(encoding="utf-8"))
-
-                if tipo == "operacao":
-                    repo_func(data, dados.get("destaques_operacao", []))
-                else:
-                    repo_func(data, dados.get("destaques_geracao_termica", []))
-
-            log(f"   Dados carregados do cache para o banco")
-        except Exception as e:
-            log(f"   Erro ao carregar cache no banco: {e}")
+    log(f"   → Preparando extração de {tipo}...")
+    trecho = func_extrair_trecho(texto)
 
+    if not trecho:
+        log(f"   [WARN] Não foi possível localizar a seção relevante para {tipo}.")
         return
 
     # -------------------------
-    # 3. Extrair TEXTO COMPLETO
+    # 3. Atalho (seção vazia ou já vista), parser da térmica ou Prompt + GPT
     # -------------------------
-    log("   Extraindo texto bruto do PDF...")
-    texto = extrair_texto(pdf_path)
+    itens = resolver_sem_llm(tipo, trecho)
+    if itens is not None:
+        resultado = {"data": data, chave: itens}
+    elif tipo == "termica" and TERMICA_PARSER_MODO != "desligado":
+        resultado = _extrair_termica_com_parser(trecho, nome_prompt, data)
+    else:
+        # Placeholders preenchidos pelo gpt_runner: instruções estáticas primeiro,
+        # data e texto no fim (cache de prefixo), por chunk se necessário
+        prompt = (PROMPTS_DIR / nome_prompt).read_text(encoding="utf-8")
+        resultado = processar_trecho_com_gpt(trecho, prompt, tipo=tipo, data=data)
+        resultado["data"] = data
+        lembrar_secao(tipo, trecho, resultado.get(chave, []), data)
 
     # -------------------------
-    # 4. Definição de tarefas (operacao / termica)
+    # 4. Arquivar resposta + banco
     # -------------------------
-    tarefas = [
-        ("destaques_operacao.txt",  "operacao", extrair_operacao, salvar_destaques_operacao),
-        ("destaques_geracao_termica.txt", "termica", extrair_termica, salvar_destaques_termica),
-    ]
+    salvar_resposta(pdf_path, pdf_hash, tipo, resultado)
+    func_salvar(data, resultado.get(chave, []))
+
+    log(f"   {tipo} → salvo com sucesso")
+
+
+def _extrair_termica_com_parser(trecho: str, nome_prompt: str, data: str) -> dict:
+    """
+    Térmica via parser determinístico (core/parser_termica.py).
+    'rapido': LLM só para as linhas que o parser não reconheceu.
+    'conferir': LLM na seção inteira; parser aponta divergências.
+    """
+    itens, pendentes = analisar_termica(trecho)
+    incrementar("termica_itens_parser", len(itens))
+
+    if TERMICA_PARSER_MODO == "rapido" and not pendentes:
+        log(f"   Parser térmica → {len(itens)} item(ns) sem chamar o GPT")
+        incrementar("termica_parser_completo")
+        return {"data": data, "destaques_geracao_termica": itens}
+
+    prompt = (PROMPTS_DIR / nome_prompt).read_text(encoding="utf-8")
+
+    if TERMICA_PARSER_MODO == "conferir":
+        resultado = processar_trecho_com_gpt(trecho, prompt, tipo="termica", data=data)
+        divergencias = conferir(resultado.get("destaques_geracao_termica", []), itens)
+        for d in divergencias:
+            log(f"   [WARN] Térmica LLM x parser → {d}")
+        incrementar("termica_divergencias", len(divergencias))
+    else:
+        log(f"   Parser térmica → {len(itens)} item(ns); {len(pendentes)} linha(s) fora do padrão vão ao GPT")
+        incrementar("termica_linhas_llm", len(pendentes))
+        parcial = processar_trecho_com_gpt("\n".join(pendentes), prompt, tipo="termica", data=data)
+        resultado = {"destaques_geracao_termica": itens + parcial.get("destaques_geracao_termica", [])}
+        deduplicar(resultado, "termica")
+
+    resultado["data"] = data
+    lembrar_secao("termica", trecho, resultado["destaques_geracao_termica"], data)
+    return resultado
 
-    # -------------------------
-    # 5. Rodar cada tipo de destaque
-    # -------------------------
-    for nome_prompt, tipo, func_extrair_trecho, func_salvar in tarefas:
 
-        if json_existe_e_atual(pdf_path, tipo):
-            log(f"   {tipo}.json já válido → pulando")
-            continue
+# ---------------------------------------------------------
+# Fila de jobs
+# ---------------------------------------------------------
+
+def enfileirar_pdf(pdf_path: Path) -> bool:
+    """Cria (ou reabre, se o PDF mudou) os jobs operacao/termica do PDF."""
+    try:
+        extrair_data_do_nome(pdf_path.name)
+    except Exception as e:
+        log(f"   Erro ao extrair data do nome ({pdf_path.name}): {e}")
+        return False
+
+    pdf_hash = calcular_hash_pdf(pdf_path)
+    for tipo in TAREFAS:
+        enfileirar(str(pdf_path), tipo, pdf_hash)
 
-        log(f"   → Preparando extração de {tipo}...")
+    incrementar("pdfs_enfileirados")
+    return True
 
-        # 5.1 Extrair apenas o trecho relevante
-        trecho = func_extrair_trecho(texto)
 
-        if not trecho:
-            log(f"   [WARN] Não foi possível localizar a seção relevante para {tipo}.")
+def executar_worker(worker: str | None = None, esperar_retentativas: bool = True):
+    """
+    Consome a fila até esvaziar. Falhas são reagendadas com backoff.
+    esperar_retentativas: espera pelas retentativas pendentes antes de sair
+    (lote); False → processa só os jobs prontos agora (modo watch).
+    """
+    worker = worker or f"pid{os.getpid()}"
+
+    while True:
+        job = reivindicar(worker)
+
+        if job is None:
+            proxima = proxima_tentativa_pendente() if esperar_retentativas else None
+            if proxima is None:
+                return
+            espera = max(0.0, proxima - time.time())
+            log(f"   [{worker}] Aguardando {espera:.0f}s para a próxima retentativa...")
+            time.sleep(min(espera, 60) or 0.1)
             continue
 
-        # 5.2 Carregar prompt base (sem o texto ainda)
-        prompt = (PROMPTS_DIR / nome_prompt).read_text(encoding="utf-8")
-        prompt = prompt.replace("{{DATA_RELATORIO}}", data)
-        prompt = prompt.replace("{{TEXTO_EXTRAIDO}}", trecho)
+        pdf_path = Path(job["pdf"])
+        log(f"Processando → {pdf_path.name} [{job['tipo']}] (tentativa {job['tentativas']}, {worker})")
 
         try:
-            # 5.3 Chamada simples ao GPT (sem chunking)
-            resultado = processar_trecho_com_gpt(trecho, prompt)
-            resultado["data"] = data
+            processar_tarefa(pdf_path, job["tipo"])
+            concluir(job["id"])
+            incrementar("jobs_concluidos")
+        except Exception as e:
+            status = falhar(job["id"], e, job["tentativas"])
+            incrementar("jobs_falhas")
+            log(f"   ERRO ao extrair {job['tipo']}: {e} → job {status}")
 
-            # 5.4 Salvar o JSON com metadata
-            salvar_json_com_metadata(pdf_path, tipo, resultado)
 
-            # 5.5 Salvar no banco
-            if tipo == "operacao":
-                func_salvar(data, resultado.get("destaques_operacao", []))
-            else:
-                func_salvar(data, resultado.get("destaques_geracao_termica", []))
+def processar_arquivo(pdf_path: Path):
+    """
+    Modo watch: enfileira um PDF, processa os jobs prontos e publica o
+    snapshot de leitura. Não espera backoff: retentativas ficam para
+    processar_retentativas(), chamada periodicamente pelo watcher.
+    """
+    # PDF sem alteração (job com o mesmo hash já concluído) → nada a publicar
+    if enfileirar_pdf(pdf_path) and proximo_job_pronto():
+        executar_worker(esperar_retentativas=False)
+        publicar_snapshot()
 
-            log(f"   {tipo} → salvo com sucesso")
 
-        except Exception as e:
-            log(f"   ERRO ao extrair {tipo}: {e}")
+def processar_retentativas():
+    """Modo watch: executa jobs cujo backoff venceu (sem bloquear o watcher)."""
+    if proximo_job_pronto():
+        executar_worker(esperar_retentativas=False)
+        publicar_snapshot()
 
 
 # ---------------------------------------------------------
 # Entrypoint
 # ---------------------------------------------------------
 
-def main():
+def main(workers: int = 1):
     log("Iniciando sistema de extração ONS (com cache e corte de seções)")
 
     init_db()
+    importar_legados()
+    recuperar_orfaos()
 
     pdfs = sorted(PDFS_DIR.glob("*.pdf"))
     if not pdfs:
         log("Nenhum PDF encontrado em pdfs/")
         return
 
-    log(f"{len(pdfs)} PDF(s) encontrado(s). Iniciando processamento...")
+    log(f"{len(pdfs)} PDF(s) encontrado(s). Atualizando fila de jobs...")
 
     for pdf in pdfs:
-        processar_arquivo(pdf)
+        enfileirar_pdf(pdf)
+
+    if workers <= 1:
+        executar_worker()
+    else:
+        threads = [
+            threading.Thread(target=executar_worker, args=(f"pid{os.getpid()}-t{n}",))
+            for n in range(1, workers + 1)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    # API passa a ler o estado final deste lote (troca atômica)
+    publicar_snapshot()
+
+    resumo = resumo_jobs()
+    log(f"Fila de jobs: {resumo}")
+    imprimir_relatorio()
+
+    if resumo.get("falhou"):
+        log(f"Concluído com {resumo['falhou']} job(s) em falha (ver ingestao_jobs.ultimo_erro).")
+    else:
+        log("Concluído! Tudo atualizado com sucesso.")
+
+
+def main_watch():
+    """
+    Modo contínuo: processa os PDFs já presentes (novos ou alterados desde a
+    última execução) e os que chegarem em PDFS_DIR, todos pelo debounce do
+    watcher. O cache por hash (tabela respostas_llm) continua evitando
+    chamadas repetidas ao GPT.
+    """
+    log("Iniciando extração ONS em modo watch (Ctrl+C para encerrar)")
+
+    init_db()
+    importar_legados()
+    recuperar_orfaos()
 
-    log("Concluído! Tudo atualizado com sucesso.")
+    # Jobs pendentes de uma execução anterior (ex: retentativas) não dependem de evento
+    processar_retentativas()
+
+    try:
+        # PDFs que chegaram com o watch parado entram pelo watcher (incluir_existentes):
+        # enfileirar é barato (job com mesmo hash continua concluído).
+        observar_pdfs(processar_arquivo, periodico=processar_retentativas, incluir_existentes=True)
+    except KeyboardInterrupt:
+        log("Modo watch encerrado.")
+        imprimir_relatorio()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Extração dos destaques do IPDO")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="fica observando a pasta de PDFs e processa novos arquivos assim que chegam",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="quantidade de workers consumindo a fila de jobs em paralelo",
+    )
+    args = parser.parse_args()
+
+    if args.watch:
+        main_watch()
+    else:
+        main(workers=args.workers)
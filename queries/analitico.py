@@ -0,0 +1,315 @@
+# queries/analitico.py
+"""
+Consultas analíticas (faixas de datas, agregações) sobre o histórico IPDO.
+
+Executadas no DuckDB (vetorizado, colunar) quando disponível, com as tabelas
+de destaques vindas de:
+- o snapshot de leitura atual (database/snapshots.py; ATTACH ... TYPE sqlite,
+  views; reanexado quando um snapshot novo é publicado) — ou o banco de
+  trabalho, se nenhum foi publicado —, ou
+- a exportação Parquet (database/exportador.py), carregada em memória uma vez
+  por processo: dados até a última exportação (reiniciar() recarrega)
+
+Sem DuckDB (ou sem nenhuma das fontes) o mesmo SQL roda no SQLite, pela
+mesma conexão de leitura da API (conectar_leitura).
+Fonte em config.settings.ANALITICO_FONTE ('auto' | 'sqlite' | 'parquet').
+
+Todas as funções aceitam `motor='duckdb' | 'sqlite'` para forçar o motor
+(benchmark em tests/benchmark_analitico.py).
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from config.settings import DB_PATH, EXPORT_DIR, ANALITICO_FONTE
+from database.exportador import TABELAS_EXPORT
+from database.snapshots import conectar_leitura, snapshot_atual
+from utils.logger import log
+
+
+PERIODOS = {"ano": 4, "mes": 7, "dia": 10}  # prefixo de 'YYYY-MM-DD'
+
+_lock = threading.Lock()
+
+
+class _ConexaoDuckDB:
+    """
+    Conexão DuckDB compartilhada + contagem de consultas em andamento.
+    Aposentada (snapshot novo, reiniciar) → fecha só quando a última termina.
+    """
+
+    def __init__(self, con, fonte: str, origem: Path):
+        self.con = con
+        self.fonte = fonte
+        self.origem = origem  # arquivo SQLite anexado (fonte 'sqlite')
+        self.usuarios = 0
+        self.aposentada = False
+
+    def aposentar(self):
+        """Chamar com _lock."""
+        self.aposentada = True
+        if self.usuarios == 0:
+            self.con.close()
+
+
+_duckdb: _ConexaoDuckDB | None = None
+_duckdb_tentado = False
+
+
+# ---------------------------------------------------------
+# Conexões
+# ---------------------------------------------------------
+
+def _literal(path: Path) -> str:
+    return "'" + str(path).replace("'", "''") + "'"
+
+
+def _abrir_duckdb(fonte: str, db_path: Path, export_dir: Path):
+    """(conexão DuckDB com as tabelas de destaques, fonte) ou (None, None)."""
+    try:
+        import duckdb
+    except ImportError:
+        log("   [WARN] duckdb não instalado → consultas analíticas no SQLite")
+        return None, None
+
+    con = duckdb.connect()
+
+    if fonte in ("auto", "sqlite"):
+        try:
+            con.execute(f"ATTACH {_literal(db_path)} AS ipdo (TYPE sqlite, READ_ONLY)")
+            for tabela in TABELAS_EXPORT:
+                con.execute(f"CREATE VIEW {tabela} AS SELECT * FROM ipdo.{tabela}")
+            return con, "sqlite"
+        except duckdb.Error as e:
+            log(f"   [WARN] DuckDB não anexou o SQLite ({e.__class__.__name__}); tentando Parquet")
+
+    if fonte in ("auto", "parquet"):
+        base = Path(export_dir) / "parquet"
+        if all(any((base / t).rglob("*.parquet")) for t in TABELAS_EXPORT):
+            # Tabela em memória: consultar o glob de partições a cada chamada
+            # custa mais que a própria agregação
+            for tabela in TABELAS_EXPORT:
+                padrao = _literal(base / tabela / "**" / "*.parquet")
+                con.execute(
+                    f"CREATE TABLE {tabela} AS "
+                    f"SELECT * FROM read_parquet({padrao}, hive_partitioning = true, union_by_name = true)"
+                )
+            return con, "parquet"
+        log("   [WARN] Exportação Parquet ausente (python -m database.exportador)")
+
+    con.close()
+    return None, None
+
+
+def _obter_duckdb() -> _ConexaoDuckDB | None:
+    """
+    Conexão DuckDB do processo (aberta uma vez; None se indisponível); chamar com _lock.
+    Com fonte 'sqlite', troca de conexão quando o snapshot atual muda.
+    """
+    global _duckdb, _duckdb_tentado
+    origem = snapshot_atual(DB_PATH) or Path(DB_PATH)
+    if _duckdb is not None and _duckdb.fonte == "sqlite" and origem != _duckdb.origem:
+        _duckdb.aposentar()
+        _duckdb, _duckdb_tentado = None, False
+
+    if not _duckdb_tentado:
+        con, fonte = _abrir_duckdb(ANALITICO_FONTE, origem, EXPORT_DIR)
+        _duckdb = _ConexaoDuckDB(con, fonte, origem) if con is not None else None
+        _duckdb_tentado = True
+        if _duckdb is not None:
+            log(f"   Consultas analíticas no DuckDB (fonte: {fonte})")
+    return _duckdb
+
+
+@contextmanager
+def _duckdb_em_uso():
+    """Conexão DuckDB atual (ou None), protegida de ser fechada durante a consulta."""
+    with _lock:
+        atual = _obter_duckdb()
+        if atual is not None:
+            atual.usuarios += 1
+    try:
+        yield atual.con if atual is not None else None
+    finally:
+        if atual is not None:
+            with _lock:
+                atual.usuarios -= 1
+                if atual.aposentada and atual.usuarios == 0:
+                    atual.con.close()
+
+
+def reiniciar():
+    """Descarta a conexão DuckDB (nova fonte/banco na próxima consulta)."""
+    global _duckdb, _duckdb_tentado
+    with _lock:
+        if _duckdb is not None:
+            _duckdb.aposentar()
+        _duckdb, _duckdb_tentado = None, False
+
+
+def motor_ativo() -> str:
+    """'duckdb:<fonte>' ou 'sqlite'."""
+    with _lock:
+        atual = _obter_duckdb()
+    return f"duckdb:{atual.fonte}" if atual is not None else "sqlite"
+
+
+def _executar(sql: str, params: list, motor: str | None = None) -> list[dict]:
+    if motor != "sqlite":
+        with _duckdb_em_uso() as con:
+            if con is not None:
+                cur = con.cursor()  # cursor próprio por thread
+                try:
+                    cur.execute(sql, params)
+                    colunas = [d[0] for d in cur.description]
+                    return [dict(zip(colunas, row)) for row in cur.fetchall()]
+                finally:
+                    cur.close()
+
+    if motor == "duckdb":
+        raise RuntimeError("DuckDB indisponível (instale duckdb ou exporte o Parquet)")
+
+    conn = conectar_leitura(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in conn.execute(sql, params).fetchall()]
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------
+# SQL comum aos dois motores
+# ---------------------------------------------------------
+
+def _periodo(periodo: str) -> str:
+    if periodo not in PERIODOS:
+        raise ValueError(f"Período inválido: {periodo} (use {', '.join(PERIODOS)})")
+    return f"substr(data, 1, {PERIODOS[periodo]})"
+
+
+def _filtros(desde: str | None, ate: str | None, **iguais) -> tuple[str, list]:
+    """WHERE com faixa de datas (inclusiva) e igualdades opcionais."""
+    sql, params = " WHERE 1 = 1", []
+    if desde:
+        sql += " AND data >= ?"
+        params.append(desde)
+    if ate:
+        sql += " AND data <= ?"
+        params.append(ate)
+    for coluna, valor in iguais.items():
+        if valor is not None:
+            sql += f" AND {coluna} = ?"
+            params.append(valor)
+    return sql, params
+
+
+# ---------------------------------------------------------
+# Consultas
+# ---------------------------------------------------------
+
+def distribuicao_status_geracao(
+    desde: str | None = None,
+    ate: str | None = None,
+    periodo: str = "ano",
+    submercado: str | None = None,
+    tipo_geracao: str | None = None,
+    motor: str | None = None,
+) -> list[dict]:
+    """
+    Quantidade de destaques de geração por período, tipo e status.
+
+    Returns:
+        list[dict]: periodo, tipo_geracao, status, qtd
+    """
+    where, params = _filtros(desde, ate, submercado=submercado, tipo_geracao=tipo_geracao)
+    sql = f"""
+        SELECT {_periodo(periodo)} AS periodo, tipo_geracao, status, count(*) AS qtd
+        FROM destaques_geracao
+        {where}
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3
+    """
+    return _executar(sql, params, motor)
+
+
+def distribuicao_status_carga(
+    desde: str | None = None,
+    ate: str | None = None,
+    periodo: str = "ano",
+    submercado: str | None = None,
+    motor: str | None = None,
+) -> list[dict]:
+    """
+    Quantidade de dias por período, submercado e status de carga.
+
+    Returns:
+        list[dict]: periodo, submercado, status, qtd
+    """
+    where, params = _filtros(desde, ate, submercado=submercado)
+    sql = f"""
+        SELECT {_periodo(periodo)} AS periodo, submercado, carga_status AS status, count(*) AS qtd
+        FROM destaques_operacao
+        {where}
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3
+    """
+    return _executar(sql, params, motor)
+
+
+def tendencia_desvio_termica(
+    desde: str | None = None,
+    ate: str | None = None,
+    periodo: str = "mes",
+    unidade_geradora: str | None = None,
+    motor: str | None = None,
+) -> list[dict]:
+    """
+    Desvios térmicos agregados por período e direção.
+
+    Returns:
+        list[dict]: periodo, desvio_status, qtd, total_mw, media_mw, max_mw
+    """
+    where, params = _filtros(desde, ate, unidade_geradora=unidade_geradora)
+    sql = f"""
+        SELECT {_periodo(periodo)} AS periodo,
+               desvio_status,
+               count(*) AS qtd,
+               round(sum(desvio_mw), 1) AS total_mw,
+               round(avg(desvio_mw), 1) AS media_mw,
+               max(desvio_mw) AS max_mw
+        FROM destaques_geracao_termica
+        {where}
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+    """
+    return _executar(sql, params, motor)
+
+
+def ranking_unidades_termica(
+    desde: str | None = None,
+    ate: str | None = None,
+    limite: int = 10,
+    desvio_status: str | None = None,
+    motor: str | None = None,
+) -> list[dict]:
+    """
+    Unidades com maior desvio acumulado (MW) na faixa de datas.
+
+    Returns:
+        list[dict]: unidade_geradora, qtd, total_mw, media_mw
+    """
+    where, params = _filtros(desde, ate, desvio_status=desvio_status)
+    sql = f"""
+        SELECT unidade_geradora,
+               count(*) AS qtd,
+               round(sum(desvio_mw), 1) AS total_mw,
+               round(avg(desvio_mw), 1) AS media_mw
+        FROM destaques_geracao_termica
+        {where}
+        GROUP BY 1
+        ORDER BY total_mw DESC NULLS LAST, unidade_geradora
+        LIMIT ?
+    """
+    return _executar(sql, params + [limite], motor)
@@ -0,0 +1,108 @@
+# tests/benchmark_analitico.py
+"""
+Benchmark das consultas analíticas: SQLite x DuckDB (queries/analitico.py)
+sobre um banco sintético de vários anos.
+
+O DuckDB é medido em cada fonte disponível nesta máquina: SQLite anexado
+(requer a extensão sqlite do DuckDB) e exportação Parquet (requer pyarrow).
+
+Uso:
+    python -m tests.benchmark_analitico            # 10 anos
+    python -m tests.benchmark_analitico --anos 3
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+from database.exportador import exportar_banco
+from queries import analitico
+from tests.benchmark_suite import _instrumentacao_isolada, medir
+from tests.sinteticos import gerar_banco_sintetico
+
+
+def _casos(datas: list[str]) -> list[tuple[str, object]]:
+    """[(nome, função(motor))] — faixas longas (agregação) e curtas (recorte)."""
+    inicio, fim = datas[0], datas[-1]
+    ultimo_ano = datas[-365]
+    return [
+        ("geracao.status[ano,tudo]", lambda m: analitico.distribuicao_status_geracao(inicio, fim, "ano", motor=m)),
+        ("carga.status[mes,tudo]", lambda m: analitico.distribuicao_status_carga(inicio, fim, "mes", motor=m)),
+        ("termica.tendencia[mes,tudo]", lambda m: analitico.tendencia_desvio_termica(inicio, fim, "mes", motor=m)),
+        ("termica.ranking[tudo]", lambda m: analitico.ranking_unidades_termica(inicio, fim, 10, motor=m)),
+        ("termica.tendencia[dia,1 ano]", lambda m: analitico.tendencia_desvio_termica(ultimo_ano, fim, "dia", motor=m)),
+    ]
+
+
+def executar(anos: int = 10, repeticoes: int = 5) -> tuple[list[str], list[dict]]:
+    """Retorna (fontes DuckDB medidas, [{caso, sqlite_ms, <fonte>_ms...}])."""
+    with tempfile.TemporaryDirectory() as d:
+        tmp = Path(d)
+        banco = tmp / "historico.db"
+
+        with _instrumentacao_isolada(tmp), contextlib.redirect_stdout(io.StringIO()):
+            datas = gerar_banco_sintetico(banco, anos=anos)
+            try:
+                exportar_banco(formato="parquet", incremental=False, destino=tmp / "exports", db_path=banco)
+            except RuntimeError:
+                pass  # sem pyarrow → só a fonte SQLite do DuckDB
+
+        originais = (analitico.DB_PATH, analitico.EXPORT_DIR, analitico.ANALITICO_FONTE)
+        analitico.DB_PATH, analitico.EXPORT_DIR = banco, tmp / "exports"
+
+        casos = _casos(datas)
+        linhas = {nome: {"caso": nome} for nome, _ in casos}
+        fontes = []
+        try:
+            for nome, consulta in casos:
+                linhas[nome]["sqlite_ms"] = medir(lambda: consulta("sqlite"), repeticoes=repeticoes)["mediana_ms"]
+
+            for fonte in ("sqlite", "parquet"):
+                analitico.ANALITICO_FONTE = fonte
+                analitico.reiniciar()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    disponivel = analitico.motor_ativo() != "sqlite"
+                if not disponivel:
+                    print(f"  DuckDB[{fonte}] indisponível nesta máquina", file=sys.stderr)
+                    continue
+                fontes.append(fonte)
+                for nome, consulta in casos:
+                    linhas[nome][f"{fonte}_ms"] = medir(lambda: consulta("duckdb"), repeticoes=repeticoes)["mediana_ms"]
+        finally:
+            analitico.DB_PATH, analitico.EXPORT_DIR, analitico.ANALITICO_FONTE = originais
+            analitico.reiniciar()
+
+    return fontes, list(linhas.values())
+
+
+def imprimir(fontes: list[str], linhas: list[dict], anos: int):
+    cabecalho = f"{'caso':<32}{'SQLite(ms)':>12}" + "".join(f"{'DuckDB[' + f + '](ms)':>22}{'speedup':>9}" for f in fontes)
+    print(f"\nConsultas analíticas — {anos} ano(s) de histórico sintético")
+    print("=" * len(cabecalho))
+    print(cabecalho)
+    print("-" * len(cabecalho))
+    for l in linhas:
+        texto = f"{l['caso']:<32}{l['sqlite_ms']:>12.2f}"
+        for f in fontes:
+            ms = l[f"{f}_ms"]
+            texto += f"{ms:>22.2f}{l['sqlite_ms'] / ms if ms else 0:>8.1f}x"
+        print(texto)
+    print("=" * len(cabecalho))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite x DuckDB nas consultas analíticas")
+    parser.add_argument("--anos", type=int, default=10)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    fontes, linhas = executar(anos=args.anos, repeticoes=args.repeticoes)
+    imprimir(fontes, linhas, args.anos)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# tests/benchmark_importacao.py
+"""
+Tempo de importação (cold start) dos pontos de entrada, via `python -X importtime`.
+
+Cada módulo é importado num interpretador novo; reporta o tempo cumulativo
+e quais dependências pesadas foram carregadas. Elas devem ficar para a
+primeira chamada real (SDK da OpenAI, pdfium, pandas, pyarrow...).
+
+Uso:
+    python -m tests.benchmark_importacao
+    python -m tests.benchmark_importacao --repeticoes 5 api.main
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+PONTOS_DE_ENTRADA = ["api.main", "main", "agent_ipdo.cli", "ver_banco", "queries.termica"]
+
+# Módulos que não podem ser carregados só por importar os pontos de entrada
+PESADOS = ["openai", "pypdfium2", "pandas", "pyarrow", "watchdog", "tiktoken", "dotenv"]
+
+
+def medir_importacao(modulo: str) -> tuple[float, set[str]]:
+    """(tempo cumulativo em ms, nomes de todos os módulos importados)."""
+    env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=RAIZ, env=env, capture_output=True, text=True, check=True,
+    )
+
+    total_us, importados = 0, set()
+    for linha in proc.stderr.splitlines():
+        if not linha.startswith("import time:") or "|" not in linha:
+            continue
+        partes = [p.strip() for p in linha.split("|")]
+        if not partes[1].isdigit():
+            continue  # cabeçalho
+        nome = partes[2]
+        importados.add(nome)
+        if nome == modulo:
+            total_us = int(partes[1])
+    return total_us / 1000, importados
+
+
+def pesados_importados(importados: set[str]) -> list[str]:
+    return sorted(p for p in PESADOS if p in importados)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de importação dos pontos de entrada")
+    parser.add_argument("modulos", nargs="*", default=PONTOS_DE_ENTRADA)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'módulo':<22}{'mediana(ms)':>13}  pesados carregados")
+    falhou = False
+    for modulo in args.modulos:
+        tempos, importados = [], set()
+        for _ in range(args.repeticoes):
+            ms, importados = medir_importacao(modulo)
+            tempos.append(ms)
+        pesados = pesados_importados(importados)
+        falhou |= bool(pesados)
+        print(f"{modulo:<22}{statistics.median(tempos):>13.1f}  {', '.join(pesados) or '-'}")
+
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# tests/benchmark_ingestao.py
+"""
+Benchmark de ingestão ponta a ponta, offline, usando o backend fake de LLM.
+
+Gera PDFs sintéticos, roda main.main() com diferentes quantidades de workers
+e reporta vazão, chamadas ao LLM, 429s/retentativas e estado final da fila.
+
+Uso:
+    python -m tests.benchmark_ingestao --pdfs 20 --workers 1,2,4 --latencia 0.5 --taxa-429 0.1
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+import core.openai_client_v2
+import database.arquivos_llm
+import database.init_db
+import database.jobs
+import database.repository
+import database.respostas_llm
+import database.secoes_processadas
+import database.snapshots
+import main as pipeline
+import utils.metrics
+import utils.timing
+from core.llm_backend import BackendFake, definir_backend
+from tests.sinteticos import gerar_pdf_ipdo
+
+
+@contextlib.contextmanager
+def substituir(*trocas):
+    """trocas: (objeto, atributo, valor) — restaurados na saída."""
+    originais = [(obj, attr, getattr(obj, attr)) for obj, attr, _ in trocas]
+    for obj, attr, valor in trocas:
+        setattr(obj, attr, valor)
+    try:
+        yield
+    finally:
+        for obj, attr, valor in originais:
+            setattr(obj, attr, valor)
+
+
+def executar_cenario(qtd_pdfs: int, workers: int, latencia: float, taxa_429: float, taxa_erro: float) -> dict:
+    with tempfile.TemporaryDirectory() as d:
+        tmp = Path(d)
+        pdfs, outputs, db = tmp / "pdfs", tmp / "outputs", tmp / "banco.db"
+        pdfs.mkdir()
+        outputs.mkdir()
+
+        for i in range(qtd_pdfs):
+            dia = f"2025-01-{i % 28 + 1:02d}" if i < 28 else f"2025-02-{i % 28 + 1:02d}"
+            gerar_pdf_ipdo(pdfs / f"ipdo_{dia.replace('-', '_')}.pdf", data=dia, seed=i)
+
+        backend = BackendFake(diretorio=outputs, latencia=latencia, taxa_429=taxa_429, taxa_erro=taxa_erro)
+
+        with substituir(
+            (pipeline, "PDFS_DIR", pdfs),
+            (database.init_db, "DB_PATH", db),
+            (database.jobs, "DB_PATH", db),
+            (database.jobs, "JOB_BACKOFF_BASE", latencia),
+            (database.repository, "DB_PATH", db),
+            (database.arquivos_llm, "DB_PATH", db),
+            (database.secoes_processadas, "DB_PATH", db),
+            (database.respostas_llm, "DB_PATH", db),
+            (database.snapshots, "DB_PATH", db),
+            (core.openai_client_v2, "GPT_ESPERA_RETENTATIVA", latencia),
+            (utils.timing, "TIMINGS_PATH", tmp / "timings.jsonl"),
+            (utils.metrics.armazem, "path", tmp / "metricas.db"),
+        ):
+            definir_backend(backend)
+            utils.timing.reiniciar()
+            try:
+                t0 = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    pipeline.main(workers=workers)
+                duracao = time.perf_counter() - t0
+                contadores = utils.timing.resumo()["contadores"]
+                fila = database.jobs.resumo_jobs()
+            finally:
+                definir_backend(None)
+                pipeline._texto_pdf.cache_clear()
+
+    return {
+        "workers": workers,
+        "segundos": round(duracao, 2),
+        "jobs_por_s": round(2 * qtd_pdfs / duracao, 2),
+        "chamadas_llm": backend.chamadas,
+        "limite_taxa": int(contadores.get("gpt_limite_taxa", 0)),
+        "retentativas": int(contadores.get("gpt_retentativas", 0)),
+        "fila": fila,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de ingestão offline (backend fake)")
+    parser.add_argument("--pdfs", type=int, default=10)
+    parser.add_argument("--workers", default="1,2,4", help="lista separada por vírgula")
+    parser.add_argument("--latencia", type=float, default=0.2, help="latência média do LLM fake (s)")
+    parser.add_argument("--taxa-429", type=float, default=0.0)
+    parser.add_argument("--taxa-erro", type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8}{'tempo(s)':>10}{'jobs/s':>9}{'LLM':>6}{'429':>6}{'retent.':>9}  fila")
+    for w in [int(x) for x in args.workers.split(",")]:
+        r = executar_cenario(args.pdfs, w, args.latencia, args.taxa_429, args.taxa_erro)
+        print(f"{r['workers']:>8}{r['segundos']:>10}{r['jobs_por_s']:>9}{r['chamadas_llm']:>6}"
+              f"{r['limite_taxa']:>6}{r['retentativas']:>9}  {r['fila']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+# tests/benchmark_suite.py
+"""
+Suíte de benchmarks do pipeline IPDO (standalone, sem pytest-benchmark).
+
+Cobre: extração de PDF, corte de seções, chunking, gravação no banco,
+todas as funções de queries/ e os endpoints da API (TestClient),
+sobre um PDF sintético e um banco sintético de vários anos.
+
+Uso:
+    python -m tests.benchmark_suite                     # roda e compara com a baseline
+    python -m tests.benchmark_suite --salvar-baseline   # grava a baseline desta máquina
+    python -m tests.benchmark_suite --anos 10 --filtro queries
+    python -m tests.benchmark_suite --crossover         # serial x paralelo na extração de PDF
+
+Sai com código 1 se algum caso regredir além da tolerância.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import api.deps
+import database.repository
+import queries.common
+import queries.geracao
+import queries.operacao
+import queries.termica
+import utils.metrics
+import utils.timing
+
+from tests.sinteticos import gerar_pdf_ipdo, gerar_banco_sintetico, texto_ipdo
+
+
+BASELINE_PATH = Path(__file__).parent / "benchmarks" / "baseline.json"
+
+# Módulos que leem DB_PATH no momento da chamada
+_MODULOS_DB = [api.deps, database.repository, queries.common, queries.geracao, queries.operacao, queries.termica]
+
+# Diferenças abaixo disso (ms) são tratadas como ruído
+RUIDO_MS = 0.5
+
+
+# ---------------------------------------------------------
+# Medição
+# ---------------------------------------------------------
+
+def medir(func, repeticoes: int = 20, aquecimento: int = 2) -> dict:
+    """Executa `func` várias vezes (stdout silenciado) e devolve estatísticas em ms."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(aquecimento):
+            func()
+
+        tempos = []
+        for _ in range(repeticoes):
+            t0 = time.perf_counter()
+            func()
+            tempos.append((time.perf_counter() - t0) * 1000)
+
+    tempos.sort()
+    return {
+        "n": len(tempos),
+        "mediana_ms": round(statistics.median(tempos), 3),
+        "p95_ms": round(tempos[min(len(tempos) - 1, int(0.95 * len(tempos)))], 3),
+        "min_ms": round(tempos[0], 3),
+    }
+
+
+@contextlib.contextmanager
+def apontar_banco(db_path: Path):
+    """Aponta temporariamente repository/queries/API para outro banco."""
+    originais = [(m, m.DB_PATH) for m in _MODULOS_DB]
+    for m in _MODULOS_DB:
+        m.DB_PATH = db_path
+    try:
+        yield
+    finally:
+        for m, original in originais:
+            m.DB_PATH = original
+
+
+@contextlib.contextmanager
+def _instrumentacao_isolada(tmp: Path):
+    """Spans/métricas dos benchmarks vão para o diretório temporário."""
+    timings_original = utils.timing.TIMINGS_PATH
+    metricas_original = utils.metrics.armazem.path
+    utils.timing.TIMINGS_PATH = tmp / "timings.jsonl"
+    utils.metrics.armazem.path = tmp / "metricas.db"
+    try:
+        yield
+    finally:
+        utils.timing.TIMINGS_PATH = timings_original
+        utils.metrics.armazem.path = metricas_original
+        utils.timing.reiniciar()
+
+
+# ---------------------------------------------------------
+# Casos
+# ---------------------------------------------------------
+
+def _itens_operacao() -> list[dict]:
+    return [
+        {
+            "submercado": sm,
+            "carga": {"status": "Acima", "descricao": "Carga acima do programado."},
+            "restricoes": ["Restrição de teste"],
+            "transferencia_energia": {"submercado_origem": sm, "submercado_destino": "Sul",
+                                      "status": "Sem desvio", "descricao": "Sem intercâmbio relevante."},
+            "geracao": [
+                {"tipo": t, "status": "Sem desvio", "descricao": f"Geração {t}."}
+                for t in ["Hidráulica", "Térmica", "Eólica", "Solar Fotovoltaica", "Nuclear"]
+            ],
+        }
+        for sm in ["Sudeste/Centro-Oeste", "Sul", "Nordeste", "Norte"]
+    ]
+
+
+def _itens_termica() -> list[dict]:
+    return [
+        {"unidade_geradora": f"UTE {i}", "desvio_mw": 10.0 * i, "desvio_status": "Acima",
+         "descricao": f"UTE {i}: geração {10 * i} MW acima do programado."}
+        for i in range(1, 9)
+    ]
+
+
+def montar_casos(tmp: Path, anos: int) -> list[tuple[str, object, int]]:
+    """Retorna [(nome, função sem argumentos, repetições)]."""
+    from fastapi.testclient import TestClient
+
+    from api.main import app
+    from core.chunking import split_text_by_tokens
+    from core.extract_sections import extrair_operacao, extrair_termica
+    from core.pdf_extractor_v2 import extrair_texto
+    from database.init_db import init_db
+    from database.repository import salvar_destaques_operacao, salvar_destaques_termica
+
+    pdf_pequeno = gerar_pdf_ipdo(tmp / "ipdo_2025_01_07.pdf")
+    pdf_grande = gerar_pdf_ipdo(tmp / "ipdo_2025_01_08.pdf", data="2025-01-08", paginas_extras=60)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        texto = extrair_texto(pdf_pequeno)
+        banco = tmp / "historico.db"
+        datas = gerar_banco_sintetico(banco, anos=anos)
+        banco_escrita = tmp / "escrita.db"
+        init_db(banco_escrita)
+
+    texto_longo = "\n\n".join("\n".join(texto_ipdo(f"2025-01-{d:02d}", paginas_extras=3)) for d in range(1, 11))
+    data_meio = datas[len(datas) // 2]
+    client = TestClient(app)
+
+    def com_banco(db, func):
+        def wrapper():
+            with apontar_banco(db):
+                return func()
+        return wrapper
+
+    return [
+        ("pdf.extrair_texto[pequeno]", lambda: extrair_texto(pdf_pequeno), 10),
+        ("pdf.extrair_texto[grande]", lambda: extrair_texto(pdf_grande, paralelo=False), 5),
+        ("pdf.extrair_texto[grande,paralelo]", lambda: extrair_texto(pdf_grande, paralelo=True), 5),
+        ("secao.operacao", lambda: extrair_operacao(texto), 50),
+        ("secao.termica", lambda: extrair_termica(texto), 50),
+        ("chunking.split_text_by_tokens", lambda: split_text_by_tokens(texto_longo, max_tokens=1500), 10),
+        ("repo.salvar_operacao", com_banco(banco_escrita, lambda: salvar_destaques_operacao(data_meio, _itens_operacao())), 10),
+        ("repo.salvar_termica", com_banco(banco_escrita, lambda: salvar_destaques_termica(data_meio, _itens_termica())), 10),
+        ("queries.listar_datas", com_banco(banco, queries.common.listar_datas), 20),
+        ("queries.buscar_destaques_operacao", com_banco(banco, lambda: queries.operacao.buscar_destaques_operacao(data_meio)), 20),
+        ("queries.buscar_operacao_resumo", com_banco(banco, lambda: queries.operacao.buscar_operacao_resumo(data_meio)), 20),
+        ("queries.buscar_geracao", com_banco(banco, lambda: queries.geracao.buscar_geracao(data_meio, tipo="Eólica")), 20),
+        ("queries.buscar_termica_por_desvio", com_banco(banco, lambda: queries.termica.buscar_termica_por_desvio(data_meio, limite=5)), 20),
+        ("api.GET /datas", com_banco(banco, lambda: client.get("/datas")), 20),
+        ("api.GET /operacao/{data}", com_banco(banco, lambda: client.get(f"/operacao/{data_meio}")), 20),
+        ("api.GET /geracao", com_banco(banco, lambda: client.get("/geracao", params={"data": data_meio})), 20),
+        ("api.GET /termica/{data}", com_banco(banco, lambda: client.get(f"/termica/{data_meio}")), 20),
+    ]
+
+
+# ---------------------------------------------------------
+# Crossover serial x paralelo (extração de PDF)
+# ---------------------------------------------------------
+
+def medir_crossover(paginas=(5, 10, 20, 40, 80, 160), repeticoes: int = 3) -> list[dict]:
+    """
+    Mede a extração serial e paralela para PDFs de tamanhos crescentes
+    (pool já aquecido). O primeiro tamanho em que o paralelo vence é o
+    candidato a PDF_PARALELO_MIN_PAGINAS nesta máquina.
+    """
+    from core.pdf_extractor_v2 import PDF_WORKERS, contar_paginas, extrair_texto
+
+    linhas = []
+    with tempfile.TemporaryDirectory() as d, _instrumentacao_isolada(Path(d)):
+        # Aquece o pool (spawn dos workers não entra na medição)
+        aquecimento = gerar_pdf_ipdo(Path(d) / "aquecimento.pdf", paginas_extras=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            extrair_texto(aquecimento, paralelo=True)
+
+        for alvo in paginas:
+            pdf = gerar_pdf_ipdo(Path(d) / f"ipdo_{alvo}.pdf", paginas_extras=max(0, alvo - 2))
+            serial = medir(lambda: extrair_texto(pdf, paralelo=False), repeticoes=repeticoes, aquecimento=1)
+            paralelo = medir(lambda: extrair_texto(pdf, paralelo=True), repeticoes=repeticoes, aquecimento=1)
+            linhas.append({
+                "paginas": contar_paginas(pdf),
+                "serial_ms": serial["mediana_ms"],
+                "paralelo_ms": paralelo["mediana_ms"],
+                "workers": PDF_WORKERS,
+            })
+    return linhas
+
+
+def imprimir_crossover(linhas: list[dict]):
+    print(f"\n{'páginas':>8}{'serial(ms)':>13}{'paralelo(ms)':>15}{'speedup':>10}")
+    virada = None
+    for l in linhas:
+        speedup = l["serial_ms"] / l["paralelo_ms"] if l["paralelo_ms"] else 0
+        if virada is None and speedup > 1:
+            virada = l["paginas"]
+        print(f"{l['paginas']:>8}{l['serial_ms']:>13.1f}{l['paralelo_ms']:>15.1f}{speedup:>9.2f}x")
+    workers = linhas[0]["workers"] if linhas else 0
+    if workers <= 1:
+        print("Apenas 1 worker nesta máquina: extração paralela desativada (diferenças acima são ruído).")
+    elif virada is None:
+        print(f"Paralelo não compensou em nenhum tamanho ({workers} worker(s)); mantenha o serial.")
+    else:
+        print(f"Paralelo compensa a partir de ~{virada} páginas ({workers} workers) → PDF_PARALELO_MIN_PAGINAS")
+
+
+# ---------------------------------------------------------
+# Baseline e relatório
+# ---------------------------------------------------------
+
+def comparar(atual: dict, baseline: dict, tolerancia: float) -> list[dict]:
+    """Compara medianas; regressão = acima de baseline*(1+tolerancia) e acima do ruído."""
+    linhas = []
+    for nome, r in atual.items():
+        base = baseline.get(nome)
+        if base is None:
+            linhas.append({"caso": nome, "baseline_ms": None, "atual_ms": r["mediana_ms"], "delta_pct": None, "status": "NOVO"})
+            continue
+
+        b, a = base["mediana_ms"], r["mediana_ms"]
+        delta = (a - b) / b * 100 if b else 0.0
+        if a > b * (1 + tolerancia) and a - b > RUIDO_MS:
+            status = "REGRESSÃO"
+        elif a < b * (1 - tolerancia) and b - a > RUIDO_MS:
+            status = "MELHORA"
+        else:
+            status = "ok"
+        linhas.append({"caso": nome, "baseline_ms": b, "atual_ms": a, "delta_pct": round(delta, 1), "status": status})
+    return linhas
+
+
+def imprimir_relatorio(linhas: list[dict]):
+    print("\n" + "=" * 86)
+    print(f"{'caso':<40}{'baseline(ms)':>14}{'atual(ms)':>12}{'Δ%':>9}  status")
+    print("-" * 86)
+    for l in linhas:
+        base = f"{l['baseline_ms']:.3f}" if l["baseline_ms"] is not None else "-"
+        delta = f"{l['delta_pct']:+.1f}" if l["delta_pct"] is not None else "-"
+        print(f"{l['caso']:<40}{base:>14}{l['atual_ms']:>12.3f}{delta:>9}  {l['status']}")
+    print("=" * 86)
+
+
+def executar(anos: int = 3, filtro: str | None = None) -> dict:
+    resultados = {}
+    with tempfile.TemporaryDirectory() as d:
+        tmp = Path(d)
+        with _instrumentacao_isolada(tmp):
+            for nome, func, repeticoes in montar_casos(tmp, anos):
+                if filtro and filtro not in nome:
+                    continue
+                resultados[nome] = medir(func, repeticoes=repeticoes)
+                print(f"  {nome:<40} mediana={resultados[nome]['mediana_ms']:.3f} ms", file=sys.stderr)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do pipeline IPDO")
+    parser.add_argument("--anos", type=int, default=3, help="anos de histórico no banco sintético")
+    parser.add_argument("--filtro", help="roda apenas casos cujo nome contém este texto")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="regressão tolerada (0.25 = +25%%)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--salvar-baseline", action="store_true")
+    parser.add_argument("--crossover", action="store_true", help="só mede serial x paralelo na extração de PDF")
+    args = parser.parse_args()
+
+    if args.crossover:
+        imprimir_crossover(medir_crossover())
+        return 0
+
+    resultados = executar(anos=args.anos, filtro=args.filtro)
+
+    if args.salvar_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            "_metadata": {
+                "gerado_em": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "plataforma": platform.platform(),
+                "anos": args.anos,
+            },
+            "casos": resultados,
+        }, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Baseline salva em {args.baseline}")
+        return 0
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")).get("casos", {})
+    else:
+        print(f"[WARN] Baseline não encontrada ({args.baseline}); rode com --salvar-baseline")
+
+    linhas = comparar(resultados, baseline, args.tolerancia)
+    imprimir_relatorio(linhas)
+
+    return 1 if any(l["status"] == "REGRESSÃO" for l in linhas) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+# tests/benchmark_tokens_agente.py
+"""
+Tokens das saídas de tool do agente: JSON (_safe_json_dumps) x tabela
+compacta (agent_ipdo/formato.py), sobre dias reais do banco.
+
+Duas colunas para a tabela compacta:
+- "sem corte": só a troca de formato (max_texto=0), sem perda de informação
+- "com corte": textos acima de AGENT_COMPACTO_MAX_TEXTO cortados; "refs" conta
+  os trechos cortados — cada um que o modelo precisar custa uma chamada
+  expandir_texto, que não entra na conta
+
+Para cada uma das últimas N datas executa as tools por data pelo dispatcher
+do agente e conta os tokens de cada codificação (core.chunking.contar_tokens:
+tiktoken, ou estimativa len/4 sem ele).
+
+Uso:
+    python -m tests.benchmark_tokens_agente                 # banco de DB_PATH, 30 dias
+    python -m tests.benchmark_tokens_agente --dias 90 --db outro.db
+    python -m tests.benchmark_tokens_agente --sintetico 1   # sem banco: 1 ano sintético
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+import agent_ipdo.agent as agent
+import database.indice_historico
+import queries.common
+import queries.geracao
+import queries.operacao
+import queries.termica
+from agent_ipdo.formato import codificar_compacto
+from config.settings import DB_PATH
+from core.chunking import _encoder, contar_tokens
+from tests.benchmark_ingestao import substituir
+from tests.sinteticos import gerar_banco_sintetico
+
+
+TOOLS_POR_DATA = ("buscar_operacao", "buscar_operacao_resumo", "buscar_geracao", "buscar_termica", "buscar_restricoes")
+
+CONSULTAS_HISTORICO = ("restrição interligação Norte-Sudeste", "UTE abaixo do programado", "geração eólica Nordeste")
+
+
+def _modulos_com_banco():
+    return (queries.common, queries.operacao, queries.geracao, queries.termica, database.indice_historico)
+
+
+def executar(db_path: Path, dias: int = 30) -> list[dict]:
+    """
+    [{tool, chamadas, json_tokens, integral_tokens, compacto_tokens, refs}]
+    somados sobre as últimas `dias` datas.
+    """
+    with substituir(*((m, "DB_PATH", db_path) for m in _modulos_com_banco())), \
+            contextlib.redirect_stdout(io.StringIO()):
+        chamadas = [("listar_datas", {})]
+        datas = agent._executar_tool("listar_datas", {})[:dias]
+        chamadas += [(tool, {"data": data}) for data in datas for tool in TOOLS_POR_DATA]
+        chamadas += [("buscar_historico", {"consulta": c}) for c in CONSULTAS_HISTORICO]
+
+        totais: dict[str, dict] = {}
+        for tool, args in chamadas:
+            resultado = agent._executar_tool(tool, args)
+            t = totais.setdefault(tool, {
+                "tool": tool, "chamadas": 0, "json_tokens": 0, "integral_tokens": 0, "compacto_tokens": 0, "refs": 0,
+            })
+            compacto = codificar_compacto(resultado)
+            t["chamadas"] += 1
+            t["json_tokens"] += contar_tokens(agent._safe_json_dumps(resultado))
+            t["integral_tokens"] += contar_tokens(codificar_compacto(resultado, max_texto=0))
+            t["compacto_tokens"] += contar_tokens(compacto)
+            t["refs"] += compacto.count(" ref=")
+
+    return list(totais.values())
+
+
+def _reducao(tokens: int, base: int) -> float:
+    return 1 - tokens / base if base else 0
+
+
+def imprimir(linhas: list[dict], origem: str):
+    tokenizer = "tiktoken" if _encoder() is not None else "estimativa len/4"
+    print(f"\nTokens das saídas de tool — {origem} (contagem: {tokenizer})")
+    cabecalho = (
+        f"{'tool':<24}{'chamadas':>9}{'JSON':>10}"
+        f"{'sem corte':>11}{'redução':>9}{'com corte':>11}{'redução':>9}{'refs':>7}"
+    )
+    print("=" * len(cabecalho))
+    print(cabecalho)
+    print("-" * len(cabecalho))
+    total = {"json_tokens": 0, "integral_tokens": 0, "compacto_tokens": 0, "refs": 0}
+    for l in linhas:
+        for k in total:
+            total[k] += l[k]
+        print(
+            f"{l['tool']:<24}{l['chamadas']:>9}{l['json_tokens']:>10}"
+            f"{l['integral_tokens']:>11}{_reducao(l['integral_tokens'], l['json_tokens']):>8.0%}"
+            f"{l['compacto_tokens']:>11}{_reducao(l['compacto_tokens'], l['json_tokens']):>8.0%}{l['refs']:>7}"
+        )
+    print("-" * len(cabecalho))
+    print(
+        f"{'total':<24}{'':>9}{total['json_tokens']:>10}"
+        f"{total['integral_tokens']:>11}{_reducao(total['integral_tokens'], total['json_tokens']):>8.0%}"
+        f"{total['compacto_tokens']:>11}{_reducao(total['compacto_tokens'], total['json_tokens']):>8.0%}{total['refs']:>7}"
+    )
+    print("=" * len(cabecalho))
+    print("sem corte: só o formato, sem perda | com corte: textos longos viram ref (expandir_texto não contado)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tokens das saídas de tool: JSON x compacto")
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument("--dias", type=int, default=30)
+    parser.add_argument("--sintetico", type=int, metavar="ANOS", help="Mede num banco sintético de ANOS anos")
+    args = parser.parse_args()
+
+    if args.sintetico:
+        with tempfile.TemporaryDirectory() as d:
+            db = Path(d) / "sintetico.db"
+            with contextlib.redirect_stdout(io.StringIO()):
+                gerar_banco_sintetico(db, anos=args.sintetico)
+                database.indice_historico.reconstruir(db)
+            imprimir(executar(db, args.dias), f"banco sintético, últimos {args.dias} dia(s)")
+        return 0
+
+    if not Path(args.db).exists():
+        print(f"Banco não encontrado: {args.db} (use --db ou --sintetico)", file=sys.stderr)
+        return 1
+    imprimir(executar(args.db, args.dias), f"{Path(args.db).name}, últimos {args.dias} dia(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
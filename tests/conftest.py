@@ -0,0 +1,11 @@
+import pytest
+
+import utils.metrics as metrics
+import utils.timing as timing
+
+
+@pytest.fixture(autouse=True)
+def _instrumentacao_em_tmp(tmp_path, monkeypatch):
+    """Spans e métricas de cada teste vão para tmp_path, nunca para logs/ do repositório."""
+    monkeypatch.setattr(timing, "TIMINGS_PATH", tmp_path / "timings.jsonl")
+    monkeypatch.setattr(metrics.armazem, "path", tmp_path / "metricas.db")
@@ -0,0 +1,196 @@
+# tests/sinteticos.py
+"""
+Geradores de dados sintéticos para testes e benchmarks.
+
+- gerar_pdf_ipdo: PDF com a mesma estrutura de seções do IPDO
+  (4 - Destaques da Operação, 5 - Gerações, 6 - Destaques da Geração Térmica,
+  7 - Demandas Máximas), escrito à mão (sem reportlab)
+- gerar_banco_sintetico: banco SQLite com N anos de destaques diários
+"""
+
+import json
+import random
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+
+from database.init_db import init_db
+
+
+SUBMERCADOS = ["Sudeste/Centro-Oeste", "Sul", "Nordeste", "Norte"]
+TIPOS_GERACAO = ["Hidráulica", "Térmica", "Eólica", "Solar", "Nuclear"]
+STATUS = ["Acima", "Inferior", "Sem desvio"]
+UTES = [
+    "Santa Cruz", "Porto de Sergipe I", "Termopernambuco", "Angra 2", "Mauá 3",
+    "Norte Fluminense", "Parnaíba IV", "GNA I", "Linhares", "Candiota III",
+]
+MOTIVOS = [
+    "atendimento a restrição elétrica",
+    "razões energéticas",
+    "indisponibilidade de unidade geradora",
+    "restrição de combustível",
+    "teste de comissionamento",
+]
+
+
+# ---------------------------------------------------------
+# Texto do relatório
+# ---------------------------------------------------------
+
+def linhas_termica(rng: random.Random, qtd: int) -> list[str]:
+    """Linhas no padrão 'UTE X: geração N MW acima/abaixo do programado, devido a ...'"""
+    out = []
+    for ute in rng.sample(UTES, min(qtd, len(UTES))):
+        mw = rng.randint(5, 900)
+        direcao = rng.choice(["acima", "abaixo"])
+        out.append(f"UTE {ute}: geração {mw} MW {direcao} do programado, devido a {rng.choice(MOTIVOS)}.")
+    return out
+
+
+def texto_ipdo(data: str, paginas_extras: int = 0, termicas: int = 4, seed: int = 0) -> list[str]:
+    """Linhas de texto de um IPDO sintético (ordem das seções igual ao relatório real)."""
+    rng = random.Random(f"{data}-{seed}")
+    linhas = [
+        f"IPDO - Informe Preliminar Diário da Operação - {data}",
+        "1 - Condições Hidroenergéticas",
+        "Armazenamento equivalente dentro do esperado para o período.",
+        "4 - Destaques da Operação",
+    ]
+
+    for sm in SUBMERCADOS:
+        linhas.append(f"Submercado {sm}:")
+        linhas.append(f"Carga {rng.choice(['acima', 'inferior'])} da programada em {rng.randint(1, 9)}%.")
+        for tipo in TIPOS_GERACAO:
+            linhas.append(f"Geração {tipo.lower()} {rng.choice(['acima', 'inferior', 'sem desvio'])} em relação ao programado.")
+        linhas.append(f"Restrição na interligação {sm}-{rng.choice(SUBMERCADOS)} por manutenção programada.")
+
+    linhas.append("5 - Gerações")
+    for i in range(40 + 60 * paginas_extras):
+        valores = " ".join(str(rng.randint(100, 99999)) for _ in range(8))
+        linhas.append(f"Usina {i:04d} {valores}")
+
+    linhas.append("6 - Destaques da Geração Térmica")
+    linhas.extend(linhas_termica(rng, termicas))
+
+    linhas.append("7 - Demandas Máximas")
+    for sm in SUBMERCADOS:
+        linhas.append(f"{sm}: {rng.randint(5000, 50000)} MW às {rng.randint(0, 23):02d}h")
+
+    return linhas
+
+
+# ---------------------------------------------------------
+# PDF mínimo (Helvetica / WinAnsiEncoding)
+# ---------------------------------------------------------
+
+def _escapar_pdf(s: str) -> bytes:
+    b = s.encode("cp1252", errors="replace")
+    return b.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def escrever_pdf(path: Path, linhas: list[str], linhas_por_pagina: int = 60) -> Path:
+    """Escreve um PDF texto simples, uma linha por instrução Tj."""
+    paginas = [linhas[i:i + linhas_por_pagina] for i in range(0, len(linhas), linhas_por_pagina)] or [[]]
+
+    objetos: list[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # Pages (preenchido depois)
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+
+    kids = []
+    for pagina in paginas:
+        conteudo = b"BT /F1 9 Tf 12 TL 40 800 Td\n" + b"".join(
+            b"(" + _escapar_pdf(l) + b") Tj T*\n" for l in pagina
+        ) + b"ET"
+        objetos.append(b"<< /Length %d >>\nstream\n" % len(conteudo) + conteudo + b"\nendstream")
+        conteudo_id = len(objetos)
+        objetos.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % conteudo_id
+        )
+        kids.append(len(objetos))
+
+    objetos[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objetos, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objetos) + 1, xref)
+
+    path = Path(path)
+    path.write_bytes(bytes(out))
+    return path
+
+
+def gerar_pdf_ipdo(path: Path, data: str = "2025-01-07", paginas_extras: int = 0, seed: int = 0) -> Path:
+    """PDF sintético de IPDO; cada página extra adiciona ~60 linhas à seção de gerações."""
+    return escrever_pdf(path, texto_ipdo(data, paginas_extras=paginas_extras, seed=seed))
+
+
+# ---------------------------------------------------------
+# Banco sintético
+# ---------------------------------------------------------
+
+def gerar_banco_sintetico(
+    db_path: Path,
+    anos: int = 3,
+    inicio: date = date(2015, 1, 1),
+    termicas_por_dia: int = 5,
+    seed: int = 0,
+) -> list[str]:
+    """
+    Popula um banco novo com `anos` de destaques diários.
+    Retorna a lista de datas geradas (YYYY-MM-DD, crescente).
+    """
+    rng = random.Random(seed)
+    init_db(db_path)
+
+    datas = [(inicio + timedelta(days=i)).isoformat() for i in range(365 * anos)]
+    oper, ger, term = [], [], []
+
+    for d in datas:
+        for sm in SUBMERCADOS:
+            restricoes = [f"Restrição {k} no {sm}" for k in range(rng.randint(0, 3))]
+            oper.append((
+                d, sm, rng.choice(STATUS), f"Carga em {sm} no dia {d}.",
+                json.dumps(restricoes, ensure_ascii=False),
+                sm, rng.choice(SUBMERCADOS), rng.choice(STATUS), "Intercâmbio dentro do programado.",
+            ))
+            for tipo in TIPOS_GERACAO:
+                ger.append((d, sm, tipo, rng.choice(STATUS), f"Geração {tipo} em {sm}."))
+
+        for linha in linhas_termica(rng, termicas_por_dia):
+            ute = linha.split(":")[0]
+            mw = float(linha.split("geração ")[1].split(" MW")[0])
+            status = "Acima" if " acima " in linha else "Abaixo"
+            term.append((d, ute, mw, status, linha))
+
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO destaques_operacao
+            (data, submercado, carga_status, carga_descricao, restricoes,
+             transferencia_origem, transferencia_destino, transferencia_status, transferencia_descricao)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, oper)
+        conn.executemany("""
+            INSERT OR REPLACE INTO destaques_geracao (data, submercado, tipo_geracao, status, descricao)
+            VALUES (?, ?, ?, ?, ?)
+        """, ger)
+        conn.executemany("""
+            INSERT OR IGNORE INTO destaques_geracao_termica
+            (data, unidade_geradora, desvio_mw, desvio_status, descricao)
+            VALUES (?, ?, ?, ?, ?)
+        """, term)
+    conn.close()
+
+    return datas
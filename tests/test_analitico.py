@@ -0,0 +1,108 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.deps
+from api.main import app
+from database.exportador import exportar_banco
+from database.snapshots import publicar_snapshot
+from queries import analitico
+from tests.sinteticos import gerar_banco_sintetico
+
+CONSULTAS = [
+    lambda motor: analitico.distribuicao_status_geracao(periodo="mes", motor=motor),
+    lambda motor: analitico.distribuicao_status_carga("2015-03-01", "2015-06-30", submercado="Sul", motor=motor),
+    lambda motor: analitico.tendencia_desvio_termica(periodo="ano", motor=motor),
+    lambda motor: analitico.ranking_unidades_termica(desde="2015-02-01", limite=3, motor=motor),
+]
+
+
+@pytest.fixture
+def banco(tmp_path, monkeypatch):
+    db = tmp_path / "historico.db"
+    gerar_banco_sintetico(db, anos=1)
+    monkeypatch.setattr(analitico, "DB_PATH", db)
+    monkeypatch.setattr(analitico, "EXPORT_DIR", tmp_path / "exports")
+    monkeypatch.setattr(api.deps, "DB_PATH", db)
+    analitico.reiniciar()
+    yield db
+    analitico.reiniciar()
+
+
+def test_agregacoes_no_sqlite(banco):
+    linhas = analitico.distribuicao_status_carga(periodo="ano", motor="sqlite")
+
+    assert {l["periodo"] for l in linhas} == {"2015"}
+    assert sum(l["qtd"] for l in linhas) == 365 * len({l["submercado"] for l in linhas})
+
+    ranking = analitico.ranking_unidades_termica(limite=3, motor="sqlite")
+    assert len(ranking) == 3
+    assert ranking[0]["total_mw"] >= ranking[-1]["total_mw"]
+
+
+def test_periodo_invalido(banco):
+    with pytest.raises(ValueError):
+        analitico.tendencia_desvio_termica(periodo="semana", motor="sqlite")
+
+
+@pytest.mark.parametrize("consulta", CONSULTAS)
+def test_duckdb_parquet_igual_ao_sqlite(banco, tmp_path, monkeypatch, consulta):
+    pytest.importorskip("duckdb")
+    pytest.importorskip("pyarrow")
+    exportar_banco(formato="parquet", destino=tmp_path / "exports", db_path=banco)
+    monkeypatch.setattr(analitico, "ANALITICO_FONTE", "parquet")
+
+    assert analitico.motor_ativo() == "duckdb:parquet"
+    assert consulta("duckdb") == consulta("sqlite")
+
+
+def test_endpoints(banco, monkeypatch):
+    monkeypatch.setattr(analitico, "ANALITICO_FONTE", "parquet")  # sem exportação → SQLite
+    client = TestClient(app)
+
+    r = client.get("/analitico/termica/ranking", params={"limite": 2})
+    assert r.status_code == 200
+    assert r.json()["motor"] == "sqlite"
+    assert len(r.json()["linhas"]) == 2
+
+    assert client.get("/analitico/geracao/status", params={"periodo": "semana"}).status_code == 422
+    assert client.get("/analitico/carga/status", params={"submercado": "Sul"}).json()["linhas"]
+
+
+@pytest.mark.parametrize("motor", ["sqlite", "duckdb"])
+def test_le_o_snapshot_publicado(banco, monkeypatch, motor):
+    if motor == "duckdb":
+        pytest.importorskip("duckdb")
+    monkeypatch.setattr(analitico, "ANALITICO_FONTE", "sqlite")
+    publicar_snapshot(banco)
+    if motor == "duckdb" and analitico.motor_ativo() != "duckdb:sqlite":
+        pytest.skip("extensão sqlite do DuckDB indisponível")
+
+    conn = sqlite3.connect(banco)
+    with conn:
+        conn.execute("""
+            INSERT INTO destaques_geracao_termica (data, unidade_geradora, desvio_mw, desvio_status, descricao)
+            VALUES ('2015-12-31', 'UTE Nova', 1e9, 'Acima', 'x')
+        """)
+    conn.close()
+
+    assert analitico.ranking_unidades_termica(limite=1, motor=motor)[0]["unidade_geradora"] != "UTE Nova"
+
+    publicar_snapshot(banco)
+    assert analitico.ranking_unidades_termica(limite=1, motor=motor)[0]["unidade_geradora"] == "UTE Nova"
+
+
+def test_troca_de_conexao_nao_fecha_consulta_em_andamento(monkeypatch):
+    duckdb = pytest.importorskip("duckdb")
+    monkeypatch.setattr(analitico, "_abrir_duckdb", lambda *a: (duckdb.connect(), "parquet"))
+    analitico.reiniciar()
+
+    with analitico._duckdb_em_uso() as em_uso:
+        analitico.reiniciar()  # ex: snapshot novo publicado durante a consulta
+        assert em_uso.execute("SELECT 42").fetchone() == (42,)
+        assert analitico.motor_ativo() == "duckdb:parquet"  # já é a conexão nova
+
+    with pytest.raises(duckdb.Error):
+        em_uso.execute("SELECT 1")  # fechada quando a última consulta terminou
+    analitico.reiniciar()
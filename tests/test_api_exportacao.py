@@ -0,0 +1,48 @@
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.routers.exportacao as exportacao
+from api.main import app
+from tests.sinteticos import gerar_banco_sintetico
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    db = tmp_path / "historico.db"
+    gerar_banco_sintetico(db, anos=1)
+    monkeypatch.setattr(exportacao, "DB_PATH", db)
+    monkeypatch.setattr(exportacao, "EXPORT_CHUNK_SIZE", 100)
+    return TestClient(app)
+
+
+def test_arrow_stream_com_faixa_inclusiva(client):
+    r = client.get("/export/termica", params={"desde": "2015-01-10", "ate": "2015-01-31"})
+
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    tabela = pa.ipc.open_stream(r.content).read_all()
+    datas = tabela.column("data").to_pylist()
+    assert min(datas) == "2015-01-10"
+    assert max(datas) == "2015-01-31"
+    assert tabela.schema.field("desvio_mw").type == pa.float64()
+
+
+def test_parquet_em_row_groups(client):
+    r = client.get("/export/geracao", params={"formato": "parquet", "ate": "2015-03-31"})
+
+    assert r.status_code == 200
+    arquivo = pq.ParquetFile(io.BytesIO(r.content))
+    assert arquivo.metadata.num_row_groups > 1
+    tabela = arquivo.read()
+    assert tabela.column_names == ["data", "submercado", "tipo_geracao", "status", "descricao"]
+    assert max(tabela.column("data").to_pylist()) == "2015-03-31"
+
+
+def test_tabela_ou_formato_invalidos(client):
+    assert client.get("/export/jobs").status_code == 404
+    assert client.get("/export/termica", params={"formato": "csv"}).status_code == 422
@@ -0,0 +1,51 @@
+import pytest
+
+import database.secoes_processadas as secoes_processadas
+import utils.timing as timing
+from core.atalho_secoes import e_protocolar, lembrar_secao, resolver_sem_llm
+from database.init_db import init_db
+
+
+@pytest.fixture(autouse=True)
+def _isolar(tmp_path, monkeypatch):
+    db = tmp_path / "teste.db"
+    init_db(db)
+    monkeypatch.setattr(secoes_processadas, "DB_PATH", db)
+    timing.reiniciar()
+    yield
+    timing.reiniciar()
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("", True),
+    ("Não houve destaques de geração térmica no período.", True),
+    ("Sem destaques.", True),
+    ("Nada a relatar", True),
+    ("Sem desvios relevantes no período.", True),
+    ("Não houve ocorrências na operação neste período", True),
+    ("Sem desvios relevantes, mas a UTE Santa Cruz operou acima do programado.", False),
+    ("Sem destaques exceto UTE Angra 2: geração 300 MW abaixo do programado.", False),
+    ("UTE Linhares: geração 120 MW acima do programado.", False),
+    ("Sem desvios exceto a UTE Linhares acima do programado", False),
+    ("Não houve destaques além da parada da UTE Angra dois", False),
+    ("Sem destaques salvo a térmica Candiota abaixo do programado", False),
+    ("Não houve desvios porém a usina de Piratininga parou", False),
+    ("Sem registros de geração térmica acima do programado", False),
+])
+def test_protocolar(texto, esperado):
+    assert e_protocolar(texto) is esperado
+
+
+def test_reaproveita_secao_identica_normalizada():
+    itens = [{"unidade_geradora": "UTE Linhares", "desvio_mw": 120.0, "desvio_status": "Acima", "descricao": "x"}]
+
+    assert resolver_sem_llm("termica", "UTE Linhares: geração 120 MW acima do programado.") is None
+    lembrar_secao("termica", "UTE Linhares: geração 120 MW acima do programado.", itens, "2025-01-07")
+
+    assert resolver_sem_llm("termica", "  UTE LINHARES:  geração 120 MW\nacima do programado ") == itens
+    assert resolver_sem_llm("operacao", "UTE Linhares: geração 120 MW acima do programado.") is None
+    assert resolver_sem_llm("termica", "Não houve destaques.") == []
+
+    r = timing.resumo()
+    assert r["contadores"]["atalho_repetido"] == 1
+    assert r["atalho_hit_ratio"] == 0.5
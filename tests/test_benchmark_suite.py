@@ -0,0 +1,32 @@
+import sqlite3
+
+from core.extract_sections import extrair_termica
+from core.pdf_extractor_v2 import extrair_texto
+from tests.benchmark_suite import comparar
+from tests.sinteticos import gerar_banco_sintetico, gerar_pdf_ipdo
+
+
+def test_pdf_sintetico_tem_secoes_do_ipdo(tmp_path):
+    pdf = gerar_pdf_ipdo(tmp_path / "ipdo_2025_01_07.pdf", paginas_extras=1)
+    texto = extrair_texto(pdf)
+
+    assert "4 - Destaques da Operação" in texto
+    assert "do programado" in extrair_termica(texto)
+
+
+def test_banco_sintetico_multi_anos(tmp_path):
+    datas = gerar_banco_sintetico(tmp_path / "b.db", anos=1, termicas_por_dia=2)
+
+    conn = sqlite3.connect(tmp_path / "b.db")
+    assert conn.execute("SELECT COUNT(DISTINCT data) FROM destaques_operacao").fetchone()[0] == len(datas) == 365
+    assert conn.execute("SELECT COUNT(*) FROM destaques_geracao_termica").fetchone()[0] == 730
+    conn.close()
+
+
+def test_comparar_detecta_regressao_acima_do_ruido():
+    baseline = {"a": {"mediana_ms": 10.0}, "b": {"mediana_ms": 0.1}}
+    atual = {"a": {"mediana_ms": 14.0}, "b": {"mediana_ms": 0.2}, "c": {"mediana_ms": 1.0}}
+
+    status = {l["caso"]: l["status"] for l in comparar(atual, baseline, tolerancia=0.25)}
+
+    assert status == {"a": "REGRESSÃO", "b": "ok", "c": "NOVO"}
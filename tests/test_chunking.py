@@ -0,0 +1,69 @@
+from core import gpt_runner
+from core.chunking import contar_tokens, split_text_by_tokens
+from core.json_merge import deduplicar, merge_respostas
+from core.llm_backend import BackendLLM
+
+
+def _paragrafos(n: int) -> str:
+    return "\n\n".join(f"UTE {i}: geração {i} MW acima do programado, devido a razões energéticas." for i in range(n))
+
+
+def test_chunks_respeitam_limite_e_cobrem_o_texto():
+    texto = _paragrafos(200)
+    chunks = split_text_by_tokens(texto, max_tokens=300)
+
+    assert len(chunks) > 1
+    assert all(contar_tokens(c) <= 300 for c in chunks)
+    assert "\n\n".join(chunks) == texto
+
+
+def test_overlap_repete_fim_do_chunk_anterior():
+    chunks = split_text_by_tokens(_paragrafos(200), max_tokens=300, overlap_tokens=60)
+    for anterior, seguinte in zip(chunks, chunks[1:]):
+        assert seguinte.split("\n\n")[0] in anterior
+
+
+def test_paragrafo_gigante_sem_pontuacao_e_fatiado():
+    chunks = split_text_by_tokens("x" * 20000, max_tokens=500)
+    assert len(chunks) > 1
+    assert all(contar_tokens(c) <= 500 for c in chunks)
+
+
+def test_deduplicar_termica_e_operacao():
+    ute = {"unidade_geradora": "UTE A", "desvio_mw": 10.0, "desvio_status": "Acima", "descricao": "x"}
+    final = deduplicar(merge_respostas([
+        {"data": "d", "destaques_geracao_termica": [ute]},
+        {"data": "d", "destaques_geracao_termica": [dict(ute), {**ute, "unidade_geradora": "UTE B"}]},
+    ], "termica"), "termica")
+    assert [i["unidade_geradora"] for i in final["destaques_geracao_termica"]] == ["UTE A", "UTE B"]
+
+    sem = {"status": "Sem desvio", "descricao": "-"}
+    final = deduplicar(merge_respostas([
+        {"data": "d", "destaques_operacao": [{"submercado": "Sul", "carga": sem, "restricoes": ["r1"],
+                                              "geracao": [{"tipo": "Eólica", **sem}]}]},
+        {"data": "d", "destaques_operacao": [{"submercado": "Sul", "carga": {"status": "Acima", "descricao": "+"},
+                                              "restricoes": ["r1", "r2"], "geracao": [{"tipo": "Solar Fotovoltaica", **sem}]}]},
+    ], "operacao"), "operacao")
+    [sul] = final["destaques_operacao"]
+    assert sul["carga"]["status"] == "Acima"
+    assert sul["restricoes"] == ["r1", "r2"]
+    assert [g["tipo"] for g in sul["geracao"]] == ["Eólica", "Solar Fotovoltaica"]
+
+
+def test_secao_grande_vai_em_chunks_paralelos(monkeypatch):
+    prompts = []
+
+    class Backend(BackendLLM):
+        def criar_resposta(self, **kwargs):
+            prompts.append(kwargs["input"])
+            ute = kwargs["input"].split("UTE ")[1].split(":")[0]
+            item = {"unidade_geradora": f"UTE {ute}", "desvio_mw": 1.0, "desvio_status": "Acima", "descricao": "-"}
+            return type("R", (), {"output_text": f'{{"data": "d", "destaques_geracao_termica": [{__import__("json").dumps(item)}]}}'})()
+
+    monkeypatch.setattr("core.openai_client_v2.obter_backend", lambda: Backend())
+    monkeypatch.setattr(gpt_runner, "OPENAI_CONTEXTO_TOKENS", 600)
+
+    out = gpt_runner.processar_trecho_com_gpt(_paragrafos(100), "Regras.\n{{TEXTO_EXTRAIDO}}", tipo="termica")
+
+    assert len(prompts) > 1
+    assert len(out["destaques_geracao_termica"]) == len(prompts)
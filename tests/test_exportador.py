@@ -0,0 +1,109 @@
+import csv
+import gzip
+import sqlite3
+
+import database.init_db as init_db_mod
+from database.exportador import exportar_banco
+
+
+def _criar_banco(tmp_path, monkeypatch, datas):
+    db = tmp_path / "banco.db"
+    monkeypatch.setattr(init_db_mod, "DB_PATH", db)
+    init_db_mod.init_db()
+
+    conn = sqlite3.connect(db)
+    for d in datas:
+        conn.execute(
+            "INSERT INTO destaques_geracao_termica (data, unidade_geradora, desvio_mw, desvio_status, descricao) "
+            "VALUES (?, 'UTE Teste', 10.5, 'Acima', 'desc')",
+            (d,),
+        )
+    conn.commit()
+    conn.close()
+    return db
+
+
+def _ler_csv_gz(path):
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_exportar_csv_particiona_por_mes(tmp_path, monkeypatch):
+    db = _criar_banco(tmp_path, monkeypatch, ["2025-01-30", "2025-01-31", "2025-02-01"])
+    destino = tmp_path / "exports"
+
+    resumo = exportar_banco(formato="csv", destino=destino, db_path=db, chunk_size=2)
+
+    assert resumo["destaques_geracao_termica"] == 3
+    base = destino / "csv" / "destaques_geracao_termica"
+    jan = list((base / "ano=2025" / "mes=01").glob("*.csv.gz"))
+    fev = list((base / "ano=2025" / "mes=02").glob("*.csv.gz"))
+    assert len(jan) == 1 and len(fev) == 1
+    assert len(_ler_csv_gz(jan[0])) == 3  # cabeçalho + 2 linhas
+    assert _ler_csv_gz(fev[0])[1][0] == "2025-02-01"
+
+
+def _executar(db, sql):
+    conn = sqlite3.connect(db)
+    conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+
+def _linhas_exportadas(destino):
+    base = destino / "csv" / "destaques_geracao_termica"
+    return sorted(
+        (r[0], r[1], r[2]) for path in base.rglob("*.csv.gz") for r in _ler_csv_gz(path)[1:]
+    )
+
+
+def test_exportar_incremental_regrava_so_particoes_alteradas(tmp_path, monkeypatch):
+    db = _criar_banco(tmp_path, monkeypatch, ["2025-01-30", "2025-02-01"])
+    destino = tmp_path / "exports"
+
+    exportar_banco(formato="csv", destino=destino, db_path=db)
+
+    _executar(db, """
+        INSERT INTO destaques_geracao_termica (data, unidade_geradora, desvio_mw, desvio_status, descricao)
+        VALUES ('2025-01-31', 'UTE Nova', NULL, 'Abaixo', 'desc')
+    """)
+
+    resumo = exportar_banco(formato="csv", destino=destino, db_path=db)
+    assert resumo["destaques_geracao_termica"] == 2  # janeiro inteiro; fevereiro intocado
+    assert len(_linhas_exportadas(destino)) == 3  # sem duplicatas
+
+    resumo = exportar_banco(formato="csv", destino=destino, db_path=db)
+    assert resumo["destaques_geracao_termica"] == 0
+
+
+def test_exportar_incremental_inclui_datas_antigas_alteracoes_e_remocoes(tmp_path, monkeypatch):
+    db = _criar_banco(tmp_path, monkeypatch, ["2025-01-30", "2025-02-01"])
+    destino = tmp_path / "exports"
+    exportar_banco(formato="csv", destino=destino, db_path=db)
+
+    # Data anterior à última exportada (backfill), alteração in-place e remoção
+    _executar(db, """
+        INSERT INTO destaques_geracao_termica (data, unidade_geradora, desvio_mw, desvio_status, descricao)
+        VALUES ('2024-12-15', 'UTE Antiga', 1, 'Acima', 'desc')
+    """)
+    _executar(db, "UPDATE destaques_geracao_termica SET desvio_mw = 99 WHERE data = '2025-02-01'")
+    _executar(db, "DELETE FROM destaques_geracao_termica WHERE data = '2025-01-30'")
+
+    exportar_banco(formato="csv", destino=destino, db_path=db)
+
+    assert _linhas_exportadas(destino) == [
+        ("2024-12-15", "UTE Antiga", "1.0"),
+        ("2025-02-01", "UTE Teste", "99.0"),
+    ]
+    assert not (destino / "csv" / "destaques_geracao_termica" / "ano=2025" / "mes=01").exists()
+
+
+def test_estado_antigo_por_data_refaz_exportacao_completa(tmp_path, monkeypatch):
+    db = _criar_banco(tmp_path, monkeypatch, ["2025-01-30"])
+    destino = tmp_path / "exports"
+    destino.mkdir()
+    (destino / "_estado_export.json").write_text('{"csv": {"destaques_geracao_termica": "2025-01-30"}}')
+
+    resumo = exportar_banco(formato="csv", destino=destino, db_path=db)
+
+    assert resumo["destaques_geracao_termica"] == 1
@@ -0,0 +1,57 @@
+import json
+
+import agent_ipdo.agent as agent
+from agent_ipdo.formato import codificar_compacto, expandir
+
+
+def test_lista_de_dicts_vira_cabecalho_e_linhas():
+    itens = [
+        {"unidade_geradora": "UTE A", "desvio_mw": 120.0, "desvio_status": "Acima", "obs": None},
+        {"unidade_geradora": "UTE B", "desvio_mw": None, "desvio_status": "Sem desvio", "obs": None},
+    ]
+
+    assert codificar_compacto(itens).splitlines() == [
+        "2 linha(s)",
+        "unidade_geradora | desvio_mw | desvio_status",  # coluna só com null some
+        "UTE A | 120 | Acima",
+        "UTE B |  | Sem desvio",
+    ]
+
+
+def test_aninhados_viram_colunas_e_listas_celulas():
+    itens = [{
+        "submercado": "Nordeste",
+        "carga": {"status": "Acima", "descricao": None},
+        "restricoes": ["Corte eólico", "Limite | Xingó"],
+        "geracao": [{"tipo": "Eólica", "status": "Acima", "descricao": None}],
+    }]
+
+    cabecalho, linha = codificar_compacto(itens).splitlines()[1:]
+    assert cabecalho == "submercado | carga.status | restricoes | geracao"
+    assert linha == "Nordeste | Acima | Corte eólico ; Limite / Xingó | tipo=Eólica, status=Acima"
+
+
+def test_texto_longo_cortado_com_referencia():
+    descricao = "Geração abaixo do programado " * 20
+    saida = codificar_compacto([{"descricao": descricao}], max_texto=40)
+
+    celula = saida.splitlines()[2]
+    assert celula.startswith("Geração abaixo do programado Geração…[+")
+    ref = celula.split("ref=")[1].rstrip("]")
+    assert expandir(ref) == " ".join(descricao.split())
+    assert agent._executar_tool("expandir_texto", {"ref": ref})["texto"] == expandir(ref)
+    assert "erro" in agent._executar_tool("expandir_texto", {"ref": "t0000000"})
+
+
+def test_outros_resultados():
+    assert codificar_compacto([]) == "0 linha(s)"
+    assert codificar_compacto(["2025-01-08", "2025-01-07"]) == "2 item(ns): 2025-01-08, 2025-01-07"
+    assert json.loads(codificar_compacto({"erro": "falhou", "detalhe": None})) == {"erro": "falhou"}
+
+
+def test_formato_escolhido_por_tool(monkeypatch):
+    itens = [{"submercado": "Sul", "restricao": "Limite de intercâmbio"}]
+    monkeypatch.setattr(agent, "AGENT_FORMATO_TOOLS", {"buscar_restricoes": "compacto"})
+
+    assert agent._codificar_resultado("buscar_restricoes", itens).startswith("1 linha(s)\n")
+    assert json.loads(agent._codificar_resultado("buscar_operacao", itens)) == itens
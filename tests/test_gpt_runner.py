@@ -0,0 +1,30 @@
+from config.settings import PROMPTS_DIR
+from core import gpt_runner
+from core.openai_client_v2 import _registrar_uso
+
+
+def test_prompt_tem_prefixo_estatico_e_dados_no_fim():
+    template = (PROMPTS_DIR / "destaques_geracao_termica.txt").read_text(encoding="utf-8")
+
+    p1 = gpt_runner.montar_prompt(template, "UTE A: 10 MW acima.", "termica", "2025-01-07")
+    p2 = gpt_runner.montar_prompt(template, "UTE B: 20 MW abaixo.", "termica", "2025-01-08")
+
+    prefixo = template[:gpt_runner._inicio_dados(template)]
+    assert p1.startswith(prefixo) and p2.startswith(prefixo)
+    assert "{{" not in prefixo
+    assert p1.endswith("Data do relatório: 2025-01-07\n\nTexto analisado:\nUTE A: 10 MW acima.\n")
+
+
+def test_schema_no_prompt_fica_no_prefixo(monkeypatch):
+    monkeypatch.setattr(gpt_runner, "OPENAI_STRUCTURED_OUTPUT", False)
+    prompt = gpt_runner.montar_prompt("Regras.\nData: {{DATA_RELATORIO}}\n{{TEXTO_EXTRAIDO}}", "texto", "termica", "2025-01-07")
+    assert prompt.index("JSON Schema") < prompt.index("2025-01-07")
+    assert prompt.endswith("Data: 2025-01-07\ntexto")
+
+
+def test_tokens_em_cache_sao_contabilizados():
+    detalhes = type("D", (), {"cached_tokens": 768})()
+    usage = type("U", (), {"input_tokens": 1200, "output_tokens": 50, "input_tokens_details": detalhes})()
+    attrs = {}
+    _registrar_uso(type("R", (), {"usage": usage})(), attrs)
+    assert attrs == {"tokens_entrada": 1200, "tokens_saida": 50, "tokens_cache": 768}
@@ -0,0 +1,10 @@
+import pytest
+
+from tests.benchmark_importacao import PONTOS_DE_ENTRADA, medir_importacao, pesados_importados
+
+
+@pytest.mark.parametrize("modulo", PONTOS_DE_ENTRADA)
+def test_ponto_de_entrada_nao_carrega_dependencias_pesadas(modulo):
+    _, importados = medir_importacao(modulo)
+    assert modulo in importados
+    assert pesados_importados(importados) == []
@@ -0,0 +1,111 @@
+import sqlite3
+
+import pytest
+
+import database.indice_historico as indice
+import database.repository as repository
+from database.init_db import init_db
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    db = tmp_path / "teste.db"
+    init_db(db)
+    monkeypatch.setattr(repository, "DB_PATH", db)
+    monkeypatch.setattr(indice, "DB_PATH", db)
+    return db
+
+
+def _operacao(submercado, restricoes=(), intercambio=None, eolica="Geração eólica dentro do previsto."):
+    return {
+        "submercado": submercado,
+        "carga": {"status": "Normal", "descricao": "Carga dentro do previsto."},
+        "restricoes": list(restricoes),
+        "transferencia_energia": intercambio or {},
+        "geracao": [{"tipo": "Eólica", "status": "Normal", "descricao": eolica}],
+    }
+
+
+def _norte_sudeste(descricao):
+    return {"submercado_origem": "Norte", "submercado_destino": "Sudeste", "status": "Limitado", "descricao": descricao}
+
+
+def test_tokenizar_ignora_acento_plural_e_stopwords():
+    assert indice.tokenizar("Restrições na interligação Norte-Sudeste") == ["restricao", "interligacao", "norte", "sudeste"]
+    assert indice.tokenizar("restrição") == indice.tokenizar("RESTRIÇÕES")
+    assert indice.tokenizar(None) == []
+
+
+def test_busca_ranqueia_trechos_de_varias_datas(db):
+    repository.salvar_destaques_operacao("2025-01-05", [_operacao("Sudeste")])
+    repository.salvar_destaques_operacao("2025-01-06", [
+        _operacao("Norte", intercambio=_norte_sudeste("Restrição na interligação Norte-Sudeste por manutenção.")),
+    ])
+    repository.salvar_destaques_operacao("2025-01-07", [
+        _operacao("Nordeste", restricoes=["Restrição elétrica na transformação de Xingó."]),
+    ])
+    repository.salvar_destaques_termica("2025-01-07", [
+        {"unidade_geradora": "UTE Norte Fluminense", "desvio_mw": 100, "desvio_status": "Acima", "descricao": "despacho por restrição elétrica"},
+    ])
+
+    hits = indice.buscar("quando houve restrição na interligação Norte-Sudeste?")
+
+    assert hits[0]["data"] == "2025-01-06"
+    assert hits[0]["fonte"] == "intercambio"
+    assert hits[0]["submercado"] == "Norte"
+    assert hits[0]["trecho"].startswith("Norte → Sudeste:")
+    assert {h["data"] for h in hits} >= {"2025-01-06", "2025-01-07"}
+    assert [h["score"] for h in hits] == sorted((h["score"] for h in hits), reverse=True)
+
+
+def test_filtros_de_data_submercado_e_fonte(db):
+    for data in ("2025-01-06", "2025-01-07"):
+        repository.salvar_destaques_operacao(data, [
+            _operacao("Nordeste", restricoes=["Restrição de escoamento eólico."]),
+            _operacao("Sul", restricoes=["Restrição de escoamento na região Sul."]),
+        ])
+
+    assert {h["data"] for h in indice.buscar("escoamento", desde="2025-01-07")} == {"2025-01-07"}
+    assert {h["submercado"] for h in indice.buscar("escoamento", submercado="nordeste")} == {"Nordeste"}
+    assert indice.buscar("escoamento", fonte="geracao") == []
+    assert len(indice.buscar("escoamento", limite=1)) == 1
+
+
+def test_reprocessar_data_atualiza_o_indice(db):
+    repository.salvar_destaques_operacao("2025-01-07", [_operacao("Nordeste", restricoes=["Corte de geração eólica."])])
+    assert indice.buscar("corte eólica")
+
+    repository.salvar_destaques_operacao("2025-01-07", [_operacao("Nordeste", restricoes=["Limitação em Xingó."])])
+    assert [h for h in indice.buscar("corte") if h["fonte"] == "restricao"] == []
+    assert indice.buscar("xingó")[0]["fonte"] == "restricao"
+
+
+def _apagar_indice(db):
+    conn = sqlite3.connect(db)
+    with conn:
+        conn.execute("DELETE FROM busca_termos")
+        conn.execute("DELETE FROM busca_documentos")
+    conn.close()
+
+
+def test_reconstruir_indexa_banco_existente(db):
+    repository.salvar_destaques_operacao("2025-01-07", [_operacao("Nordeste", restricoes=["Corte de geração eólica."])])
+    _apagar_indice(db)
+
+    assert indice.reconstruir(db) == 3  # restrição, carga, geração eólica
+    assert indice.buscar("corte")[0]["data"] == "2025-01-07"
+
+
+def test_indice_vazio_com_destaques_e_reconstruido_na_busca(db, monkeypatch):
+    monkeypatch.setattr(indice, "_reconstruidos", set())
+    repository.salvar_destaques_operacao("2025-01-07", [_operacao("Nordeste", restricoes=["Corte de geração eólica."])])
+    _apagar_indice(db)
+
+    assert indice.buscar("corte")[0]["data"] == "2025-01-07"
+
+
+def test_banco_vazio_nao_reconstroi(db, monkeypatch):
+    monkeypatch.setattr(indice, "_reconstruidos", set())
+    monkeypatch.setattr(indice, "reconstruir", lambda *a: pytest.fail("nada a reindexar"))
+
+    assert indice.buscar("corte") == []
@@ -0,0 +1,94 @@
+import database.init_db as init_db_mod
+import database.jobs as jobs
+
+
+def _banco(tmp_path, monkeypatch):
+    db = tmp_path / "banco.db"
+    monkeypatch.setattr(init_db_mod, "DB_PATH", db)
+    monkeypatch.setattr(jobs, "DB_PATH", db)
+    init_db_mod.init_db()
+
+
+def test_reivindicar_nao_entrega_o_mesmo_job_duas_vezes(tmp_path, monkeypatch):
+    _banco(tmp_path, monkeypatch)
+    jobs.enfileirar("a.pdf", "operacao", "h1")
+    jobs.enfileirar("a.pdf", "termica", "h1")
+
+    j1 = jobs.reivindicar("w1")
+    j2 = jobs.reivindicar("w2")
+
+    assert {j1["tipo"], j2["tipo"]} == {"operacao", "termica"}
+    assert jobs.reivindicar("w3") is None
+
+
+def test_falha_reagenda_com_backoff_e_esgota(tmp_path, monkeypatch):
+    _banco(tmp_path, monkeypatch)
+    jobs.enfileirar("a.pdf", "termica", "h1")
+
+    job = jobs.reivindicar("w1")
+    assert jobs.falhar(job["id"], "429", job["tentativas"], max_tentativas=2) == "pendente"
+
+    # Backoff ainda não venceu
+    assert jobs.reivindicar("w1") is None
+    assert jobs.proxima_tentativa_pendente() is not None
+
+    # Simula o vencimento do backoff
+    conn = jobs._get_conn()
+    conn.execute("UPDATE ingestao_jobs SET proxima_tentativa_em = 0")
+    conn.close()
+
+    job = jobs.reivindicar("w1")
+    assert job["tentativas"] == 2
+    assert jobs.falhar(job["id"], "429", job["tentativas"], max_tentativas=2) == "falhou"
+    assert jobs.resumo_jobs() == {"falhou": 1}
+
+
+def test_pdf_alterado_reabre_job_concluido(tmp_path, monkeypatch):
+    _banco(tmp_path, monkeypatch)
+    jobs.enfileirar("a.pdf", "operacao", "h1")
+    jobs.concluir(jobs.reivindicar("w1")["id"])
+
+    jobs.enfileirar("a.pdf", "operacao", "h1")
+    assert jobs.resumo_jobs() == {"concluido": 1}
+
+    jobs.enfileirar("a.pdf", "operacao", "h2")
+    assert jobs.resumo_jobs() == {"pendente": 1}
+
+
+def test_recuperar_orfaos(tmp_path, monkeypatch):
+    _banco(tmp_path, monkeypatch)
+    jobs.enfileirar("a.pdf", "operacao", "h1")
+    jobs.reivindicar("w1")
+
+    assert jobs.recuperar_orfaos(timeout_s=3600) == 0
+    assert jobs.recuperar_orfaos(timeout_s=-1) == 1
+    assert jobs.reivindicar("w2")["tentativas"] == 2
+
+
+def test_recuperar_orfaos_de_worker_morto_sem_esperar_timeout(tmp_path, monkeypatch):
+    import os
+    import subprocess
+    import sys
+
+    _banco(tmp_path, monkeypatch)
+    morto = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    for pdf, worker in (("a.pdf", f"pid{morto.stdout.strip()}"),   # processo já terminou
+                        ("b.pdf", f"pid{os.getpid()}-t1"),          # PID reaproveitado por este processo
+                        ("c.pdf", f"pid{os.getppid()}")):           # outro processo vivo
+        jobs.enfileirar(pdf, "operacao", "h1")
+        jobs.reivindicar(worker)
+
+    assert jobs.recuperar_orfaos() == 2
+    assert jobs.resumo_jobs() == {"pendente": 2, "executando": 1}
+
+
+def test_proximo_job_pronto_respeita_backoff(tmp_path, monkeypatch):
+    _banco(tmp_path, monkeypatch)
+    assert not jobs.proximo_job_pronto()
+
+    jobs.enfileirar("a.pdf", "termica", "h1")
+    assert jobs.proximo_job_pronto()
+
+    job = jobs.reivindicar("w1")
+    jobs.falhar(job["id"], "429", job["tentativas"])
+    assert not jobs.proximo_job_pronto()
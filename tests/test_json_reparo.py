@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from core.json_reparo import reparar_json
+from core.llm_backend import BackendLLM
+from core.openai_client_v2 import chamar_gpt_v2
+
+
+def _termica(n: int) -> str:
+    itens = [
+        {"unidade_geradora": f"UTE {i}", "desvio_mw": 10.0 * i, "desvio_status": "Acima", "descricao": "a } [ \" b"}
+        for i in range(n)
+    ]
+    return json.dumps({"data": "2025-01-07", "destaques_geracao_termica": itens}, ensure_ascii=False)
+
+
+def test_remove_cercas_e_virgula_sobrando():
+    texto = '```json\n{"data": "2025-01-07", "destaques_operacao": [],}\n```'
+    assert reparar_json(texto) == ({"data": "2025-01-07", "destaques_operacao": []}, False)
+
+
+def test_truncado_salva_elementos_completos():
+    completo = _termica(3)
+    truncado = completo[: completo.rfind('"desvio_status"')]
+    dados, truncado = reparar_json(truncado)
+    assert truncado
+    assert [i["unidade_geradora"] for i in dados["destaques_geracao_termica"]] == ["UTE 0", "UTE 1"]
+    assert dados["data"] == "2025-01-07"
+
+
+def test_truncado_antes_do_primeiro_elemento():
+    assert reparar_json('{"data": "2025-01-07", "destaques_geracao_termica": [{"unidade_') == (
+        {"data": "2025-01-07", "destaques_geracao_termica": []}, True
+    )
+
+
+def test_irrecuperavel():
+    with pytest.raises(json.JSONDecodeError):
+        reparar_json("desculpe, não consegui")
+
+
+def _backend(respostas, chamadas):
+    class Backend(BackendLLM):
+        def criar_resposta(self, **kwargs):
+            chamadas.append(kwargs)
+            return type("R", (), {"output_text": respostas[min(len(chamadas), len(respostas)) - 1]})()
+
+    return Backend()
+
+
+def test_chamar_gpt_v2_repara_cercas_sem_nova_chamada(monkeypatch):
+    chamadas = []
+    backend = _backend(["```json\n" + _termica(2)[:-1] + ",}\n```"], chamadas)
+    monkeypatch.setattr("core.openai_client_v2.obter_backend", lambda: backend)
+
+    out = chamar_gpt_v2("teste", tipo="termica")
+    assert len(chamadas) == 1
+    assert [i["unidade_geradora"] for i in out["destaques_geracao_termica"]] == ["UTE 0", "UTE 1"]
+
+
+def test_chamar_gpt_v2_retenta_resposta_truncada(monkeypatch):
+    chamadas = []
+    backend = _backend([_termica(2)[:-30], _termica(2)], chamadas)
+    monkeypatch.setattr("core.openai_client_v2.obter_backend", lambda: backend)
+    monkeypatch.setattr("core.openai_client_v2.time.sleep", lambda s: None)
+
+    out = chamar_gpt_v2("teste", tipo="termica")
+    assert len(chamadas) == 2
+    assert [i["unidade_geradora"] for i in out["destaques_geracao_termica"]] == ["UTE 0", "UTE 1"]
+
+
+def test_chamar_gpt_v2_nunca_devolve_parcial(monkeypatch):
+    chamadas = []
+    backend = _backend([_termica(2)[:-30]], chamadas)
+    monkeypatch.setattr("core.openai_client_v2.obter_backend", lambda: backend)
+    monkeypatch.setattr("core.openai_client_v2.time.sleep", lambda s: None)
+
+    with pytest.raises(RuntimeError):
+        chamar_gpt_v2("teste", tipo="termica", max_retries=2)
+    assert len(chamadas) == 2
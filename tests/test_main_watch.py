@@ -0,0 +1,29 @@
+import main
+
+
+def test_watch_entrega_existentes_pelo_watcher(monkeypatch):
+    eventos = []
+    monkeypatch.setattr(main, "init_db", lambda: None)
+    monkeypatch.setattr(main, "importar_legados", lambda: None)
+    monkeypatch.setattr(main, "recuperar_orfaos", lambda: 0)
+    monkeypatch.setattr(main, "processar_retentativas", lambda: eventos.append(("retentativas",)))
+    monkeypatch.setattr(
+        main, "observar_pdfs",
+        lambda callback, periodico, incluir_existentes: eventos.append(("observar", callback, incluir_existentes)),
+    )
+
+    main.main_watch()
+
+    assert eventos == [("retentativas",), ("observar", main.processar_arquivo, True)]
+
+
+def test_pdf_sem_alteracao_nao_roda_worker(monkeypatch, tmp_path):
+    eventos = []
+    monkeypatch.setattr(main, "enfileirar_pdf", lambda pdf: True)
+    monkeypatch.setattr(main, "proximo_job_pronto", lambda: False)
+    monkeypatch.setattr(main, "executar_worker", lambda **kw: eventos.append("worker"))
+    monkeypatch.setattr(main, "publicar_snapshot", lambda: eventos.append("snapshot"))
+
+    main.processar_arquivo(tmp_path / "ipdo_2025_01_07.pdf")
+
+    assert eventos == []
@@ -0,0 +1,41 @@
+from fastapi.testclient import TestClient
+
+import api.deps as deps
+import database.init_db as init_db_mod
+import utils.metrics as metrics
+from api.main import app
+from utils.metrics import ArmazemMetricas, formatar_prometheus
+
+
+def test_armazem_compartilhado_soma_entre_instancias(tmp_path):
+    path = tmp_path / "metricas.db"
+    ArmazemMetricas(path).incrementar("ipdo_gpt_chamadas_total", 2)
+    ArmazemMetricas(path).incrementar("ipdo_gpt_chamadas_total")
+    ArmazemMetricas(path).observar("ipdo_etapa_duracao_segundos", 0.3, etapa="gpt.chamada")
+
+    texto = formatar_prometheus(ArmazemMetricas(path))
+
+    assert "# TYPE ipdo_gpt_chamadas_total counter" in texto
+    assert "ipdo_gpt_chamadas_total 3" in texto
+    assert 'ipdo_etapa_duracao_segundos_bucket{etapa="gpt.chamada",le="0.25"} 0' in texto
+    assert 'ipdo_etapa_duracao_segundos_bucket{etapa="gpt.chamada",le="0.5"} 1' in texto
+    assert 'ipdo_etapa_duracao_segundos_count{etapa="gpt.chamada"} 1' in texto
+
+
+def test_endpoint_metrics_expoe_latencia_por_rota(tmp_path, monkeypatch):
+    db = tmp_path / "banco.db"
+    monkeypatch.setattr(init_db_mod, "DB_PATH", db)
+    monkeypatch.setattr(deps, "DB_PATH", db)
+    init_db_mod.init_db()
+    metrics.incrementar_metrica("ipdo_cache_hit_total", 4)
+
+    client = TestClient(app)
+    client.get("/datas")
+    client.get("/termica/1900-01-01")
+
+    texto = client.get("/metrics").text
+
+    assert 'ipdo_api_requisicoes_total{metodo="GET",rota="/datas",status="200"}' in texto
+    assert 'ipdo_api_requisicoes_total{metodo="GET",rota="/termica/{data}",status="404"}' in texto
+    assert 'ipdo_api_sqlite_segundos_count{fase="execute"}' in texto
+    assert "ipdo_cache_hit_total 4" in texto
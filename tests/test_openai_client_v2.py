@@ -1,16 +1,66 @@
+import pytest
+
+import agent_ipdo.agent as agent
+import core.llm_backend as llm_backend
 from core.openai_client_v2 import chamar_gpt_v2
+from core.llm_backend import BackendLLM, BackendFake, ErroLimiteTaxa
 
 def test_mock_responses_api(monkeypatch):
     class FakeResp:
         output_text = '{"ok": true}'
 
-    class FakeClient:
-        def responses(self):
-            return self
-        def create(self, **kwargs):
+    class FakeBackend(BackendLLM):
+        def criar_resposta(self, **kwargs):
             return FakeResp()
 
-    monkeypatch.setattr("core.openai_client_v2.client", FakeClient())
+    monkeypatch.setattr("core.openai_client_v2.obter_backend", lambda: FakeBackend())
 
     out = chamar_gpt_v2("teste")
     assert out["ok"] is True
+
+
+def test_backend_fake_reproduz_gravacao(tmp_path):
+    (tmp_path / "ipdo_2025_01_07_termica.json").write_text(
+        '{"data": "2025-01-07", "destaques_geracao_termica": [{"unidade_geradora": "UTE X"}], '
+        '"_metadata": {"pdf_hash": "abc"}}',
+        encoding="utf-8",
+    )
+    backend = BackendFake(diretorio=tmp_path, latencia=0)
+
+    resp = backend.criar_resposta(input="... destaques_geracao_termica ...\nData do relatório: 2025-01-07")
+    assert '"UTE X"' in resp.output_text
+    assert "_metadata" not in resp.output_text
+
+    resp = backend.criar_resposta(input="Data do relatório: 2025-01-08\n destaques_operacao")
+    assert resp.output_text == '{"data": "2025-01-08", "destaques_operacao": []}'
+
+
+def test_retenta_apos_429(tmp_path, monkeypatch):
+    monkeypatch.setattr("core.openai_client_v2.time.sleep", lambda s: None)
+
+    class Backend429(BackendLLM):
+        chamadas = 0
+
+        def criar_resposta(self, **kwargs):
+            self.chamadas += 1
+            if self.chamadas == 1:
+                raise ErroLimiteTaxa("429", retry_after=1)
+            return BackendFake(diretorio=tmp_path, latencia=0).criar_resposta(**kwargs)
+
+    backend = Backend429()
+    monkeypatch.setattr("core.openai_client_v2.obter_backend", lambda: backend)
+
+    out = chamar_gpt_v2("Data do relatório: 2025-01-07\n destaques_operacao")
+    assert out == {"data": "2025-01-07", "destaques_operacao": []}
+    assert backend.chamadas == 2
+
+
+def test_sem_chave_erro_claro_antes_de_criar_cliente(monkeypatch):
+    monkeypatch.setattr(llm_backend, "_cliente_openai", None)
+    monkeypatch.setattr("dotenv.load_dotenv", lambda *a, **k: False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    with pytest.raises(llm_backend.ErroChaveAusente, match="OPENAI_API_KEY"):
+        llm_backend.obter_cliente_openai()
+    assert llm_backend._cliente_openai is None
+    assert agent._responder_com_llm("pergunta livre") == "[ERRO] OPENAI_API_KEY não encontrada no ambiente/.env"
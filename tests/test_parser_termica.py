@@ -0,0 +1,112 @@
+import random
+
+import pytest
+
+from core.parser_termica import analisar_termica, conferir, numero_br
+from tests.sinteticos import linhas_termica
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("350", 350.0),
+    ("12,5", 12.5),
+    ("1.234,5", 1234.5),
+    ("1.234", 1234.0),
+    ("12.5", 12.5),
+])
+def test_numero_br(texto, esperado):
+    assert numero_br(texto) == esperado
+
+
+def test_reconhece_linhas_sinteticas():
+    linhas = linhas_termica(random.Random(3), 5)
+
+    itens, pendentes = analisar_termica("\n".join(linhas))
+
+    assert pendentes == []
+    assert len(itens) == 5
+    for item, linha in zip(itens, linhas):
+        assert linha.startswith(item["unidade_geradora"] + ":")
+        assert item["desvio_status"] in ("Acima", "Abaixo")
+        assert item["descricao"] == linha
+
+
+def test_formatos_variados_e_itens_na_mesma_linha():
+    trecho = (
+        "Destaques da Geração Térmica\n"
+        "UTN Angra 2 – 1.234,5 MW abaixo do programado por manutenção. "
+        "UTE Porto do Pecém-I - geração 80 MW acima do programado."
+    )
+
+    itens, pendentes = analisar_termica(trecho)
+
+    assert pendentes == []
+    assert [(i["unidade_geradora"], i["desvio_mw"], i["desvio_status"]) for i in itens] == [
+        ("UTN Angra 2", 1234.5, "Abaixo"),
+        ("UTE Porto do Pecém-I", 80.0, "Acima"),
+    ]
+
+
+def test_linha_fora_do_padrao_fica_pendente():
+    trecho = (
+        "UTE Linhares: geração 120 MW acima do programado.\n"
+        "UTE Viana operou com restrição de combustível durante a madrugada."
+    )
+
+    itens, pendentes = analisar_termica(trecho)
+
+    assert [i["unidade_geradora"] for i in itens] == ["UTE Linhares"]
+    assert pendentes == ["UTE Viana operou com restrição de combustível durante a madrugada."]
+
+
+def test_linha_sem_unidade_nem_mw_nao_e_descartada():
+    trecho = (
+        "6 - Destaques da Geração Térmica\n"
+        "A térmica Candiota III operou abaixo do programado por restrição de combustível.\n"
+        "UTE Linhares: geração 120 MW acima do programado.\n"
+        "Não houve destaques no período."
+    )
+
+    itens, pendentes = analisar_termica(trecho)
+
+    assert [i["unidade_geradora"] for i in itens] == ["UTE Linhares"]
+    assert pendentes == ["A térmica Candiota III operou abaixo do programado por restrição de combustível."]
+
+
+@pytest.mark.parametrize("separador", ["; ", ", ", " e "])
+def test_itens_encadeados_na_mesma_frase(separador):
+    trecho = f"UTE Santa Cruz: geração 350 MW acima do programado{separador}UTE Linhares: 20 MW abaixo do programado."
+
+    itens, pendentes = analisar_termica(trecho)
+
+    assert [(i["unidade_geradora"], i["desvio_mw"], i["desvio_status"]) for i in itens] == [
+        ("UTE Santa Cruz", 350.0, "Acima"),
+        ("UTE Linhares", 20.0, "Abaixo"),
+    ]
+    assert pendentes == []
+
+
+@pytest.mark.parametrize("trecho", [
+    "UTE Santa Cruz e UTE Linhares: 350 MW acima do programado.",
+    "UTE Santa Cruz: geração entre 300 e 350 MW acima do programado.",
+    "UTE Santa Cruz: geração 350 MW acima do programado, com pico de 400 MW às 18h.",
+    "UTE Santa Cruz: geração 350 MW acima do programado para compensar a UTE Linhares.",
+])
+def test_item_ambiguo_vai_inteiro_ao_llm(trecho):
+    itens, pendentes = analisar_termica(trecho)
+
+    assert itens == []
+    assert pendentes == [trecho]
+
+
+def test_conferir_aponta_divergencias():
+    itens, _ = analisar_termica("UTE Linhares: geração 120 MW acima do programado.")
+    llm = [
+        {"unidade_geradora": "UTE  Linhares", "desvio_mw": 210.0, "desvio_status": "Abaixo"},
+        {"unidade_geradora": "UTE Viana", "desvio_mw": 10.0, "desvio_status": "Acima"},
+    ]
+
+    divergencias = conferir(llm, itens)
+
+    assert len(divergencias) == 2
+    assert all(d.startswith("UTE Linhares:") for d in divergencias)
+    assert conferir([{**itens[0]}], itens) == []
@@ -26,3 +26,24 @@ def test_pdf_corrompido_retornar_erro():
         assert False, "Era esperado erro ao abrir PDF corrompido"
     except RuntimeError:
         assert True
+
+
+def test_paralelo_remonta_na_ordem_igual_ao_serial(tmp_path, monkeypatch):
+    import core.pdf_extractor_v2 as extrator
+    from tests.sinteticos import gerar_pdf_ipdo
+
+    monkeypatch.setattr(extrator, "PDF_WORKERS", 3)
+    pdf = gerar_pdf_ipdo(tmp_path / "ipdo_2025_01_07.pdf", paginas_extras=4)
+
+    serial = extrair_texto(pdf, paralelo=False)
+    paralelo = extrair_texto(pdf, paralelo=True)
+
+    assert paralelo == serial
+    assert serial.index("4 - Destaques da Operação") < serial.index("6 - Destaques da Geração Térmica")
+
+
+def test_faixas_cobrem_todas_as_paginas():
+    from core.pdf_extractor_v2 import _faixas
+
+    assert _faixas(10, 3) == [(0, 4), (4, 7), (7, 10)]
+    assert _faixas(2, 4) == [(0, 1), (1, 2)]
@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+
+import database.repository as repository
+from database.init_db import init_db
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    db = tmp_path / "teste.db"
+    init_db(db)
+    monkeypatch.setattr(repository, "DB_PATH", db)
+    return db
+
+
+def _termica(unidade, mw, status="Acima"):
+    return {"unidade_geradora": unidade, "desvio_mw": mw, "desvio_status": status, "descricao": f"{unidade} desvio"}
+
+
+def _operacao(submercado, carga="Acima", eolica="Normal"):
+    return {
+        "submercado": submercado,
+        "carga": {"status": carga, "descricao": "carga"},
+        "restricoes": [],
+        "transferencia_energia": {},
+        "geracao": [
+            {"tipo": "Eólica", "status": eolica, "descricao": "eólica"},
+            {"tipo": "Solar Fotovoltaica", "status": "Normal", "descricao": "solar"},
+        ],
+    }
+
+
+def _linhas(db, sql):
+    conn = sqlite3.connect(db)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_termica_reprocessada_nao_deixa_linhas_antigas(db):
+    data = "2025-01-07"
+    repository.salvar_destaques_termica(data, [_termica("UTE A", 100), _termica("UTE B", 50), _termica("UTE C", 10)])
+    ids_antes = dict(_linhas(db, "SELECT unidade_geradora, id FROM destaques_geracao_termica"))
+
+    resumo = repository.salvar_destaques_termica(data, [_termica("UTE A", 100), _termica("UTE B", 75), _termica("UTE D", 5)])
+
+    assert resumo == {"inseridas": 1, "atualizadas": 1, "removidas": 1, "inalteradas": 1}
+    linhas = dict(_linhas(db, "SELECT unidade_geradora, desvio_mw FROM destaques_geracao_termica"))
+    assert linhas == {"UTE A": 100.0, "UTE B": 75.0, "UTE D": 5.0}
+    ids_depois = dict(_linhas(db, "SELECT unidade_geradora, id FROM destaques_geracao_termica"))
+    assert ids_depois["UTE A"] == ids_antes["UTE A"]
+    assert ids_depois["UTE B"] == ids_antes["UTE B"]
+
+
+def test_reprocessar_identico_nao_escreve(db):
+    itens = [_operacao("Sudeste"), _operacao("Sul")]
+    repository.salvar_destaques_operacao("2025-01-07", itens)
+
+    resumo = repository.salvar_destaques_operacao("2025-01-07", itens)
+
+    assert resumo == {"inseridas": 0, "atualizadas": 0, "removidas": 0, "inalteradas": 6}
+
+
+def test_operacao_diff_por_data(db):
+    repository.salvar_destaques_operacao("2025-01-06", [_operacao("Sul")])
+    repository.salvar_destaques_operacao("2025-01-07", [_operacao("Sudeste"), _operacao("Sul")])
+
+    resumo = repository.salvar_destaques_operacao("2025-01-07", [_operacao("Sudeste", eolica="Acima")])
+
+    # Sul: 1 operação + 2 gerações removidas; Sudeste: eólica atualizada
+    assert resumo == {"inseridas": 0, "atualizadas": 1, "removidas": 3, "inalteradas": 2}
+    assert _linhas(db, "SELECT data, submercado FROM destaques_operacao ORDER BY data") == [
+        ("2025-01-06", "Sul"),
+        ("2025-01-07", "Sudeste"),
+    ]
+    assert ("Solar",) in _linhas(db, "SELECT tipo_geracao FROM destaques_geracao WHERE data = '2025-01-07'")
+
+
+def test_falha_no_meio_desfaz_tudo(db, monkeypatch):
+    repository.salvar_destaques_termica("2025-01-07", [_termica("UTE A", 100)])
+    original = repository._sincronizar_data
+
+    def quebra(conn, tabela, data, linhas):
+        original(conn, tabela, data, linhas)
+        raise RuntimeError("falha simulada")
+
+    monkeypatch.setattr(repository, "_sincronizar_data", quebra)
+    with pytest.raises(RuntimeError):
+        repository.salvar_destaques_termica("2025-01-07", [_termica("UTE B", 1)])
+
+    assert _linhas(db, "SELECT unidade_geradora FROM destaques_geracao_termica") == [("UTE A",)]
@@ -0,0 +1,46 @@
+import sqlite3
+
+import database.models as models
+from database.exportador import ARQUIVO_ESTADO
+from database.init_db import init_db
+
+
+def test_reset_apaga_tabelas_derivadas(tmp_path, monkeypatch):
+    db = tmp_path / "teste.db"
+    init_db(db)
+    (tmp_path / ARQUIVO_ESTADO).write_text("{}", encoding="utf-8")
+    monkeypatch.setattr(models, "DB_PATH", db)
+    monkeypatch.setattr(models, "EXPORT_DIR", tmp_path)
+
+    conn = sqlite3.connect(db)
+    with conn:
+        conn.execute("""
+            INSERT INTO destaques_geracao_termica (data, unidade_geradora, desvio_mw, desvio_status, descricao)
+            VALUES ('2025-01-07', 'UTE X', 10, 'Acima', 'x')
+        """)
+        conn.execute("INSERT INTO busca_documentos (data, fonte, trecho, tamanho) VALUES ('2025-01-07', 'termica', 'x', 1)")
+        conn.execute("INSERT INTO secoes_processadas VALUES ('termica', 'h', '[]', '2025-01-07', 0)")
+        conn.execute("INSERT INTO respostas_llm VALUES ('h1', 'termica', '2025-01-07', NULL, x'00', 0)")
+    seq = conn.execute("SELECT max(seq) FROM export_alteracoes").fetchone()[0]
+    conn.close()
+
+    models.reset_db()
+
+    conn = sqlite3.connect(db)
+    tabelas = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert not tabelas & {"destaques_geracao_termica", "busca_documentos", "busca_termos", "secoes_processadas"}
+    assert conn.execute("SELECT count(*) FROM export_alteracoes").fetchone()[0] == 0
+    assert conn.execute("SELECT count(*) FROM respostas_llm").fetchone()[0] == 1
+    conn.close()
+    assert not (tmp_path / ARQUIVO_ESTADO).exists()
+
+    # Recriado pelo init_db, o marcador de alterações continua de onde parou
+    init_db(db)
+    conn = sqlite3.connect(db)
+    with conn:
+        conn.execute("""
+            INSERT INTO destaques_geracao_termica (data, unidade_geradora, desvio_mw, desvio_status, descricao)
+            VALUES ('2025-01-08', 'UTE X', 10, 'Acima', 'x')
+        """)
+    assert conn.execute("SELECT max(seq) FROM export_alteracoes").fetchone()[0] > seq
+    conn.close()
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+import database.respostas_llm as respostas_llm
+from core.llm_backend import BackendFake
+from database.init_db import init_db
+
+
+@pytest.fixture(autouse=True)
+def db(tmp_path, monkeypatch):
+    db = tmp_path / "teste.db"
+    init_db(db)
+    monkeypatch.setattr(respostas_llm, "DB_PATH", db)
+    return db
+
+
+def test_registra_e_busca_por_hash_e_tipo():
+    dados = {"data": "2025-01-07", "destaques_geracao_termica": [{"unidade_geradora": "UTE Á"}], "_metadata": {"x": 1}}
+
+    respostas_llm.registrar_resposta("abc", "termica", dados, fonte="ipdo_2025_01_07.pdf")
+
+    assert respostas_llm.buscar_resposta("abc", "termica") == {
+        "data": "2025-01-07",
+        "destaques_geracao_termica": [{"unidade_geradora": "UTE Á"}],
+    }
+    assert respostas_llm.buscar_resposta("abc", "operacao") is None
+    assert respostas_llm.buscar_resposta("outro", "termica") is None
+
+
+def test_importa_jsons_legados(tmp_path):
+    saida = tmp_path / "outputs"
+    saida.mkdir()
+    itens = [{"submercado": "Sul", "descricao": "carga acima do previsto " * 20}]
+    (saida / "ipdo_2025_01_07_operacao.json").write_text(
+        json.dumps({"data": "2025-01-07", "destaques_operacao": itens, "_metadata": {"pdf_hash": "h1"}}, indent=4),
+        encoding="utf-8",
+    )
+    (saida / "ipdo_2025_01_07_termica.json").write_text('{"data": "2025-01-07"}', encoding="utf-8")
+    (saida / "qualquer.json").write_text("{}", encoding="utf-8")
+
+    resumo = respostas_llm.importar_jsons(saida, remover=True)
+
+    assert resumo["importados"] == 1
+    assert resumo["ignorados"] == 2
+    assert resumo["bytes_arquivo"] < resumo["bytes_json"]
+    assert respostas_llm.buscar_resposta("h1", "operacao")["destaques_operacao"] == itens
+    assert not (saida / "ipdo_2025_01_07_operacao.json").exists()
+    assert (saida / "qualquer.json").exists()
+
+
+def test_backend_fake_reproduz_arquivo():
+    respostas_llm.registrar_resposta("h1", "termica", {"data": "2025-01-07", "destaques_geracao_termica": [{"unidade_geradora": "UTE X"}]})
+
+    backend = BackendFake(latencia=0)
+
+    resp = backend.criar_resposta(input="destaques_geracao_termica\nData do relatório: 2025-01-07")
+    assert '"UTE X"' in resp.output_text
+
+
+def test_importa_legados_so_com_tabela_vazia(tmp_path):
+    saida = tmp_path / "outputs"
+    saida.mkdir()
+    (saida / "ipdo_2025_01_07_termica.json").write_text(
+        json.dumps({"data": "2025-01-07", "destaques_geracao_termica": [], "_metadata": {"pdf_hash": "h1"}}),
+        encoding="utf-8",
+    )
+
+    assert respostas_llm.importar_legados(saida)["importados"] == 1
+    assert respostas_llm.buscar_resposta("h1", "termica") == {"data": "2025-01-07", "destaques_geracao_termica": []}
+    assert (saida / "ipdo_2025_01_07_termica.json").exists()
+
+    # Já migrado: não relê o diretório a cada execução
+    assert respostas_llm.importar_legados(saida) is None
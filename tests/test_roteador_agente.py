@@ -0,0 +1,81 @@
+import pytest
+
+import agent_ipdo.agent as agent
+import utils.timing as timing
+from agent_ipdo.roteador import interpretar, resolver_local
+
+AGORA = "[AGORA=2025-01-08 10:00:00] "
+
+
+@pytest.mark.parametrize("pergunta, esperado", [
+    ("quais datas existem?", ("listar_datas", {})),
+    ("Quais relatórios estão disponíveis no banco?", ("listar_datas", {})),
+    ("qual a última data disponível?", ("ultima_data", {})),
+    ("térmicas do dia 07/01/2025", ("buscar_termica", {"data": "2025-01-07"})),
+    ("top 3 desvios térmicos de ontem", ("buscar_termica", {"data": "2025-01-07", "limite": 3})),
+    ("UTEs acima do programado em 2025-01-05", ("buscar_termica", {"data": "2025-01-05", "desvio_status": "Acima"})),
+    ("destaques térmicos de 6 de janeiro", ("buscar_termica", {"data": "2025-01-06"})),
+    ("térmicas da data mais recente", ("buscar_termica", {"data": "ultima"})),
+    ("geração eólica em 07/01", ("buscar_geracao", {"data": "2025-01-07", "tipo": "Eólica"})),
+])
+def test_perguntas_diretas(pergunta, esperado):
+    assert interpretar(AGORA + pergunta) == esperado
+
+
+@pytest.mark.parametrize("pergunta", [
+    "por que a térmica de Angra ficou abaixo em 07/01/2025?",
+    "compare as térmicas de ontem e de hoje",
+    "como estava o sistema no dia 07/01/2025?",
+    "térmicas do Nordeste ontem",
+    "térmicas",                         # sem data
+    "geração eólica e solar de ontem",  # dois assuntos
+    "o que é IPDO?",
+    "térmicas do dia 31/02/2025",       # data inválida
+    "quando foi a ultima vez que a UTE Candiota ficou abaixo?",
+    "qual foi a última térmica com desvio acima?",
+    "térmicas de 07/01 ou 08/01?",
+    "quais datas não existem no banco?",
+    "a UTE Angra 1 teve desvio em 07/01/2025?",
+    "quantas térmicas ficaram acima em 07/01/2025?",
+])
+def test_perguntas_abertas_vao_para_o_llm(pergunta):
+    assert interpretar(AGORA + pergunta) is None
+
+
+def _executar_fake(chamadas):
+    def executar(nome, args):
+        chamadas.append((nome, dict(args)))
+        if nome == "listar_datas":
+            return ["2025-01-07", "2025-01-06"]
+        if nome == "buscar_termica":
+            return [{"unidade_geradora": "UTE X", "desvio_mw": 120.0, "desvio_status": "Acima", "descricao": "d"}]
+        return []
+    return executar
+
+
+def test_resolve_ultima_data_antes_da_tool():
+    chamadas = []
+
+    resposta = resolver_local(AGORA + "térmicas da última data", _executar_fake(chamadas))
+
+    assert chamadas == [("listar_datas", {}), ("buscar_termica", {"data": "2025-01-07"})]
+    assert resposta.startswith("Destaques térmicos de 2025-01-07 (1):")
+    assert "- UTE X: 120 MW (Acima) — d" in resposta
+
+
+def test_templates_vazios():
+    assert resolver_local(AGORA + "geração solar de ontem", _executar_fake([])) == (
+        "Não há registros no banco para essa consulta."
+    )
+
+
+def test_responder_pergunta_sem_llm(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent, "q_listar_datas", lambda: ["2025-01-07"])
+    monkeypatch.setattr(agent, "obter_cliente_openai", lambda: pytest.fail("LLM não deveria ser chamado"))
+    timing.reiniciar()
+
+    assert agent.responder_pergunta(AGORA + "qual o último dia disponível?") == (
+        "A data mais recente no banco é 2025-01-07."
+    )
+    assert agent.estatisticas_latencia()["local"]["n"] == 1
+    timing.reiniciar()
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+import utils.metrics as metrics
+import utils.timing as timing
+from core import gpt_runner, roteador_modelos
+from core.llm_backend import BackendLLM
+
+
+@pytest.fixture(autouse=True)
+def _isolar(tmp_path, monkeypatch):
+    monkeypatch.setattr("core.openai_client_v2.time.sleep", lambda s: None)
+    monkeypatch.setattr(roteador_modelos, "ROTEAMENTO_MODELOS", {"termica": ["pequeno", "grande"]})
+    monkeypatch.setattr(roteador_modelos, "ROTEAMENTO_EXPLORACAO", 0)
+    timing.reiniciar()
+    yield
+    timing.reiniciar()
+
+
+def test_cadeia_por_tamanho_e_historico(monkeypatch):
+    assert roteador_modelos.escolher_modelos("termica", 100) == ["pequeno", "grande"]
+    assert roteador_modelos.escolher_modelos("termica", 100_000) == ["grande"]
+    assert roteador_modelos.escolher_modelos("operacao", 100) == [roteador_modelos.OPENAI_MODEL]
+
+    monkeypatch.setattr(roteador_modelos, "ROTEAMENTO_MIN_AMOSTRAS", 4)
+    for ok in (True, False, False, False):
+        roteador_modelos.registrar_resultado("pequeno", "termica", ok, 0.1, 100, 10)
+
+    assert roteador_modelos.taxa_sucesso("pequeno", "termica") == 0.25
+    assert roteador_modelos.escolher_modelos("termica", 100) == ["grande"]
+
+
+def test_taxa_usa_so_a_janela_recente(monkeypatch):
+    monkeypatch.setattr(roteador_modelos, "ROTEAMENTO_MIN_AMOSTRAS", 4)
+    monkeypatch.setattr(roteador_modelos, "ROTEAMENTO_JANELA", 4)
+    for _ in range(50):
+        roteador_modelos.registrar_resultado("pequeno", "termica", False, 0.1)
+    assert roteador_modelos.escolher_modelos("termica", 100) == ["grande"]
+
+    for _ in range(4):
+        roteador_modelos.registrar_resultado("pequeno", "termica", True, 0.1)
+
+    assert roteador_modelos.taxa_sucesso("pequeno", "termica") == 1.0
+    assert roteador_modelos.escolher_modelos("termica", 100) == ["pequeno", "grande"]
+    # contador do /metrics continua sendo o total desde sempre
+    assert metrics.armazem.valor(roteador_modelos.METRICA_CHAMADAS, modelo="pequeno", tipo="termica", resultado="falha") == 50
+
+
+def test_modelo_pulado_ainda_recebe_fracao_das_chamadas(monkeypatch):
+    monkeypatch.setattr(roteador_modelos, "ROTEAMENTO_MIN_AMOSTRAS", 1)
+    roteador_modelos.registrar_resultado("pequeno", "termica", False, 0.1)
+
+    monkeypatch.setattr(roteador_modelos, "ROTEAMENTO_EXPLORACAO", 1)
+    assert roteador_modelos.escolher_modelos("termica", 100) == ["pequeno", "grande"]
+    assert timing.resumo()["contadores"]["gpt_roteamento_exploracao"] == 1
+
+
+def test_escala_quando_resposta_nao_valida(monkeypatch):
+    modelos = []
+
+    class Backend(BackendLLM):
+        def criar_resposta(self, **kwargs):
+            modelos.append(kwargs["model"])
+            if kwargs["model"] == "pequeno":
+                saida = {"data": "d", "destaques_geracao_termica": [{"unidade_geradora": "UTE A"}]}
+            else:
+                saida = {"data": "d", "destaques_geracao_termica": []}
+            usage = type("U", (), {"input_tokens": 1000, "output_tokens": 100})()
+            return type("R", (), {"output_text": json.dumps(saida), "usage": usage})()
+
+    monkeypatch.setattr("core.openai_client_v2.obter_backend", lambda: Backend())
+
+    out = gpt_runner.processar_trecho_com_gpt("UTE A: 10 MW acima.", "{{TEXTO_EXTRAIDO}}", tipo="termica")
+
+    assert out == {"data": "d", "destaques_geracao_termica": []}
+    assert modelos == ["pequeno", "grande"]
+    assert timing.resumo()["contadores"]["gpt_escalonamentos"] == 1
+    assert metrics.armazem.valor(roteador_modelos.METRICA_CHAMADAS, modelo="pequeno", tipo="termica", resultado="falha") == 1
@@ -0,0 +1,42 @@
+from core.llm_backend import BackendLLM
+from core.openai_client_v2 import chamar_gpt_v2
+from core.schemas import SCHEMA_OPERACAO, SCHEMA_TERMICA, validar
+
+
+def _termica(**campos):
+    item = {"unidade_geradora": "UTE X", "desvio_mw": 12.5, "desvio_status": "Acima", "descricao": "..."}
+    item.update(campos)
+    return {"data": "2025-01-07", "destaques_geracao_termica": [item]}
+
+
+def test_validar_termica():
+    assert validar(_termica(), SCHEMA_TERMICA) == []
+    assert validar(_termica(desvio_mw=None), SCHEMA_TERMICA) == []
+    assert validar(_termica(desvio_mw=True), SCHEMA_TERMICA)
+    assert validar(_termica(desvio_status="Inferior"), SCHEMA_TERMICA)
+    assert validar(_termica(extra=1), SCHEMA_TERMICA)
+    assert validar({"data": "2025-01-07"}, SCHEMA_TERMICA) == ["$.destaques_geracao_termica: obrigatório"]
+
+
+def test_validar_operacao_vazia():
+    assert validar({"data": "2025-01-07", "destaques_operacao": []}, SCHEMA_OPERACAO) == []
+    assert validar({"data": "2025-01-07", "destaques_operacao": [{}]}, SCHEMA_OPERACAO)
+
+
+def test_chamar_gpt_v2_envia_schema_e_retenta_fora_do_contrato(monkeypatch):
+    monkeypatch.setattr("core.openai_client_v2.time.sleep", lambda s: None)
+    respostas = ['{"data": "2025-01-07"}', '{"data": "2025-01-07", "destaques_geracao_termica": []}']
+    formatos = []
+
+    class Backend(BackendLLM):
+        def criar_resposta(self, **kwargs):
+            formatos.append(kwargs["text"]["format"])
+            return type("R", (), {"output_text": respostas.pop(0)})()
+
+    monkeypatch.setattr("core.openai_client_v2.obter_backend", lambda: Backend())
+
+    out = chamar_gpt_v2("teste", tipo="termica")
+    assert out == {"data": "2025-01-07", "destaques_geracao_termica": []}
+    assert len(formatos) == 2
+    assert formatos[0]["type"] == "json_schema" and formatos[0]["strict"] is True
+    assert formatos[0]["name"] == "ipdo_termica"
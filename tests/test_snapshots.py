@@ -0,0 +1,97 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.deps
+import database.snapshots as snapshots
+from api.main import app
+from database.init_db import init_db
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    db = tmp_path / "banco.db"
+    init_db(db)
+    monkeypatch.setattr(snapshots, "DB_PATH", db)
+    monkeypatch.setattr(api.deps, "DB_PATH", db)
+    return db
+
+
+def _inserir_dia(db, data):
+    conn = sqlite3.connect(db)
+    with conn:
+        conn.execute("INSERT INTO destaques_operacao (data, submercado) VALUES (?, 'Sul')", (data,))
+    conn.close()
+
+
+def _datas(conn):
+    return [r[0] for r in conn.execute("SELECT data FROM destaques_operacao ORDER BY data")]
+
+
+def test_leitura_ve_apenas_o_snapshot_publicado(db):
+    _inserir_dia(db, "2025-01-06")
+    snapshots.publicar_snapshot()
+    _inserir_dia(db, "2025-01-07")
+
+    leitura = snapshots.conectar_leitura()
+    try:
+        assert _datas(leitura) == ["2025-01-06"]
+        with pytest.raises(sqlite3.OperationalError):
+            leitura.execute("DELETE FROM destaques_operacao")
+    finally:
+        leitura.close()
+
+    # Hot swap: conexões novas já abrem o snapshot seguinte
+    snapshots.publicar_snapshot()
+    leitura = snapshots.conectar_leitura()
+    try:
+        assert _datas(leitura) == ["2025-01-06", "2025-01-07"]
+    finally:
+        leitura.close()
+
+
+def test_snapshot_copia_so_as_tabelas_lidas_pela_api(db):
+    _inserir_dia(db, "2025-01-06")
+    conn = sqlite3.connect(db)
+    with conn:
+        conn.execute("INSERT INTO ingestao_jobs (pdf, tipo, status, criado_em) VALUES ('a.pdf', 'termica', 'pendente', 0)")
+    conn.close()
+
+    snapshot = sqlite3.connect(snapshots.publicar_snapshot())
+    try:
+        tabelas = {r[0] for r in snapshot.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert set(snapshots.SNAPSHOT_TABELAS) <= tabelas
+        assert "ingestao_jobs" not in tabelas and "respostas_llm" not in tabelas
+        assert _datas(snapshot) == ["2025-01-06"]
+    finally:
+        snapshot.close()
+
+
+def test_mantem_apenas_os_ultimos(db, monkeypatch):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_MANTER", 2)
+    publicados = [snapshots.publicar_snapshot() for _ in range(4)]
+
+    restantes = sorted(snapshots.diretorio_snapshots(db).glob("*.db"))
+    assert restantes == sorted(publicados[-2:])
+    assert snapshots.snapshot_atual() == publicados[-1]
+
+
+def test_sem_snapshot_le_o_banco_de_trabalho(db):
+    _inserir_dia(db, "2025-01-06")
+
+    leitura = snapshots.conectar_leitura()
+    try:
+        assert _datas(leitura) == ["2025-01-06"]
+        with pytest.raises(sqlite3.OperationalError):
+            leitura.execute("DELETE FROM destaques_operacao")
+    finally:
+        leitura.close()
+
+
+def test_api_le_o_snapshot(db):
+    _inserir_dia(db, "2025-01-06")
+    snapshots.publicar_snapshot()
+    _inserir_dia(db, "2025-01-07")
+
+    assert TestClient(app).get("/datas").json() == {"datas": ["2025-01-06"]}
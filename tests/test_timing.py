@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+import utils.timing as timing
+
+
+@pytest.fixture(autouse=True)
+def _isolar(tmp_path, monkeypatch):
+    timing.reiniciar()
+    yield
+    timing.reiniciar()
+
+
+def test_span_grava_jsonl_e_resumo():
+    for _ in range(3):
+        with timing.span("gpt.chamada", tipo="termica") as attrs:
+            attrs["tokens_entrada"] = 10
+
+    @timing.medir("db.salvar_termica")
+    def salvar():
+        raise ValueError("falhou")
+
+    with pytest.raises(ValueError):
+        salvar()
+
+    linhas = [json.loads(l) for l in timing.TIMINGS_PATH.read_text(encoding="utf-8").splitlines()]
+    assert len(linhas) == 4
+    assert linhas[0]["etapa"] == "gpt.chamada" and linhas[0]["tokens_entrada"] == 10
+    assert linhas[-1]["ok"] is False and "ValueError" in linhas[-1]["erro"]
+
+    r = timing.resumo()
+    assert r["etapas"]["gpt.chamada"]["n"] == 3
+    assert r["etapas"]["db.salvar_termica"]["n"] == 1
+
+
+def test_percentil_e_cache_hit_ratio():
+    valores = sorted(float(i) for i in range(1, 101))
+    assert timing._percentil(valores, 50) == 50.0
+    assert timing._percentil(valores, 95) == 95.0
+
+    timing.incrementar("cache_hit", 3)
+    timing.incrementar("cache_miss")
+    assert timing.resumo()["cache_hit_ratio"] == 0.75
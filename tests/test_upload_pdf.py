@@ -0,0 +1,53 @@
+import pytest
+
+import database.arquivos_llm as arquivos_llm
+from core import gpt_runner
+from core.llm_backend import BackendFake, definir_backend
+from database.init_db import init_db
+from tests.sinteticos import gerar_pdf_ipdo
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    db = tmp_path / "teste.db"
+    init_db(db)
+    monkeypatch.setattr(arquivos_llm, "DB_PATH", db)
+    fake = BackendFake(diretorio=tmp_path, latencia=0)
+    definir_backend(fake)
+    yield fake
+    definir_backend(None)
+
+
+def test_pdf_enviado_uma_vez_para_os_dois_tipos(tmp_path, backend):
+    pdf = gerar_pdf_ipdo(tmp_path / "ipdo_2025_01_07.pdf")
+
+    op = gpt_runner.processar_pdf_com_prompt(pdf, "Data do relatório: 2025-01-07\ndestaques_operacao", tipo="operacao")
+    te = gpt_runner.processar_pdf_com_prompt(pdf, "Data do relatório: 2025-01-07", tipo="termica")
+
+    assert op == {"data": "2025-01-07", "destaques_operacao": []}
+    assert te == {"data": "2025-01-07", "destaques_geracao_termica": []}
+    assert list(backend.arquivos) == ["file-fake-1"]
+    assert arquivos_llm.obter_file_id(gpt_runner.digest_arquivo(pdf), "fake") == "file-fake-1"
+
+
+def test_pdf_alterado_gera_novo_envio(tmp_path, backend):
+    pdf = gerar_pdf_ipdo(tmp_path / "ipdo_2025_01_07.pdf")
+    assert gpt_runner.enviar_pdf(pdf) == "file-fake-1"
+
+    gerar_pdf_ipdo(pdf, seed=1)
+    assert gpt_runner.enviar_pdf(pdf) == "file-fake-2"
+    assert gpt_runner.enviar_pdf(pdf) == "file-fake-2"
+
+
+def test_file_id_recusado_e_reenviado_uma_vez(tmp_path, backend):
+    pdf = gerar_pdf_ipdo(tmp_path / "ipdo_2025_01_07.pdf")
+    assert gpt_runner.enviar_pdf(pdf) == "file-fake-1"
+    backend.arquivos.clear()  # expirou no provedor
+
+    te = gpt_runner.processar_pdf_com_prompt(pdf, "Data do relatório: 2025-01-07", tipo="termica")
+
+    assert te == {"data": "2025-01-07", "destaques_geracao_termica": []}
+    assert list(backend.arquivos) == ["file-fake-2"]
+    assert arquivos_llm.obter_file_id(gpt_runner.digest_arquivo(pdf), "fake") == "file-fake-2"
+    # o outro tipo, que ainda tinha o file_id antigo, usa o reenvio em vez de enviar de novo
+    assert gpt_runner.enviar_pdf(pdf, invalido="file-fake-1") == "file-fake-2"
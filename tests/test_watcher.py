@@ -0,0 +1,86 @@
+import threading
+import time
+
+from core.watcher import Debouncer, observar_pdfs
+
+
+def test_debouncer_espera_arquivo_estabilizar(tmp_path):
+    pdf = tmp_path / "ipdo_2025_01_07.pdf"
+    pdf.write_bytes(b"%PDF-parcial")
+
+    deb = Debouncer(debounce=10)
+    deb.registrar(pdf, agora=0)
+
+    assert deb.prontos(agora=5) == []
+
+    # Arquivo cresceu (download ainda em andamento) → janela reinicia
+    pdf.write_bytes(b"%PDF-parcial-mais-dados")
+    assert deb.prontos(agora=11) == []
+    assert deb.prontos(agora=20) == []
+    assert deb.prontos(agora=21) == [pdf]
+    assert len(deb) == 0
+
+
+def test_observar_pdfs_polling_ignora_existentes(tmp_path):
+    antigo = tmp_path / "ipdo_2025_01_06.pdf"
+    antigo.write_bytes(b"%PDF-antigo")
+
+    processados = []
+    parar = threading.Event()
+
+    def callback(pdf):
+        processados.append(pdf)
+        parar.set()
+
+    t = threading.Thread(
+        target=observar_pdfs,
+        kwargs=dict(callback=callback, diretorio=tmp_path, intervalo=0.05,
+                    debounce=0, usar_watchdog=False, parar=parar),
+    )
+    t.start()
+    time.sleep(0.3)  # deixa o snapshot inicial ser tirado
+
+    novo = tmp_path / "ipdo_2025_01_07.pdf"
+    novo.write_bytes(b"%PDF-novo")
+
+    t.join(timeout=5)
+    parar.set()
+
+    assert processados == [novo]
+
+
+def test_observar_pdfs_chama_tarefa_periodica(tmp_path):
+    parar = threading.Event()
+    chamadas = []
+
+    def periodico():
+        chamadas.append(1)
+        if len(chamadas) == 3:
+            parar.set()
+
+    observar_pdfs(callback=lambda pdf: None, diretorio=tmp_path, intervalo=0.01,
+                  usar_watchdog=False, parar=parar, periodico=periodico)
+
+    assert len(chamadas) == 3
+
+
+def test_existentes_passam_pelo_debounce_e_eventos_durante_o_lote_nao_se_perdem(tmp_path):
+    antigo = tmp_path / "ipdo_2025_01_06.pdf"
+    antigo.write_bytes(b"%PDF-antigo")
+    novo = tmp_path / "ipdo_2025_01_07.pdf"
+
+    processados = []
+    parar = threading.Event()
+
+    def callback(pdf):
+        processados.append(pdf)
+        if pdf == antigo:
+            # chega enquanto o lote inicial é processado
+            novo.write_bytes(b"%PDF-novo")
+        else:
+            parar.set()
+
+    observar_pdfs(callback=callback, diretorio=tmp_path, intervalo=0.02, debounce=0.05,
+                  usar_watchdog=False, parar=parar, incluir_existentes=True)
+
+    assert processados == [antigo, novo]
@@ -0,0 +1,223 @@
+# utils/metrics.py
+"""
+Métricas no formato texto do Prometheus (sem dependência externa).
+
+Dois registros com a mesma interface:
+- RegistroMetricas: em memória, para o processo da API (latência por rota, SQLite)
+- ArmazemMetricas: persistido em SQLite (METRICS_DB_PATH), compartilhado entre
+  processos — o main.py escreve contadores de ingestão e a API lê no /metrics
+
+Uso:
+    incrementar_metrica("ipdo_gpt_chamadas_total")
+    observar_metrica("ipdo_etapa_duracao_segundos", 0.42, etapa="gpt.chamada")
+"""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from config.settings import METRICS_DB_PATH
+
+
+BUCKETS_PADRAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _fmt_labels(labels: dict) -> str:
+    """{'rota': '/datas', 'le': '0.5'} → 'le="0.5",rota="/datas"' (ordem estável)."""
+    partes = []
+    for k in sorted(labels):
+        v = str(labels[k]).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        partes.append(f'{k}="{v}"')
+    return ",".join(partes)
+
+
+def _fmt_valor(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+def _fmt_le(b: float) -> str:
+    return "+Inf" if b == float("inf") else _fmt_valor(b)
+
+
+class _BaseMetricas:
+    """Implementa contadores/histogramas sobre `_somar(linhas)`."""
+
+    def _somar(self, linhas: list[tuple[str, str, str, str, float]]):
+        """linhas: (metrica, tipo, amostra, labels, delta)"""
+        raise NotImplementedError
+
+    def amostras(self) -> list[tuple[str, str, str, str, float]]:
+        raise NotImplementedError
+
+    def incrementar(self, nome: str, valor: float = 1, **labels):
+        self._somar([(nome, "counter", nome, _fmt_labels(labels), valor)])
+
+    def valor(self, amostra: str, **labels) -> float:
+        """Valor atual de uma amostra com exatamente esses labels (0 se ausente)."""
+        rotulo = _fmt_labels(labels)
+        return sum(v for _, _, a, l, v in self.amostras() if a == amostra and l == rotulo)
+
+    def observar(self, nome: str, valor: float, buckets=BUCKETS_PADRAO, **labels):
+        linhas = []
+        for b in list(buckets) + [float("inf")]:
+            # Buckets cumulativos; delta 0 mantém o bucket presente na exposição
+            delta = 1 if valor <= b else 0
+            linhas.append((nome, "histogram", f"{nome}_bucket", _fmt_labels({**labels, "le": _fmt_le(b)}), delta))
+        base = _fmt_labels(labels)
+        linhas.append((nome, "histogram", f"{nome}_sum", base, valor))
+        linhas.append((nome, "histogram", f"{nome}_count", base, 1))
+        self._somar(linhas)
+
+
+class RegistroMetricas(_BaseMetricas):
+    """Registro em memória (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._valores: dict[tuple[str, str], list] = {}
+
+    def _somar(self, linhas):
+        with self._lock:
+            for metrica, tipo, amostra, labels, delta in linhas:
+                chave = (amostra, labels)
+                if chave not in self._valores:
+                    self._valores[chave] = [metrica, tipo, 0.0]
+                self._valores[chave][2] += delta
+
+    def amostras(self):
+        with self._lock:
+            return [
+                (metrica, tipo, amostra, labels, valor)
+                for (amostra, labels), (metrica, tipo, valor) in self._valores.items()
+            ]
+
+
+class ArmazemMetricas(_BaseMetricas):
+    """
+    Registro persistido em SQLite, somado atomicamente (UPSERT).
+
+    Uma conexão por processo (reaberta se o caminho mudar ou após fork), com o
+    schema criado uma única vez; WAL + synchronous=NORMAL, pois perder a última
+    escrita num crash é aceitável para métricas. Linhas com delta 0 (buckets
+    que só precisam existir) são gravadas apenas na primeira vez.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conexao = None
+        self._chave_conexao = None  # (caminho, pid) da conexão aberta
+        self._conhecidas: set[tuple[str, str]] = set()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Conexão compartilhada; chamar com self._lock."""
+        path = Path(self.path or METRICS_DB_PATH)
+        chave = (path, os.getpid())
+        if self._conexao is not None and self._chave_conexao == chave:
+            return self._conexao
+
+        if self._conexao is not None and self._chave_conexao[1] == os.getpid():
+            self._conexao.close()
+        self._conexao = None
+        self._conhecidas.clear()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS metricas (
+                amostra TEXT NOT NULL,
+                labels TEXT NOT NULL,
+                metrica TEXT NOT NULL,
+                tipo TEXT NOT NULL,
+                valor REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (amostra, labels)
+            )
+        """)
+        conn.commit()
+        self._conexao, self._chave_conexao = conn, chave
+        return conn
+
+    def _somar(self, linhas):
+        try:
+            with self._lock:
+                conn = self._conn()
+                linhas = [l for l in linhas if l[4] or (l[2], l[3]) not in self._conhecidas]
+                with conn:
+                    conn.executemany("""
+                        INSERT INTO metricas (metrica, tipo, amostra, labels, valor)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(amostra, labels) DO UPDATE SET valor = valor + excluded.valor
+                    """, linhas)
+                self._conhecidas.update((l[2], l[3]) for l in linhas)
+        except sqlite3.Error:
+            # Métricas nunca devem derrubar a ingestão
+            pass
+
+    def valor(self, amostra: str, **labels) -> float:
+        try:
+            with self._lock:
+                row = self._conn().execute(
+                    "SELECT valor FROM metricas WHERE amostra = ? AND labels = ?",
+                    (amostra, _fmt_labels(labels)),
+                ).fetchone()
+            return row[0] if row else 0.0
+        except sqlite3.Error:
+            return 0.0
+
+    def amostras(self):
+        try:
+            with self._lock:
+                return self._conn().execute(
+                    "SELECT metrica, tipo, amostra, labels, valor FROM metricas"
+                ).fetchall()
+        except sqlite3.Error:
+            return []
+
+
+def formatar_prometheus(*registros: _BaseMetricas) -> str:
+    """Exposição texto (v0.0.4) de um ou mais registros."""
+    por_metrica: dict[str, tuple[str, list]] = {}
+    for reg in registros:
+        for metrica, tipo, amostra, labels, valor in reg.amostras():
+            por_metrica.setdefault(metrica, (tipo, []))[1].append((amostra, labels, valor))
+
+    linhas = []
+    for metrica in sorted(por_metrica):
+        tipo, amostras = por_metrica[metrica]
+        linhas.append(f"# TYPE {metrica} {tipo}")
+        for amostra, labels, valor in sorted(amostras, key=_ordem_amostra):
+            rotulo = f"{{{labels}}}" if labels else ""
+            linhas.append(f"{amostra}{rotulo} {_fmt_valor(valor)}")
+
+    return "\n".join(linhas) + "\n"
+
+
+def _ordem_amostra(item):
+    """Ordena buckets por 'le' numérico (+Inf por último) e o resto alfabeticamente."""
+    amostra, labels, _ = item
+    le = float("inf")
+    sem_le = labels
+    if 'le="' in labels:
+        partes = [p for p in labels.split(",") if not p.startswith('le="')]
+        sem_le = ",".join(partes)
+        valor_le = labels.split('le="', 1)[1].split('"', 1)[0]
+        le = float("inf") if valor_le == "+Inf" else float(valor_le)
+    return (sem_le, amostra, le)
+
+
+# ---------------------------------------------------------
+# Armazém compartilhado (ingestão)
+# ---------------------------------------------------------
+
+armazem = ArmazemMetricas()
+
+
+def incrementar_metrica(nome: str, valor: float = 1, **labels):
+    armazem.incrementar(nome, valor, **labels)
+
+
+def observar_metrica(nome: str, valor: float, **labels):
+    armazem.observar(nome, valor, **labels)
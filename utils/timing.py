@@ -0,0 +1,178 @@
+# utils/timing.py
+"""
+Instrumentação de tempo por etapa do pipeline.
+
+- span(etapa): context manager que mede a duração de um bloco
+- medir(etapa): decorator equivalente para funções
+- incrementar(nome): contadores (tokens, cache hit/miss, retentativas...)
+
+Cada span é gravado como uma linha JSON em TIMINGS_PATH e acumulado em memória
+para o relatório de fim de execução (imprimir_relatorio).
+"""
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from config.settings import TIMINGS_PATH
+from utils.metrics import incrementar_metrica, observar_metrica
+
+
+_lock = threading.Lock()
+_duracoes: dict[str, list[float]] = {}
+_contadores: dict[str, float] = {}
+
+
+def _escrever_jsonl(registro: dict):
+    try:
+        TIMINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        linha = json.dumps(registro, ensure_ascii=False, default=str)
+        with _lock, open(TIMINGS_PATH, "a", encoding="utf-8") as f:
+            f.write(linha + "\n")
+    except OSError:
+        # Instrumentação nunca deve derrubar o pipeline
+        pass
+
+
+def registrar_span(etapa: str, duracao_s: float, ok: bool = True, **atributos):
+    with _lock:
+        _duracoes.setdefault(etapa, []).append(duracao_s)
+
+    observar_metrica("ipdo_etapa_duracao_segundos", duracao_s, etapa=etapa, ok=str(ok).lower())
+
+    _escrever_jsonl({
+        "ts": datetime.now().isoformat(timespec="milliseconds"),
+        "pid": os.getpid(),
+        "etapa": etapa,
+        "duracao_ms": round(duracao_s * 1000, 3),
+        "ok": ok,
+        **atributos,
+    })
+
+
+@contextmanager
+def span(etapa: str, **atributos):
+    """
+    Mede a duração do bloco. O dict de atributos é devolvido no `as`
+    para que o bloco possa anexar informações (ex: tokens, modelo).
+
+        with span("gpt.chamada", tipo="termica") as attrs:
+            ...
+            attrs["tokens_entrada"] = 1234
+    """
+    t0 = time.perf_counter()
+    ok = True
+    try:
+        yield atributos
+    except BaseException as e:
+        ok = False
+        atributos["erro"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        registrar_span(etapa, time.perf_counter() - t0, ok, **atributos)
+
+
+def medir(etapa: str):
+    """Decorator: envolve a função inteira em um span."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(etapa):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def incrementar(nome: str, valor: float = 1):
+    """Contador da execução atual; também acumulado no armazém de métricas (ipdo_<nome>_total)."""
+    with _lock:
+        _contadores[nome] = _contadores.get(nome, 0) + valor
+
+    incrementar_metrica(f"ipdo_{nome}_total", valor)
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    """Percentil por nearest-rank (valores já ordenados)."""
+    if not valores:
+        return 0.0
+    rank = math.ceil(p / 100 * len(valores))
+    return valores[max(0, min(len(valores), rank) - 1)]
+
+
+def resumo() -> dict:
+    """
+    Retorna {'etapas': {etapa: {n, total_s, p50_ms, p95_ms, max_ms}}, 'contadores': {...},
+    'cache_hit_ratio': float | None, 'atalho_hit_ratio': float | None}.
+    """
+    with _lock:
+        duracoes = {k: sorted(v) for k, v in _duracoes.items()}
+        contadores = dict(_contadores)
+
+    etapas = {
+        etapa: {
+            "n": len(v),
+            "total_s": round(sum(v), 3),
+            "p50_ms": round(_percentil(v, 50) * 1000, 1),
+            "p95_ms": round(_percentil(v, 95) * 1000, 1),
+            "max_ms": round(v[-1] * 1000, 1),
+        }
+        for etapa, v in duracoes.items()
+    }
+
+    atalhos = contadores.get("atalho_vazio", 0) + contadores.get("atalho_repetido", 0)
+    consultas = atalhos + contadores.get("atalho_miss", 0)
+    atalho_ratio = atalhos / consultas if consultas else None
+
+    hits = contadores.get("cache_hit", 0)
+    misses = contadores.get("cache_miss", 0)
+    ratio = hits / (hits + misses) if (hits + misses) else None
+
+    return {"etapas": etapas, "contadores": contadores, "cache_hit_ratio": ratio, "atalho_hit_ratio": atalho_ratio}
+
+
+def imprimir_relatorio():
+    """Tabela de fim de execução: p50/p95 por etapa, tokens e cache hit ratio."""
+    r = resumo()
+    if not r["etapas"] and not r["contadores"]:
+        return
+
+    print("\n" + "=" * 72)
+    print("  RELATÓRIO DE TEMPOS DA EXECUÇÃO")
+    print("=" * 72)
+    print(f"{'etapa':<28}{'n':>6}{'total(s)':>11}{'p50(ms)':>10}{'p95(ms)':>10}{'max(ms)':>10}")
+    print("-" * 72)
+    for etapa, e in sorted(r["etapas"].items(), key=lambda kv: -kv[1]["total_s"]):
+        print(f"{etapa:<28}{e['n']:>6}{e['total_s']:>11.2f}{e['p50_ms']:>10.1f}{e['p95_ms']:>10.1f}{e['max_ms']:>10.1f}")
+    print("-" * 72)
+
+    c = r["contadores"]
+    entrada, em_cache = int(c.get("tokens_entrada", 0)), int(c.get("tokens_cache", 0))
+    cache_pct = f" ({em_cache / entrada:.0%})" if entrada else ""
+    print(f"Tokens: entrada={entrada} (em cache={em_cache}{cache_pct}) saída={int(c.get('tokens_saida', 0))}")
+    if r["cache_hit_ratio"] is not None:
+        print(f"Cache hit ratio: {r['cache_hit_ratio']:.0%} "
+              f"({int(c.get('cache_hit', 0))} hit / {int(c.get('cache_miss', 0))} miss)")
+    if r["atalho_hit_ratio"] is not None:
+        print(f"Atalho pré-LLM: {r['atalho_hit_ratio']:.0%} sem chamada "
+              f"({int(c.get('atalho_vazio', 0))} vazia / {int(c.get('atalho_repetido', 0))} repetida / "
+              f"{int(c.get('atalho_miss', 0))} ao GPT)")
+    outros = {k: v for k, v in c.items() if k not in (
+        "tokens_entrada", "tokens_saida", "tokens_cache", "cache_hit", "cache_miss",
+        "atalho_vazio", "atalho_repetido", "atalho_miss",
+    )}
+    if outros:
+        print("Contadores: " + ", ".join(f"{k}={int(v) if float(v).is_integer() else v}" for k, v in sorted(outros.items())))
+    print(f"Spans detalhados em: {TIMINGS_PATH}")
+    print("=" * 72)
+
+
+def reiniciar():
+    """Zera os acumuladores em memória (não apaga o arquivo JSONL)."""
+    with _lock:
+        _duracoes.clear()
+        _contadores.clear()
@@ -1,11 +1,13 @@
 # ver_banco.py
 import sqlite3
-import pandas as pd
 from config.settings import DB_PATH
 from utils.logger import log
 from datetime import datetime
+from database.exportador import exportar_banco
 
 def mostrar_resumo():
+    import pandas as pd  # tardio: o menu abre sem carregar pandas
+
     conn = sqlite3.connect(DB_PATH)
     
     print("\n" + "="*60)
@@ -56,12 +58,14 @@ def mostrar_resumo():
     print("\n" + "="*60)
 
 def exportar_excel():
+    import pandas as pd
+
     conn = sqlite3.connect(DB_PATH)
     
     # Lê tudo
     df_op = pd.read_sql_query("SELECT data, submercado, carga_status, carga_descricao, restricoes, transferencia_status FROM destaques_operacao ORDER BY data DESC", conn)
     df_ger = pd.read_sql_query("SELECT data, submercado, tipo_geracao, status, descricao FROM destaques_geracao ORDER BY data DESC", conn)
-    df_term = pd.read_sql_query("SELECT data, unidade_geradora, desvio, descricao FROM destaques_geracao_termica ORDER BY data DESC", conn)
+    df_term = pd.read_sql_query("SELECT data, unidade_geradora, desvio_mw, desvio_status, descricao FROM destaques_geracao_termica ORDER BY data DESC", conn)
     
     arquivo = f"IPDO_Destaques_Completo_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
     
@@ -74,14 +78,20 @@ def exportar_excel():
     print(f"\nExcel gerado com sucesso: {arquivo}")
     print("   3 abas: Operação e Carga | Geração por Tipo | Destaques Térmicos")
 
+def exportar_particionado(formato: str):
+    resumo = exportar_banco(formato=formato, incremental=True)
+    print(f"\nExportação {formato} concluída (incremental): {resumo}")
+
 if __name__ == "__main__":
     print("\nEscolha uma opção:\n")
     print("1 → Ver resumo no terminal (recomendado)")
     print("2 → Exportar TUDO para Excel agora")
     print("3 → Ambos")
+    print("4 → Exportar Parquet particionado (incremental, sem carregar tudo em memória)")
+    print("5 → Exportar CSV.gz particionado (incremental)")
     
     try:
-        op = input("\nDigite 1, 2 ou 3: ").strip()
+        op = input("\nDigite 1, 2, 3, 4 ou 5: ").strip()
         if op == "1":
             mostrar_resumo()
         elif op == "2":
@@ -89,6 +99,10 @@ if __name__ == "__main__":
         elif op == "3":
             mostrar_resumo()
             exportar_excel()
+        elif op == "4":
+            exportar_particionado("parquet")
+        elif op == "5":
+            exportar_particionado("csv")
         else:
             print("Opção inválida!")
     except KeyboardInterrupt: